@@ -8,5 +8,6 @@ if __name__ == "__main__":
     SIM_TIME = 500  # Czas symulacji
     resA = run_simulation('A', SIM_TIME, seed=123)
     resB = run_simulation('B', SIM_TIME, seed=123)
-    plot_results(resA, resB, SIM_TIME)
+    path = plot_results(resA, resB, SIM_TIME)
+    print(f"Wykres zapisano do {path}")
 
@@ -1,15 +1,56 @@
-from .passenger import Passenger
+from .passenger import Passenger, PassengerTable
 from .elevator import Elevator
 from .simulation import BuildingSimulation
+from .engine import HeapEnvironment, HeapElevator
+from .arrivals import ArrivalStream
+from .traffic import TrafficPhase, TrafficProfile, od_matrix
+from .zoning import ElevatorBank, Zoning
 from .stats import run_simulation, plot_results
+from .report import plot_comparison, plot_sweep
+from .batch import run_batch
+from .checkpoint import Checkpoint, warm_start
+from .sequential import run_until_precision
+from .planning import plan_capacity
+from .profiling import Profiler
+from .sweep import run_sweep, config_grid, ResultCache
+from .trace import TraceRecorder, load_trace
+from .streaming import RunningStats, DDSketch, StreamingMetrics, RollingMetrics
+from .config import SimulationConfig
 from . import config
 
 __all__ = [
     'Passenger',
+    'PassengerTable',
     'Elevator',
     'BuildingSimulation',
+    'HeapEnvironment',
+    'HeapElevator',
+    'ArrivalStream',
+    'TrafficPhase',
+    'TrafficProfile',
+    'od_matrix',
+    'ElevatorBank',
+    'Zoning',
     'run_simulation',
     'plot_results',
+    'plot_comparison',
+    'plot_sweep',
+    'run_batch',
+    'Checkpoint',
+    'warm_start',
+    'run_until_precision',
+    'plan_capacity',
+    'Profiler',
+    'run_sweep',
+    'config_grid',
+    'ResultCache',
+    'TraceRecorder',
+    'load_trace',
+    'RunningStats',
+    'DDSketch',
+    'StreamingMetrics',
+    'RollingMetrics',
+    'SimulationConfig',
     'config'
 ]
 
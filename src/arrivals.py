@@ -0,0 +1,167 @@
+"""
+Strumień zgłoszeń pasażerów generowany blokami (wektorowo) lub odtwarzany ze śladu.
+"""
+
+import numpy as np
+from .config import NUM_FLOORS, MAX_CAPACITY, CALL_ARRIVAL_RATE
+
+
+class ArrivalStream:
+    """
+    Źródło zgłoszeń: (czas przybycia, piętro wezwania, piętro docelowe, liczba osób).
+
+    Zamiast czterech wywołań generatora na każdego pasażera losuje całe bloki
+    wartości numpy, a następnie oddaje je procesowi simpy pojedynczo.
+    Może też odtwarzać gotowy ślad (tablicę zgłoszeń) - wtedy kończy się
+    razem ze śladem - albo losować zgłoszenia według zmiennego w czasie
+    profilu ruchu (TrafficProfile).
+    """
+
+    def __init__(self, rng=None, rate=CALL_ARRIVAL_RATE, num_floors=NUM_FLOORS,
+                 max_group=MAX_CAPACITY, chunk_size=4096, trace=None, profile=None):
+        """
+        Args:
+            rng: Generator liczb losowych (numpy.random.Generator) lub ziarno
+            rate: Intensywność zgłoszeń (lambda rozkładu wykładniczego)
+            num_floors: Liczba pięter
+            max_group: Maksymalna liczba osób w grupie
+            chunk_size: Liczba zgłoszeń losowanych jednorazowo
+            trace: Gotowy ślad zgłoszeń (patrz from_trace); wyłącza losowanie
+            profile: Profil ruchu (TrafficProfile) - intensywność i macierz
+                     źródło-cel zależne od czasu; zastępuje rate i jednorodny
+                     wybór pięter
+        """
+        if profile is not None and profile.num_floors != num_floors:
+            raise ValueError(f"Profil ruchu ma {profile.num_floors} pięter, a budynek {num_floors}")
+        self.rng = np.random.default_rng(rng)
+        self.rate = rate
+        self.num_floors = num_floors
+        self.max_group = max_group
+        self.chunk_size = chunk_size
+        self.trace = None if trace is None else self._validate_trace(trace, num_floors, max_group)
+        self.profile = profile
+        self._trace_consumed = False
+        self._last_time = 0.0
+
+    @classmethod
+    def from_trace(cls, trace, num_floors=NUM_FLOORS, max_group=MAX_CAPACITY):
+        """
+        Tworzy strumień odtwarzający gotowy ślad.
+
+        Args:
+            trace: Tablica (n, 4) z kolumnami [czas, piętro wezwania, piętro docelowe,
+                   liczba osób] albo tablica strukturalna z polami 'arrival_time',
+                   'call_floor', 'target_floor', 'num_people'
+            num_floors: Liczba pięter (do walidacji)
+            max_group: Maksymalna liczba osób w grupie, zwykle pojemność kabiny
+                       (do walidacji - większa grupa nigdy nie wsiadłaby do windy)
+
+        Returns:
+            ArrivalStream: Strumień kończący się wraz ze śladem
+        """
+        return cls(num_floors=num_floors, max_group=max_group, trace=trace)
+
+    @staticmethod
+    def _validate_trace(trace, num_floors, max_group):
+        """Zamienia ślad na cztery kolumny i sprawdza ich poprawność."""
+        trace = np.asarray(trace)
+        if trace.dtype.names:
+            columns = [trace[name] for name in
+                       ('arrival_time', 'call_floor', 'target_floor', 'num_people')]
+        else:
+            if trace.ndim != 2 or trace.shape[1] != 4:
+                raise ValueError("Ślad zgłoszeń musi mieć kształt (n, 4)")
+            columns = [trace[:, i] for i in range(4)]
+        times = np.asarray(columns[0], dtype=float)
+        calls, targets, people = (np.asarray(c, dtype=np.int64) for c in columns[1:])
+
+        if np.any(np.diff(times) < 0) or (len(times) and times[0] < 0):
+            raise ValueError("Czasy przybycia w śladzie muszą być nieujemne i niemalejące")
+        for floors in (calls, targets):
+            if np.any((floors < 0) | (floors >= num_floors)):
+                raise ValueError(f"Piętra w śladzie muszą należeć do zakresu 0..{num_floors - 1}")
+        if np.any(calls == targets):
+            raise ValueError("Piętro docelowe musi różnić się od piętra wezwania")
+        if np.any((people < 1) | (people > max_group)):
+            raise ValueError(f"Liczba osób w grupie musi należeć do zakresu 1..{max_group}")
+        return times, calls, targets, people
+
+    def sample_chunk(self, n=None):
+        """
+        Losuje kolejny blok zgłoszeń.
+
+        Args:
+            n: Rozmiar bloku (domyślnie chunk_size); dla profilu ruchu - oczekiwany
+               rozmiar bloku, który kończy się też na granicy fazy
+
+        Returns:
+            tuple: Tablice (czasy przybycia, piętra wezwania, piętra docelowe, liczby osób)
+        """
+        n = self.chunk_size if n is None else n
+        if self.profile is not None:
+            return self._sample_profile_chunk(n)
+        rng = self.rng
+        times = self._last_time + np.cumsum(rng.exponential(1.0 / self.rate, n))
+        self._last_time = float(times[-1])
+        calls = rng.integers(self.num_floors, size=n)
+        # losowanie spośród pozostałych pięter (bez pętli odrzucania)
+        targets = rng.integers(self.num_floors - 1, size=n)
+        targets += targets >= calls
+        people = rng.integers(1, self.max_group + 1, size=n)
+        return times, calls, targets, people
+
+    def _sample_profile_chunk(self, n):
+        """
+        Losuje zgłoszenia profilu ruchu od bieżącej chwili do końca fazy,
+        ale nie dalej niż na n oczekiwanych zgłoszeń.
+
+        W przedziale o stałej intensywności liczba zgłoszeń ma rozkład Poissona,
+        a ich czasy to posortowane punkty jednostajne. Zwraca None, gdy profil
+        nie wygeneruje już żadnego zgłoszenia (zerowa intensywność bez końca).
+        """
+        rng = self.rng
+        start = self._last_time
+        phase, _, end = self.profile.segment_at(start)
+        if phase.rate == 0:
+            if end == np.inf:
+                return None
+            self._last_time = end
+            stop = end
+            count = 0
+        else:
+            stop = min(end, start + n / phase.rate)
+            count = rng.poisson(phase.rate * (stop - start))
+            self._last_time = stop
+        times = np.sort(rng.uniform(start, stop, count))
+        calls, targets = phase.sample_floors(rng, count)
+        people = rng.integers(1, self.max_group + 1, size=count)
+        return times, calls, targets, people
+
+    def next_chunk(self):
+        """
+        Zwraca kolejny blok zgłoszeń jako cztery listy typów wbudowanych Pythona
+        (cały ślad przy pierwszym wywołaniu) albo None po wyczerpaniu strumienia.
+
+        W odróżnieniu od iteratora stan jest zwykłymi danymi, więc strumień
+        można serializować (np. w punkcie kontrolnym symulacji).
+        """
+        if self.trace is not None:
+            if self._trace_consumed:
+                return None
+            self._trace_consumed = True
+            return tuple(column.tolist() for column in self.trace)
+        chunk = self.sample_chunk()
+        if chunk is None:
+            return None
+        return tuple(column.tolist() for column in chunk)
+
+    def __iter__(self):
+        """Zwraca kolejne zgłoszenia jako krotki typów wbudowanych Pythona."""
+        if self.trace is not None:
+            yield from zip(*(column.tolist() for column in self.trace))
+            return
+        while True:
+            chunk = self.next_chunk()
+            if chunk is None:
+                return
+            yield from zip(*chunk)
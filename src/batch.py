@@ -0,0 +1,174 @@
+"""
+Równoległe uruchamianie wielu replikacji symulacji (Monte Carlo).
+
+Każda kombinacja (algorytm, punkt parametrów, replikacja) jest osobnym
+zadaniem wykonywanym w puli procesów. Ziarna replikacji pochodzą z
+`numpy.random.SeedSequence`, więc są niezależne i powtarzalne, a replikacja
+o numerze r dostaje to samo ziarno dla każdego algorytmu i punktu parametrów
+(wspólne liczby losowe ułatwiają porównania par A/B).
+"""
+
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .stats import run_simulation
+from .streaming import QUANTILES, StreamingMetrics
+
+METRICS = ('avg_wait', 'avg_trip', 'total_served', 'total_movement',
+           'p50_wait', 'p95_wait', 'p99_wait')
+
+
+def replication_seeds(base_seed, n_replications):
+    """
+    Generuje niezależne ziarna dla kolejnych replikacji.
+
+    Args:
+        base_seed: Ziarno główne (int lub None)
+        n_replications: Liczba replikacji
+
+    Returns:
+        list: Lista ziaren (int), po jednym na replikację
+    """
+    root = np.random.SeedSequence(base_seed)
+    return [int(child.generate_state(1)[0]) for child in root.spawn(n_replications)]
+
+
+def t_quantile(p, df):
+    """
+    Kwantyl rozkładu t-Studenta.
+
+    Dla df = 1 i 2 używa wzorów dokładnych, w pozostałych przypadkach
+    rozwinięcia Cornisha-Fishera wokół kwantyla rozkładu normalnego.
+
+    Args:
+        p: Prawdopodobieństwo (0 < p < 1)
+        df: Liczba stopni swobody
+
+    Returns:
+        float: Kwantyl rzędu p
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = statistics.NormalDist().inv_cdf(p)
+    z3, z5, z7, z9 = z ** 3, z ** 5, z ** 7, z ** 9
+    return (z
+            + (z3 + z) / (4 * df)
+            + (5 * z5 + 16 * z3 + 3 * z) / (96 * df ** 2)
+            + (3 * z7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * df ** 3)
+            + (79 * z9 + 776 * z7 + 1482 * z5 - 1920 * z3 - 945 * z) / (92160 * df ** 4))
+
+
+def confidence_interval(values, confidence=0.95):
+    """
+    Średnia i przedział ufności (t-Studenta) dla próby wartości.
+
+    Args:
+        values: Sekwencja wyników z kolejnych replikacji
+        confidence: Poziom ufności
+
+    Returns:
+        dict: {'mean', 'std', 'half_width', 'ci': (dolna, górna)}
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mean = float(values.mean()) if n else 0.0
+    if n < 2:
+        return {'mean': mean, 'std': 0.0, 'half_width': float('inf'), 'ci': (mean, mean)}
+    std = float(values.std(ddof=1))
+    half_width = t_quantile(0.5 + confidence / 2, n - 1) * std / math.sqrt(n)
+    return {
+        'mean': mean,
+        'std': std,
+        'half_width': half_width,
+        'ci': (mean - half_width, mean + half_width)
+    }
+
+
+def _run_replication(task):
+    """Wykonuje pojedynczą replikację (funkcja modułu, aby dało się ją zserializować)."""
+    alg_type, sim_time, seed, params = task
+    return run_simulation(alg_type, sim_time, seed=seed, verbose=False, **params)
+
+
+def run_batch(algorithms=('A', 'B'), sim_time=500, n_replications=30,
+              param_points=None, base_seed=0, confidence=0.95, max_workers=None):
+    """
+    Uruchamia N replikacji × algorytmy × punkty parametrów w puli procesów.
+
+    Args:
+        algorithms: Algorytmy do porównania
+        sim_time: Czas trwania pojedynczej symulacji
+        n_replications: Liczba replikacji na kombinację
+        param_points: Lista słowników z dodatkowymi argumentami run_simulation
+                      (np. [{'num_elevators': 4}, {'num_elevators': 6}]);
+                      domyślnie jeden punkt bez zmian
+        base_seed: Ziarno główne strumienia ziaren replikacji
+        confidence: Poziom ufności przedziałów
+        max_workers: Liczba procesów (1 = wykonanie szeregowe w bieżącym procesie)
+
+    Returns:
+        list: Dla każdej pary (algorytm, punkt) słownik z kluczami 'algorithm',
+              'params', 'n', 'metrics' (metryka -> wynik confidence_interval)
+              oraz 'replications' (surowe wyniki run_simulation). Dla replikacji
+              w trybie strumieniowym (param_points z 'streaming': True) dodatkowo
+              'pooled' - kwantyle ze scalonych szkiców wszystkich replikacji
+    """
+    if param_points is None:
+        param_points = [{}]
+    seeds = replication_seeds(base_seed, n_replications)
+
+    cells = [(alg, params) for params in param_points for alg in algorithms]
+    tasks = [(alg, sim_time, seed, params) for alg, params in cells for seed in seeds]
+
+    if max_workers == 1:
+        results = [_run_replication(task) for task in tasks]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_replication, tasks, chunksize=chunksize))
+
+    summary = []
+    for i, (alg, params) in enumerate(cells):
+        reps = results[i * n_replications:(i + 1) * n_replications]
+        cell = {
+            'algorithm': alg,
+            'params': dict(params),
+            'n': len(reps),
+            'metrics': {m: confidence_interval([r[m] for r in reps], confidence) for m in METRICS},
+            'replications': reps
+        }
+        if reps and all('streaming_metrics' in r for r in reps):
+            cell['pooled'] = pooled_quantiles([r['streaming_metrics'] for r in reps])
+        summary.append(cell)
+    return summary
+
+
+def pooled_quantiles(streaming_metrics):
+    """
+    Łączy statystyki strumieniowe wielu replikacji.
+
+    Args:
+        streaming_metrics: Lista obiektów StreamingMetrics
+
+    Returns:
+        dict: Średnie, odchylenia i kwantyle czasów oczekiwania i przejazdu
+              wszystkich pasażerów ze wszystkich replikacji
+    """
+    merged = StreamingMetrics(streaming_metrics[0].wait_sketch.relative_accuracy)
+    for m in streaming_metrics:
+        merged.merge(m)
+    pooled = {}
+    for name, running, sketch in (('wait', merged.wait, merged.wait_sketch),
+                                  ('trip', merged.trip, merged.trip_sketch)):
+        pooled[f'avg_{name}'] = running.mean
+        pooled[f'std_{name}'] = running.std
+        for q in QUANTILES:
+            pooled[f'p{round(q * 100)}_{name}'] = sketch.quantile(q)
+    return pooled
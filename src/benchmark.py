@@ -0,0 +1,297 @@
+"""
+Powtarzalny benchmark wydajności symulatora.
+
+Mierzy liczbę zdarzeń na sekundę, liczbę obsłużonych pasażerów na sekundę
+czasu rzeczywistego i szczytowe zużycie pamięci (RSS) dla obu algorytmów,
+zmieniając po jednym parametrze (liczba pięter, liczba wind, intensywność
+zgłoszeń, czas symulacji) wokół punktu bazowego. Wynik zapisywany jest jako
+JSON, który można porównać z raportem z innego commita (compare_reports).
+
+Uruchomienie:
+    python -m src.benchmark --output bench.json
+    python -m src.benchmark --quick --compare bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import simpy
+
+from .config import NUM_ELEVATORS, NUM_FLOORS, CALL_ARRIVAL_RATE, SimulationConfig
+from .engine import CountingEnvironment, HeapEnvironment
+from .simulation import BuildingSimulation
+from .stats import event_count
+
+BASELINE = {
+    'num_floors': NUM_FLOORS,
+    'num_elevators': NUM_ELEVATORS,
+    'arrival_rate': CALL_ARRIVAL_RATE,
+    'sim_time': 5000,
+}
+
+SWEEPS = {
+    'num_floors': (10, 30, 60, 120),
+    'num_elevators': (3, 6, 12, 24),
+    'arrival_rate': (0.1, 0.3, 0.6, 1.2),
+    'sim_time': (1000, 5000, 20000),
+}
+
+QUICK_SWEEPS = {
+    'num_floors': (10, 30),
+    'num_elevators': (3, 12),
+    'arrival_rate': (0.1, 0.6),
+    'sim_time': (1000, 5000),
+}
+
+
+def benchmark_cases(algorithms=('A', 'B'), baseline=None, sweeps=None, options=None):
+    """
+    Buduje listę przypadków: punkt bazowy i zmiany po jednym parametrze.
+
+    Args:
+        algorithms: Algorytmy do zmierzenia
+        baseline: Słownik parametrów bazowych (domyślnie BASELINE)
+        sweeps: Słownik parametr -> wartości (domyślnie SWEEPS)
+        options: Dodatkowe argumenty BuildingSimulation wspólne dla wszystkich
+                 przypadków (np. {'fast_path': True}) oraz 'engine'
+
+    Returns:
+        list: Słowniki parametrów przypadków (bez powtórzeń)
+    """
+    baseline = dict(BASELINE if baseline is None else baseline)
+    sweeps = SWEEPS if sweeps is None else sweeps
+    points = [baseline]
+    for name, values in sweeps.items():
+        points.extend(dict(baseline, **{name: value}) for value in values)
+
+    cases, seen = [], set()
+    for alg in algorithms:
+        for point in points:
+            case = dict(point, algorithm=alg, **(options or {}))
+            key = json.dumps(case, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                cases.append(case)
+    return cases
+
+
+def _peak_rss_bytes():
+    """Szczytowy RSS bieżącego procesu w bajtach."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux podaje wartość w KiB, macOS w bajtach
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def run_case(case, seed=0):
+    """
+    Wykonuje jeden przypadek benchmarku.
+
+    Args:
+        case: Słownik z kluczami 'algorithm', 'num_floors', 'num_elevators',
+              'arrival_rate', 'sim_time', opcjonalnie 'engine' ('simpy'/'heap')
+              i dodatkowymi argumentami BuildingSimulation
+        seed: Ziarno strumienia zgłoszeń
+
+    Returns:
+        dict: Czas wykonania, liczba zdarzeń i obsłużonych pasażerów, szczytowy RSS
+              (dla algorytmu B także udział trafień pamięci kosztów)
+    """
+    options = dict(case)
+    alg = options.pop('algorithm')
+    num_floors = options.pop('num_floors')
+    num_elevators = options.pop('num_elevators')
+    rate = options.pop('arrival_rate')
+    sim_time = options.pop('sim_time')
+    engine = options.pop('engine', 'simpy')
+
+    config = SimulationConfig(num_floors=num_floors, num_elevators=num_elevators,
+                              call_arrival_rate=rate)
+    env = HeapEnvironment() if engine == 'heap' else CountingEnvironment()
+    start = time.perf_counter()
+    # liczba wind z konfiguracji (albo z banków, gdy przypadek ma zoning=)
+    simulation = BuildingSimulation(env, None, alg, rng=seed, config=config, **options)
+    env.run(until=sim_time)
+    wall = time.perf_counter() - start
+
+    events = event_count(env)
+    served = simulation.total_passengers_served[0]
+    result = {
+        'wall_time': wall,
+        'events': events,
+        'passengers_served': served,
+        'events_per_s': events / wall,
+        'passengers_per_s': served / wall,
+        'peak_rss_bytes': _peak_rss_bytes(),
+    }
+    if alg == 'B':
+        result['cost_cache_hit_rate'] = simulation.cost_cache_stats()['hit_rate']
+    return result
+
+
+def _measure(task):
+    """Wykonuje przypadek repeats razy w jednym procesie (po krótkiej rozgrzewce)."""
+    case, seed, repeats = task
+    run_case(dict(case, sim_time=min(case['sim_time'], 100)), seed)
+    return [run_case(case, seed) for _ in range(repeats)]
+
+
+def _summarize(case, runs):
+    """Łączy powtórzenia przypadku: mediana czasu, najlepsza przepustowość, maksimum RSS."""
+    walls = [r['wall_time'] for r in runs]
+    best = min(runs, key=lambda r: r['wall_time'])
+    summary = {
+        'case': case,
+        'repeats': len(runs),
+        'events': best['events'],
+        'passengers_served': best['passengers_served'],
+        'wall_time_median': float(np.median(walls)),
+        'wall_time_min': best['wall_time'],
+        'events_per_s': best['events_per_s'],
+        'passengers_per_s': best['passengers_per_s'],
+        'peak_rss_bytes': max(r['peak_rss_bytes'] for r in runs),
+    }
+    if 'cost_cache_hit_rate' in best:
+        summary['cost_cache_hit_rate'] = best['cost_cache_hit_rate']
+    return summary
+
+
+def _metadata():
+    """Informacje o środowisku pomiaru (do porównań między commitami)."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'simpy': simpy.__version__,
+    }
+
+
+def run_benchmark(cases=None, seed=0, repeats=3, isolate=True, output=None, verbose=True):
+    """
+    Wykonuje przypadki benchmarku i (opcjonalnie) zapisuje raport JSON.
+
+    Args:
+        cases: Lista przypadków (domyślnie benchmark_cases())
+        seed: Ziarno strumienia zgłoszeń (to samo dla wszystkich przypadków)
+        repeats: Liczba powtórzeń każdego przypadku
+        isolate: Czy wykonywać każdy przypadek w świeżym procesie (wtedy szczytowy
+                 RSS dotyczy tylko tego przypadku; bez izolacji RSS jest kumulatywny)
+        output: Ścieżka pliku JSON z raportem (None - bez zapisu)
+        verbose: Czy wypisywać postęp
+
+    Returns:
+        dict: {'meta': ..., 'results': [...]}
+    """
+    cases = benchmark_cases() if cases is None else cases
+    results = []
+    for i, case in enumerate(cases):
+        task = (case, seed, repeats)
+        if isolate:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs = pool.submit(_measure, task).result()
+        else:
+            runs = _measure(task)
+        summary = _summarize(case, runs)
+        results.append(summary)
+        if verbose:
+            print(f"[{i + 1}/{len(cases)}] {_case_label(case)}: "
+                  f"{summary['events_per_s']:,.0f} zdarzeń/s, "
+                  f"{summary['passengers_per_s']:,.0f} pasażerów/s, "
+                  f"RSS {summary['peak_rss_bytes'] / 2 ** 20:.1f} MiB")
+
+    report = {'meta': _metadata(), 'results': results}
+    if output is not None:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def _case_label(case):
+    """Krótki opis przypadku, np. 'B floors=30 cars=6 rate=0.6 T=5000'."""
+    extra = ' '.join(f"{k}={v}" for k, v in sorted(case.items())
+                     if k not in ('algorithm', 'num_floors', 'num_elevators', 'arrival_rate', 'sim_time'))
+    label = (f"{case['algorithm']} floors={case['num_floors']} cars={case['num_elevators']} "
+             f"rate={case['arrival_rate']} T={case['sim_time']}")
+    return f"{label} {extra}" if extra else label
+
+
+def compare_reports(old, new, metric='events_per_s', tolerance=0.1):
+    """
+    Porównuje dwa raporty benchmarku przypadek po przypadku.
+
+    Args:
+        old: Raport bazowy (dict lub ścieżka do pliku JSON)
+        new: Raport bieżący (dict lub ścieżka do pliku JSON)
+        metric: Porównywana metryka przepustowości
+        tolerance: Względny spadek uznawany za regresję
+
+    Returns:
+        list: Krotki (opis przypadku, stara wartość, nowa wartość, stosunek, czy regresja)
+              dla przypadków obecnych w obu raportach
+    """
+    reports = []
+    for report in (old, new):
+        if not isinstance(report, dict):
+            with open(report, encoding='utf-8') as f:
+                report = json.load(f)
+        reports.append({json.dumps(r['case'], sort_keys=True): r for r in report['results']})
+    old_results, new_results = reports
+
+    rows = []
+    for key, result in new_results.items():
+        if key in old_results:
+            before, after = old_results[key][metric], result[metric]
+            ratio = after / before if before else float('inf')
+            rows.append((_case_label(result['case']), before, after, ratio, ratio < 1 - tolerance))
+    return rows
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Benchmark symulatora wind")
+    parser.add_argument('--output', default='benchmark.json', help="plik wynikowy JSON")
+    parser.add_argument('--quick', action='store_true', help="mniejsza siatka parametrów")
+    parser.add_argument('--repeats', type=int, default=3, help="powtórzenia każdego przypadku")
+    parser.add_argument('--seed', type=int, default=0, help="ziarno strumienia zgłoszeń")
+    parser.add_argument('--engine', choices=('simpy', 'heap'), default='simpy')
+    parser.add_argument('--fast-path', action='store_true', help="tryb szybki wind (simpy)")
+    parser.add_argument('--no-isolate', action='store_true',
+                        help="wszystkie przypadki w jednym procesie (RSS kumulatywny)")
+    parser.add_argument('--compare', metavar='OLD_JSON', help="porównaj z wcześniejszym raportem")
+    args = parser.parse_args(argv)
+
+    options = {'engine': args.engine}
+    if args.fast_path:
+        options['fast_path'] = True
+    cases = benchmark_cases(sweeps=QUICK_SWEEPS if args.quick else SWEEPS, options=options)
+    report = run_benchmark(cases, seed=args.seed, repeats=args.repeats,
+                           isolate=not args.no_isolate, output=args.output)
+    print(f"Zapisano {len(report['results'])} przypadków do {args.output}")
+
+    if args.compare:
+        regressions = 0
+        for label, before, after, ratio, regression in compare_reports(args.compare, report):
+            regressions += regression
+            mark = '  REGRESJA' if regression else ''
+            print(f"{label}: {before:,.0f} -> {after:,.0f} zdarzeń/s ({ratio:.2f}x){mark}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Punkty kontrolne symulacji i start z rozgrzanego stanu.
+
+Zamiast zaczynać każdą replikację od pustego budynku w chwili 0, symulację
+rozgrzewa się raz (do stanu ustalonego wykrytego metodą MSER-5), zapisuje jej
+stan w punkcie kontrolnym i od niego uruchamia warianty (np. algorytmy A i B).
+Punkt kontrolny to zserializowany (pickle) obiekt BuildingSimulation z
+silnikiem HeapEnvironment - cały stan silnika to dane i wywołania zwrotne,
+więc kopia jest wierna (procesów-generatorów simpy nie da się skopiować).
+"""
+
+import pickle
+
+import numpy as np
+
+from .batch import t_quantile
+from .engine import HeapEnvironment
+from .simulation import BuildingSimulation
+from .stats import simulation_results
+
+
+def mser5(values, batch_size=5):
+    """
+    Punkt obcięcia okresu rozbiegu metodą MSER-5 (White, 1997).
+
+    Seria dzielona jest na średnie z partii po batch_size obserwacji; wybierane
+    jest obcięcie d minimalizujące sumę kwadratów odchyleń pozostałych średnich
+    podzieloną przez kwadrat ich liczby.
+
+    Args:
+        values: Seria wyników w kolejności czasu (np. czasy oczekiwania)
+        batch_size: Rozmiar partii (5 w MSER-5)
+
+    Returns:
+        int: Liczba początkowych obserwacji do odrzucenia
+    """
+    values = np.asarray(values, dtype=float)
+    k = len(values) // batch_size
+    if k < 3:
+        return 0
+    batches = values[:k * batch_size].reshape(k, batch_size).mean(axis=1)
+    # sumy i sumy kwadratów "ogonów" batches[d:] dla każdego d
+    tail_sum = np.cumsum(batches[::-1])[::-1]
+    tail_sq = np.cumsum((batches ** 2)[::-1])[::-1]
+    remaining = np.arange(k, 0, -1)
+    mser = (tail_sq - tail_sum ** 2 / remaining) / remaining ** 2
+    # co najmniej dwie partie muszą zostać
+    return int(np.argmin(mser[:k - 1])) * batch_size
+
+
+def has_trend(values, n_batches=10, confidence=0.95):
+    """
+    Test trendu metodą średnich z partii: porównuje średnią pierwszej i drugiej
+    połowy n_batches partii testem t. MSER-5 nie wykrywa serii rosnących bez
+    końca (szum przesłania trend), więc stan ustalony wymaga też braku trendu.
+
+    Args:
+        values: Seria wyników w kolejności czasu
+        n_batches: Liczba partii (parzysta, co najmniej 4 - po dwie na połowę)
+        confidence: Poziom ufności testu
+
+    Returns:
+        bool: Czy różnica połówek jest istotna na poziomie confidence
+    """
+    if n_batches < 4 or n_batches % 2:
+        raise ValueError(f"Liczba partii musi być parzysta i nie mniejsza niż 4 "
+                         f"(podano {n_batches})")
+    values = np.asarray(values, dtype=float)
+    size = len(values) // n_batches
+    if size == 0:
+        return False
+    batches = values[:size * n_batches].reshape(n_batches, size).mean(axis=1)
+    first, second = np.split(batches, 2)
+    half = len(first)
+    se = np.sqrt((first.var(ddof=1) + second.var(ddof=1)) / half)
+    if se == 0:
+        return first.mean() != second.mean()
+    return abs(second.mean() - first.mean()) / se > t_quantile(0.5 + confidence / 2, 2 * half - 2)
+
+
+class Checkpoint:
+    """Zapisany stan symulacji, z którego można uruchamiać niezależne kopie (fork)."""
+
+    def __init__(self, simulation):
+        """
+        Args:
+            simulation: BuildingSimulation działająca na HeapEnvironment
+                        (bez rejestratora śladu i profilera)
+        """
+        if not isinstance(simulation.env, HeapEnvironment):
+            raise ValueError("Punkt kontrolny wymaga silnika 'heap' "
+                             "(procesów-generatorów simpy nie da się skopiować)")
+        if simulation.trace is not None:
+            raise ValueError("Nie można zapisać symulacji z otwartym rejestratorem śladu")
+        self.time = simulation.env.now
+        self.algorithm_type = simulation.algorithm_type
+        self.steady = None       # czy wykryto stan ustalony (warm_start)
+        self.truncation = None   # punkt obcięcia MSER-5 (liczba obserwacji)
+        self.data = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def fork(self, algorithm_type=None, seed=None, reset_statistics=True):
+        """
+        Tworzy niezależną kopię symulacji w stanie z punktu kontrolnego.
+
+        Args:
+            algorithm_type: Algorytm przypisania dla kolejnych wezwań (domyślnie
+                            ten sam co w symulacji źródłowej)
+            seed: Nowe ziarno przyszłych zgłoszeń; None - te same zgłoszenia co
+                  w innych kopiach (wspólne liczby losowe)
+            reset_statistics: Czy liczyć statystyki od chwili punktu kontrolnego
+
+        Returns:
+            BuildingSimulation: Kopia gotowa do kontynuacji przez simulation.env.run(until=...)
+        """
+        simulation = pickle.loads(self.data)
+        if algorithm_type is not None:
+            if simulation.dispatch_window is not None and algorithm_type != 'B':
+                raise ValueError("Okno zbierania wezwań (dispatch_window) dotyczy tylko algorytmu B")
+            simulation.algorithm_type = algorithm_type
+        if seed is not None:
+            _reseed_arrivals(simulation, seed)
+        if reset_statistics:
+            simulation.reset_statistics()
+        return simulation
+
+    def run(self, algorithm_type=None, sim_time=500, seed=None):
+        """
+        Kontynuuje kopię symulacji przez sim_time i zwraca jej wyniki.
+
+        Returns:
+            dict: Wyniki jak z run_simulation (statystyki od chwili punktu kontrolnego)
+                  oraz 'start_time'
+        """
+        simulation = self.fork(algorithm_type, seed)
+        simulation.env.run(until=self.time + sim_time)
+        results = simulation_results(simulation)
+        results['start_time'] = self.time
+        return results
+
+    def save(self, path):
+        """Zapisuje punkt kontrolny do pliku."""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        """Wczytuje punkt kontrolny zapisany metodą save."""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def _reseed_arrivals(simulation, seed):
+    """
+    Podmienia generator przyszłych zgłoszeń. Już zaplanowane zgłoszenie zostaje,
+    reszta bieżącego bloku jest odrzucana, a kolejne bloki losowane są od jego
+    czasu (proces Poissona jest bez pamięci, więc rozkład się nie zmienia).
+    """
+    arrivals = simulation.arrivals
+    if arrivals.trace is not None:
+        raise ValueError("Nie można zmienić ziarna strumienia odtwarzającego ślad")
+    times = simulation._arrival_chunk[0]
+    pos = simulation._arrival_pos
+    if pos:
+        arrivals._last_time = times[pos - 1]
+    simulation._arrival_chunk = tuple(column[:pos] for column in simulation._arrival_chunk)
+    arrivals.rng = np.random.default_rng(seed)
+
+
+def warm_start(algorithm_type='A', seed=None, num_elevators=None, check_interval=500.0,
+               max_warmup=20000.0, min_observations=300, max_fraction=0.5,
+               **simulation_kwargs):
+    """
+    Rozgrzewa symulację do stanu ustalonego i zwraca punkt kontrolny.
+
+    Symulacja biegnie odcinkami check_interval; po każdym MSER-5 wyznacza punkt
+    obcięcia serii czasów oczekiwania. Rozbieg uznaje się za zakończony, gdy
+    punkt obcięcia leży w początkowej części serii (max_fraction), a obserwacje
+    po nim nie wykazują trendu (has_trend). Przeciążony system (kolejki
+    rosnące bez końca) nie osiąga stanu ustalonego; punkt kontrolny powstaje
+    wtedy po max_warmup z steady=False.
+
+    Args:
+        algorithm_type: Algorytm używany w czasie rozbiegu
+        seed: Ziarno symulacji
+        num_elevators: Liczba wind (domyślnie z konfiguracji)
+        check_interval: Co ile jednostek czasu sprawdzać MSER-5
+        max_warmup: Maksymalny czas rozbiegu
+        min_observations: Minimalna liczba czasów oczekiwania do oceny
+        max_fraction: Maksymalny udział obciętych obserwacji w serii
+        simulation_kwargs: Dodatkowe argumenty BuildingSimulation (np. config,
+                           dispatch_window, traffic)
+
+    Returns:
+        Checkpoint: Punkt kontrolny z atrybutami steady i truncation
+    """
+    env = HeapEnvironment()
+    simulation = BuildingSimulation(env, num_elevators, algorithm_type, rng=seed,
+                                    **simulation_kwargs)
+    steady, truncation = False, None
+    t = 0.0
+    while t < max_warmup:
+        t = min(t + check_interval, max_warmup)
+        env.run(until=t)
+        waits = simulation.wait_time_array()
+        if len(waits) >= min_observations:
+            truncation = mser5(waits)
+            if (truncation <= max_fraction * len(waits)
+                    and not has_trend(waits[truncation:])):
+                steady = True
+                break
+    checkpoint = Checkpoint(simulation)
+    checkpoint.steady = steady
+    checkpoint.truncation = truncation
+    return checkpoint
@@ -2,6 +2,8 @@
 Parametry konfiguracyjne systemu symulacji wind.
 """
 
+from dataclasses import asdict, dataclass, replace
+
 # Parametry systemu
 NUM_ELEVATORS = 6      # Liczba wind
 NUM_FLOORS = 30        # Piętra 0..9
@@ -12,3 +14,29 @@ TIME_PER_FLOOR = 4     # czas przejazdu między piętrami
 STOP_TIME = 1          # czas postoju na piętrze (wsiadanie/wysiadanie)
 CALL_ARRIVAL_RATE = 0.6  # lambda dla wykładniczego rozkładu między zgłoszeniami
 
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """
+    Komplet parametrów budynku przekazywany jawnie do symulacji.
+
+    Wartości domyślne to stałe modułu, więc SimulationConfig() odpowiada
+    dotychczasowej konfiguracji. Obiekty są niezmienne i haszowalne; wariant
+    tworzy się metodą replace, np. SimulationConfig().replace(num_elevators=4).
+    """
+
+    num_elevators: int = NUM_ELEVATORS
+    num_floors: int = NUM_FLOORS
+    max_capacity: int = MAX_CAPACITY
+    time_per_floor: float = TIME_PER_FLOOR
+    stop_time: float = STOP_TIME
+    call_arrival_rate: float = CALL_ARRIVAL_RATE
+
+    def replace(self, **changes):
+        """Zwraca kopię z podmienionymi parametrami."""
+        return replace(self, **changes)
+
+    def to_dict(self):
+        """Parametry jako słownik (np. do zapisu w JSON)."""
+        return asdict(self)
@@ -0,0 +1,169 @@
+"""
+Wektorowe wyznaczanie kosztów przypisania dla całej grupy wind.
+"""
+
+import numpy as np
+from .config import TIME_PER_FLOOR, MAX_CAPACITY
+
+# Od tej liczby wind wyrażenie numpy jest szybsze od pętli po obiektach Elevator
+# (stały narzut numpy to kilkanaście mikrosekund na wezwanie)
+VECTORIZE_MIN_ELEVATORS = 12
+
+
+class BankState:
+    """
+    Macierz stanu wszystkich wind: jeden wiersz na windę, kolumny
+    [piętro, kierunek, obciążenie, pojemność].
+
+    Windy aktualizują swój wiersz przy każdej zmianie piętra, kierunku
+    i obciążenia, dzięki czemu koszty dla wszystkich wind liczone są jednym
+    wyrażeniem numpy zamiast pętli po obiektach Elevator. Wektory kosztów są
+    zapamiętywane do następnej zmiany stanu którejkolwiek windy (invalidate).
+    """
+
+    FLOOR, DIRECTION, LOAD, CAPACITY = range(4)
+
+    def __init__(self, num_elevators, capacity=MAX_CAPACITY, time_per_floor=TIME_PER_FLOOR):
+        """
+        Args:
+            num_elevators: Liczba wind
+            capacity: Pojemność każdej windy
+            time_per_floor: Czas przejazdu między sąsiednimi piętrami
+        """
+        self.time_per_floor = time_per_floor
+        self.state = np.zeros((num_elevators, 4), dtype=np.int64)
+        self.state[:, self.CAPACITY] = capacity
+        # widoki kolumn (bez kopiowania)
+        self.floor = self.state[:, self.FLOOR]
+        self.direction = self.state[:, self.DIRECTION]
+        self.load = self.state[:, self.LOAD]
+        self.capacity = self.state[:, self.CAPACITY]
+        self._costs = {}  # (piętro wezwania, kierunek) -> koszty wind (_compute_costs_b)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def invalidate(self):
+        """Unieważnia zapamiętane koszty (wywoływane przy zmianie stanu windy)."""
+        if self._costs:
+            self._costs.clear()
+
+    def distances(self, call_floor):
+        """Odległość (w piętrach) każdej windy od piętra wezwania."""
+        return np.abs(self.floor - call_floor)
+
+    def costs_b(self, call_floor, direction, num_people):
+        """
+        Koszt algorytmu B dla wszystkich wind naraz.
+
+        Odpowiada Elevator.calculate_cost_b: koszt podróży + obciążenie
+        + kara za przeciwny kierunek + kara za brak miejsca - bonus grupowania.
+
+        Args:
+            call_floor: Piętro wezwania
+            direction: Kierunek jazdy pasażera (1 lub -1)
+            num_people: Liczba osób w grupie
+
+        Returns:
+            numpy.ndarray: Koszt dla każdej windy (im niższy, tym lepszy)
+        """
+        key = (call_floor, direction)
+        costs = self._costs.get(key)
+        if costs is None:
+            self.cache_misses += 1
+            costs = self._costs[key] = self._compute_costs_b(call_floor, direction)
+        else:
+            self.cache_hits += 1
+        fits, full = costs
+        return np.where(self.load + num_people > self.capacity, full, fits)
+
+    def _compute_costs_b(self, call_floor, direction):
+        """Koszty bez kary za brak miejsca i z tą karą (dla każdej windy)."""
+        car_dir, load = self.direction, self.load
+        offset = self.floor - call_floor
+        travel_cost = np.abs(offset) * self.time_per_floor
+        # winda jedzie w kierunku pasażera, a piętro wezwania jest przed nią
+        # (wtedy na pewno car_dir != 0, bo kierunek pasażera to 1 lub -1)
+        is_on_route = (car_dir == direction) & (offset * direction <= 0)
+        # przeciwny kierunek (dla car_dir == -direction pasażer nigdy nie jest "po drodze")
+        direction_penalty = (car_dir == -direction) * 100
+        grouped = travel_cost * (1.0 - 0.5 * is_on_route)
+        return grouped + load + direction_penalty, grouped + (load + 5000) + direction_penalty
+
+
+def assign_min_cost(cost):
+    """
+    Rozwiązuje problem przydziału metodą węgierską (wariant z potencjałami,
+    O(n^2 m)): każdemu wierszowi przypisuje inną kolumnę, minimalizując sumę kosztów.
+
+    Args:
+        cost: Macierz kosztów (n, m), n <= m
+
+    Returns:
+        numpy.ndarray: Indeks kolumny przypisanej każdemu wierszowi
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("Liczba wierszy nie może przekraczać liczby kolumn")
+    # indeksowanie od 1: kolumna 0 to sztuczny punkt startowy ścieżki powiększającej
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # p[j] - wiersz przypisany do kolumny j
+    way = np.zeros(m + 1, dtype=np.int64)  # poprzednia kolumna na ścieżce
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            j1 = int(np.where(free, minv[1:], np.inf).argmin()) + 1
+            delta = minv[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # odwróć ścieżkę powiększającą
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    assignment = np.full(n, -1, dtype=np.int64)
+    for j in range(1, m + 1):
+        if p[j]:
+            assignment[p[j] - 1] = j - 1
+    return assignment
+
+
+def assign_batch_b(bank, groups, slot_penalty):
+    """
+    Przypisuje naraz całą partię wezwań (algorytm B z oknem zbierania wezwań).
+
+    Każda winda dostaje tyle "miejsc" w macierzy kosztów, ile potrzeba, by
+    pomieścić wszystkie grupy; k-te miejsce tej samej windy jest droższe
+    o k * slot_penalty (dodatkowy postój). Koszt grupy w danej windzie to
+    koszt algorytmu B (BankState.costs_b).
+
+    Args:
+        bank: Obiekt BankState
+        groups: Lista krotek (piętro wezwania, kierunek, liczba osób)
+        slot_penalty: Koszt każdej kolejnej grupy przydzielonej tej samej windzie
+                      (zwykle dodatkowy postój na wsiadanie i wysiadanie, czyli
+                      dwukrotny czas postoju z konfiguracji symulacji)
+
+    Returns:
+        numpy.ndarray: Indeks windy dla każdej grupy
+    """
+    m = len(bank.floor)
+    slots = -(-len(groups) // m)
+    base = np.stack([bank.costs_b(floor, direction, people) for floor, direction, people in groups])
+    cost = np.concatenate([base + s * slot_penalty for s in range(slots)], axis=1)
+    return assign_min_cost(cost) % m
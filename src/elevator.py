@@ -2,8 +2,57 @@
 Klasa reprezentująca windę w systemie.
 """
 
+from bisect import bisect_left, bisect_right, insort
+
 import simpy
-from .config import TIME_PER_FLOOR, STOP_TIME, MAX_CAPACITY
+
+
+class SortedRequests(dict):
+    """
+    Słownik żądań windy (piętro -> kierunek lub True) z posortowaną listą pięter.
+
+    Lista pięter jest utrzymywana modułem bisect przy przypisaniu, del, pop
+    i clear (inne metody modyfikujące dict nie są obsługiwane), więc najbliższe
+    żądanie powyżej lub poniżej danego piętra znajduje się w czasie O(log n).
+    """
+
+    __slots__ = ('floors',)
+
+    def __init__(self):
+        super().__init__()
+        self.floors = []
+
+    def __setitem__(self, floor, value):
+        if floor not in self:
+            insort(self.floors, floor)
+        super().__setitem__(floor, value)
+
+    def __delitem__(self, floor):
+        super().__delitem__(floor)
+        del self.floors[bisect_left(self.floors, floor)]
+
+    def pop(self, floor, *default):
+        if floor in self:
+            del self.floors[bisect_left(self.floors, floor)]
+        return super().pop(floor, *default)
+
+    def clear(self):
+        super().clear()
+        self.floors.clear()
+
+    def __reduce__(self):
+        # odtworzenie przez __setitem__, aby lista pięter powstała razem ze słownikiem
+        return type(self), (), None, None, iter(self.items())
+
+    def above(self, floor):
+        """Najniższe piętro z żądaniem powyżej floor (lub None)."""
+        i = bisect_right(self.floors, floor)
+        return self.floors[i] if i < len(self.floors) else None
+
+    def below(self, floor):
+        """Najwyższe piętro z żądaniem poniżej floor (lub None)."""
+        i = bisect_left(self.floors, floor)
+        return self.floors[i - 1] if i else None
 
 
 class Elevator:
@@ -17,18 +66,93 @@ class Elevator:
         """
         self.env = env
         self.id = eid
-        self.current_floor = 0
+        # bank wind (strefa), do którego należy winda, i jej wiersz w macierzy stanu
+        # banku (BankState) - aktualizowany przez właściwości
+        self.zone = simulation.car_zone[eid]
+        self.bank = simulation.banks[self.zone]
+        self._row = eid - simulation.zone_offsets[self.zone]
+        # kolejki oczekujących na wezwania obsługiwane przez ten bank
+        self.pending_calls = simulation.pending_calls[self.zone]
+        # koszty algorytmu B wyznaczone przy bieżącym stanie windy:
+        # (piętro wezwania, kierunek) -> (koszt, gdy grupa się mieści, koszt z karą
+        # za brak miejsca); czyszczone przy każdej zmianie piętra, kierunku lub obciążenia
+        self._cost_cache = {}
+        self.cost_cache_hits = 0
+        self.cost_cache_misses = 0
+        self._current_floor = self._direction = self._load = None
+        self.current_floor = simulation.home_floors[self.zone]
         self.direction = 0  # -1 (dół), 0 (stoi), 1 (góra)
-        self.passengers = []  # lista Passenger
-        self.requests = {}    # floor -> dir (external) lub True (internal)
-        self.queue = simpy.Store(env)
+        self.passengers = {}  # target_floor -> list[Passenger]
+        self.load = 0  # liczba osób w windzie (łącznie z wsiadającymi)
+        self.requests = SortedRequests()  # floor -> dir (external) lub True (internal)
         self.simulation = simulation
+        # pojemność i prędkość banku, czas postoju z konfiguracji symulacji
+        self.capacity = int(self.bank.capacity[self._row])
+        self.time_per_floor = self.bank.time_per_floor
+        self.stop_time = simulation.config.stop_time
+        # tryb szybki: kroki windy wykonywane bez osobnych procesów simpy
+        self.fast_path = simulation.fast_path
 
         # statystyki
         self.total_movement_time = 0.0
         self.floors_traveled = 0
 
-        self.process = env.process(self.run())
+        self._start()
+
+    def _start(self):
+        """Uruchamia proces windy w środowisku simpy."""
+        self.queue = simpy.Store(self.env)
+        self._wakeup = None  # zdarzenie wybudzenia bezczynnej windy (tryb szybki)
+        self.process = self.env.process(self.run())
+
+    def _wake(self):
+        """Budzi bezczynną windę po dodaniu żądania."""
+        if not self.fast_path:
+            self.queue.put(True)
+        elif self._wakeup is not None and not self._wakeup.triggered:
+            self._wakeup.succeed()
+
+    @property
+    def current_floor(self):
+        """Bieżące piętro windy."""
+        return self._current_floor
+
+    @current_floor.setter
+    def current_floor(self, value):
+        if value != self._current_floor:
+            self._current_floor = value
+            self.bank.floor[self._row] = value
+            self._invalidate_costs()
+
+    @property
+    def direction(self):
+        """Kierunek jazdy: -1 (dół), 0 (stoi), 1 (góra)."""
+        return self._direction
+
+    @direction.setter
+    def direction(self, value):
+        if value != self._direction:
+            self._direction = value
+            self.bank.direction[self._row] = value
+            self._invalidate_costs()
+
+    @property
+    def load(self):
+        """Liczba osób w windzie (łącznie z wsiadającymi)."""
+        return self._load
+
+    @load.setter
+    def load(self, value):
+        if value != self._load:
+            self._load = value
+            self.bank.load[self._row] = value
+            self._invalidate_costs()
+
+    def _invalidate_costs(self):
+        """Unieważnia zapamiętane koszty windy i jej banku po zmianie stanu."""
+        if self._cost_cache:
+            self._cost_cache.clear()
+        self.bank.invalidate()
 
     def run(self):
         """Główna pętla działania windy."""
@@ -36,32 +160,56 @@ class Elevator:
             if not self.requests:
                 # czekaj aż ktoś doda żądanie
                 self.direction = 0
-                yield self.queue.get()
+                if self.fast_path:
+                    self._wakeup = self.env.event()
+                    yield self._wakeup
+                    self._wakeup = None
+                else:
+                    yield self.queue.get()
                 # po wybudzeniu pętla się powtarza i wybierze cel
             else:
                 target_floor, new_dir = self._get_next_destination()
                 if target_floor == self.current_floor:
                     # może obsłużyć zatrzymanie bez ruchu (np. osoba wejdzie)
-                    yield self.env.process(self._stop_at_floor())
-                    # Jeśli nadal jest żądanie na tym samym piętrze i nie można go obsłużyć, usuń je
-                    if self.current_floor in self.requests:
-                        waiting = self.simulation.pending_calls.get(self.current_floor, [])
-                        if not waiting:
-                            # Nie ma już oczekujących, usuń żądanie
-                            del self.requests[self.current_floor]
-                        elif all(not ((self.direction == 0) or (p.direction == self.direction)) 
-                                for p in waiting):
-                            # Wszyscy pasażerowie jadą w przeciwnym kierunku, usuń żądanie
-                            del self.requests[self.current_floor]
+                    yield from self._step(self._stop_at_floor())
+                    # Po postoju wszyscy, którzy mogli wsiąść/wysiąść, już to zrobili.
+                    # Pozostawione żądanie tego piętra powodowałoby ponowny postój
+                    # w tej samej chwili (nieskończona pętla bez upływu czasu), więc je usuwamy.
+                    self.requests.pop(self.current_floor, None)
+                    self.simulation.redispatch(self.current_floor, self.zone)
                 else:
                     if new_dir != 0:
                         self.direction = new_dir
-                    yield self.env.process(self._move_to_floor(target_floor))
-                    yield self.env.process(self._stop_at_floor())
+                    yield from self._step(self._move_to_floor(target_floor))
+                    if self.fast_path and not self._has_work_here():
+                        # nikt nie wysiada ani nie czeka - pomiń postój
+                        self.requests.pop(self.current_floor, None)
+                    else:
+                        yield from self._step(self._stop_at_floor())
+
+    def _step(self, step):
+        """
+        Wykonuje krok windy (ruch lub postój).
+
+        Domyślnie krok jest osobnym procesem simpy; w trybie szybkim generator
+        wykonywany jest bezpośrednio w procesie windy, więc jedyne zdarzenia to
+        jego własne timeouty (bez zdarzeń startu i końca procesu).
+        """
+        if self.fast_path:
+            yield from step
+        else:
+            yield self.env.process(step)
+
+    def _has_work_here(self):
+        """Czy na bieżącym piętrze ktoś wysiada albo czeka na windę."""
+        if self.current_floor in self.passengers:
+            return True
+        queues = self.pending_calls.get(self.current_floor)
+        return queues is not None and bool(queues[1] or queues[-1])
 
     def _get_current_load(self):
         """Zwraca aktualne obciążenie windy (liczba osób)."""
-        return sum(p.num_people for p in self.passengers)
+        return self.load
 
     def _get_next_destination(self):
         """
@@ -70,30 +218,35 @@ class Elevator:
         Returns:
             tuple: (target_floor, new_direction)
         """
-        floors = sorted(self.requests.keys())
-        if not floors:
+        requests = self.requests
+        if not requests:
             return self.current_floor, 0
 
+        up = requests.above(self.current_floor)
+        down = requests.below(self.current_floor)
+
         # jeśli jedziemy w górę - celuj w najmniejsze piętro > current
         if self.direction == 1:
-            up = [f for f in floors if f > self.current_floor]
-            if up:
-                return min(up), 1
+            if up is not None:
+                return up, 1
             # brak w górę -> szukaj dół
-            down = [f for f in floors if f < self.current_floor]
-            if down:
-                return max(down), -1
+            if down is not None:
+                return down, -1
 
         elif self.direction == -1:
-            down = [f for f in floors if f < self.current_floor]
-            if down:
-                return max(down), -1
-            up = [f for f in floors if f > self.current_floor]
-            if up:
-                return min(up), 1
-
-        # jeśli stoi albo nie ma kierunku preferowanego -> wybierz najbliższe (minimalna odległość)
-        closest = min(floors, key=lambda f: abs(f - self.current_floor))
+            if down is not None:
+                return down, -1
+            if up is not None:
+                return up, 1
+
+        # jeśli stoi albo nie ma kierunku preferowanego -> wybierz najbliższe (minimalna odległość,
+        # przy remisie niższe piętro)
+        closest = None
+        here = self.current_floor if self.current_floor in requests else None
+        for f in (down, here, up):
+            if f is not None and (closest is None or
+                                  abs(f - self.current_floor) < abs(closest - self.current_floor)):
+                closest = f
         new_dir = 1 if closest > self.current_floor else -1 if closest < self.current_floor else 0
         return closest, new_dir
 
@@ -106,80 +259,142 @@ class Elevator:
         """
         if target_floor == self.current_floor:
             return
+        travel_time = self._depart(target_floor)
+        # symulacja ruchu
+        yield self.env.timeout(travel_time)
+        self.current_floor = target_floor
+
+    def _depart(self, target_floor):
+        """
+        Rozpoczyna ruch do piętra docelowego: aktualizuje kierunek i statystyki.
+
+        Returns:
+            float: Czas przejazdu
+        """
         floors_to_move = abs(target_floor - self.current_floor)
-        travel_time = floors_to_move * TIME_PER_FLOOR
+        travel_time = floors_to_move * self.time_per_floor
         self.total_movement_time += travel_time
         self.floors_traveled += floors_to_move
         self.direction = 1 if target_floor > self.current_floor else -1
-        # symulacja ruchu
-        yield self.env.timeout(travel_time)
-        self.current_floor = target_floor
+        trace = self.simulation.trace
+        if trace is not None:
+            now = self.env.now
+            trace.segment(self.id, now, now + travel_time, self.current_floor, target_floor, self.load)
+        return travel_time
 
     def _stop_at_floor(self):
         """Obsługuje zatrzymanie windy na piętrze: wysiadanie i wsiadanie pasażerów."""
         # Wysiadanie
-        passengers_out = [p for p in self.passengers if p.target_floor == self.current_floor]
+        passengers_out = self.passengers.get(self.current_floor)
         if passengers_out:
-            yield self.env.timeout(STOP_TIME)
-            for p in passengers_out:
-                p.record_dropoff(
-                    self.simulation.trip_times,
-                    self.simulation.total_passengers_served
-                )
-            self.passengers = [p for p in self.passengers if p.target_floor != self.current_floor]
+            yield self.env.timeout(self.stop_time)
+            self._alight(passengers_out)
 
+        # Wsiadanie
+        queues, passengers_to_board = self._begin_boarding()
+        if queues is not None:
+            if passengers_to_board:
+                yield self.env.timeout(self.stop_time)
+                self._board(passengers_to_board)
+            self._end_boarding(queues)
+
+    def _alight(self, passengers_out):
+        """Kończy wysiadanie pasażerów na bieżącym piętrze (po czasie postoju)."""
+        for p in passengers_out:
+            self.simulation.record_dropoff(p, self.id)
+            self.load -= p.num_people
+        del self.passengers[self.current_floor]
+
+    def _begin_boarding(self):
+        """
+        Wybiera pasażerów, którzy wsiądą na bieżącym piętrze.
+
+        Returns:
+            tuple: (kolejki piętra, lista wsiadających) albo (None, None),
+                   jeśli na piętrze nikt nie czeka
+        """
         # Jeśli było zewnętrzne żądanie tego piętra i nie ma już oczekujących, usuń
-        if self.current_floor in self.simulation.pending_calls:
-            if not self.simulation.pending_calls[self.current_floor]:
-                if self.current_floor in self.requests:
-                    del self.requests[self.current_floor]
+        queues = self.pending_calls.get(self.current_floor)
+        if queues is None:
+            return None, None
+        if not (queues[1] or queues[-1]):
+            self.requests.pop(self.current_floor, None)
+            return None, None
 
-        # Wsiadanie
-        # Sprawdź listę oczekujących na tym piętrze (jeśli istnieje)
-        waiting = self.simulation.pending_calls.get(self.current_floor, [])
-        if waiting:
-            # wybierz pasażerów, którzy mogą wsiąść
-            passengers_to_board = []
-            for p in list(waiting):  # kopiujemy listę bo będziemy usuwać elementy
-                can_board_direction = (self.direction == 0) or (p.direction == self.direction)
-                if can_board_direction and (self._get_current_load() + p.num_people) <= MAX_CAPACITY:
-                    passengers_to_board.append(p)
-                else:
-                    # jeśli winda jedzie przeciwnie i nie stoi, to pomijamy tych pasażerów
-                    # ale nie blokujemy wybrania kolejnych jeśli winda stoi
-                    if self.direction != 0 and not can_board_direction:
-                        continue
-                    # jeśli brak miejsca -> nie bierzemy więcej (zakładamy FIFO przy braku miejsca)
-                    if (self._get_current_load() + p.num_people) > MAX_CAPACITY:
-                        break
+        # Kolejki oczekujących na tym piętrze (osobno w górę i w dół, FIFO):
+        # wybierz pasażerów, którzy mogą wsiąść: kolejno z czoła kolejki zgodnej
+        # z kierunkiem, dopóki starcza miejsca (FIFO - przy braku miejsca nie bierzemy więcej)
+        passengers_to_board = []
+        queue = self._boarding_queue(queues)
+        while queue is not None and self.load + queue[0].num_people <= self.capacity:
+            # zdejmujemy pasażera z kolejki od razu, żeby w czasie postoju
+            # nie zabrała go inna winda stojąca na tym piętrze
+            p = queue.popleft()
+            self.load += p.num_people
+            passengers_to_board.append(p)
+            queue = self._boarding_queue(queues)
+        return queues, passengers_to_board
 
-            if passengers_to_board:
-                yield self.env.timeout(STOP_TIME)
-                for p in passengers_to_board:
-                    p.record_pickup(self.id, self.simulation.wait_times)
-                    self.passengers.append(p)
-                    # zadanie wewnętrzne: cel pasażera
-                    self.requests[p.target_floor] = True
-                    # usuń z kolejki oczekujących w budynku (jeśli jeszcze tam jest)
-                    if p in waiting:
-                        waiting.remove(p)
-
-            # jeśli po wsiadaniu nikt nie czeka na tym piętrze, usuń zewnętrzne żądanie (u tej windy)
-            if not waiting and self.current_floor in self.requests:
-                if self.requests[self.current_floor] != True:
-                    # jeśli entry nie było wewnętrznym żądaniem, usuń
-                    del self.requests[self.current_floor]
-            # Jeśli są jeszcze oczekujący, ale żaden nie może wsiąść (przeciwny kierunek lub brak miejsca),
-            # usuń żądanie dla tej windy, aby nie blokować innych wind
-            elif waiting and self.current_floor in self.requests:
-                can_any_board = any(
-                    ((self.direction == 0) or (p.direction == self.direction)) and
-                    (self._get_current_load() + p.num_people) <= MAX_CAPACITY
-                    for p in waiting
-                )
-                if not can_any_board and self.requests[self.current_floor] != True:
-                    # Żaden pasażer nie może wsiąść, usuń żądanie dla tej windy
-                    del self.requests[self.current_floor]
+    def _board(self, passengers_to_board):
+        """Kończy wsiadanie wybranych pasażerów (po czasie postoju)."""
+        for p in passengers_to_board:
+            self.simulation.record_pickup(p, self.id)
+            self.passengers.setdefault(p.target_floor, []).append(p)
+            # zadanie wewnętrzne: cel pasażera
+            self.requests[p.target_floor] = True
+
+    def _end_boarding(self, queues):
+        """
+        Porządkuje żądanie bieżącego piętra po wsiadaniu.
+
+        Args:
+            queues: Kolejki oczekujących na bieżącym piętrze
+        """
+        # jeśli po wsiadaniu nikt nie czeka na tym piętrze, usuń zewnętrzne żądanie (u tej windy)
+        if not (queues[1] or queues[-1]):
+            if self.requests.get(self.current_floor, True) is not True:
+                # jeśli entry nie było wewnętrznym żądaniem, usuń
+                del self.requests[self.current_floor]
+        # Jeśli są jeszcze oczekujący, ale żaden nie może wsiąść (przeciwny kierunek lub brak miejsca),
+        # usuń żądanie dla tej windy, aby nie blokować innych wind
+        elif self.requests.get(self.current_floor, True) is not True:
+            queue = self._boarding_queue(queues)
+            can_any_board = queue is not None and self.load + queue[0].num_people <= self.capacity
+            if not can_any_board:
+                # Żaden pasażer nie może wsiąść, usuń żądanie dla tej windy
+                del self.requests[self.current_floor]
+
+        # Pozostali oczekujący, po których ta winda nie wróci, trafiają ponownie
+        # do przypisania (inaczej czekaliby do kolejnego wezwania z tego piętra)
+        if (queues[1] or queues[-1]) and self.requests.get(self.current_floor, True) is True:
+            self.simulation.redispatch(self.current_floor, self.zone, self)
+
+    def _boarding_queue(self, queues):
+        """
+        Zwraca kolejkę, z której czoła może wsiąść następny pasażer.
+
+        Winda jadąca w górę/dół zabiera tylko pasażerów w swoim kierunku;
+        stojąca albo na końcu trasy (brak żądań dalej w kierunku jazdy, np. na
+        skrajnym piętrze lub w holu banku strefowego) - tego, który czeka
+        dłużej (porównanie czół obu kolejek).
+
+        Args:
+            queues: Słownik kierunek -> deque[Passenger] dla bieżącego piętra
+
+        Returns:
+            deque lub None, jeśli nikt nie może wsiąść ze względu na kierunek
+        """
+        direction = self.direction
+        if direction != 0:
+            floor = self.current_floor
+            ahead = self.requests.above(floor) if direction == 1 else self.requests.below(floor)
+            if ahead is not None:
+                queue = queues[direction]
+                return queue if queue else None
+        up, down = queues[1], queues[-1]
+        if up and down:
+            return up if up[0].arrival_time <= down[0].arrival_time else down
+        return up or down or None
 
     def add_call(self, passenger):
         """
@@ -194,7 +409,7 @@ class Elevator:
         self.requests[call_floor] = call_dir
         # obudź jeśli stoi i pusta
         if self.direction == 0 and not self.passengers:
-            self.queue.put(True)
+            self._wake()
 
     def calculate_cost_b(self, passenger):
         """
@@ -216,19 +431,38 @@ class Elevator:
         Returns:
             float: Koszt przypisania tego pasażera do tej windy (im niższy, tym lepszy)
         """
+        # stan windy nie zmienia się między jej zdarzeniami, więc seria wezwań
+        # (np. z holu w szczycie porannym) korzysta z kosztów już wyznaczonych
+        key = (passenger.call_floor, passenger.direction)
+        costs = self._cost_cache.get(key)
+        if costs is None:
+            self.cost_cache_misses += 1
+            costs = self._cost_cache[key] = self._costs_b(*key)
+        else:
+            self.cost_cache_hits += 1
+        return costs[self._load + passenger.num_people > self.capacity]
+
+    def _costs_b(self, call_floor, direction):
+        """
+        Koszt algorytmu B wyznaczony od zera dla wezwania z piętra call_floor.
+
+        Returns:
+            tuple: (koszt, gdy grupa się mieści, koszt z karą za brak miejsca)
+        """
         # 1. Koszt podróży: odległość do piętra wezwania
-        distance = abs(self.current_floor - passenger.call_floor)
-        travel_cost = distance * TIME_PER_FLOOR
+        current_floor = self._current_floor
+        car_direction = self._direction
+        distance = abs(current_floor - call_floor)
+        travel_cost = distance * self.time_per_floor
         
         # 2. Koszt obciążenia: im więcej pasażerów, tym wyższy koszt
-        current_load = self._get_current_load()
-        capacity_cost = current_load
+        current_load = self._load
         
         # 3. Sprawdź czy winda może "po drodze" zabrać pasażera (grupowanie)
         # Winda jedzie w tym samym kierunku i pasażer jest na trasie
-        is_on_route = (self.direction == passenger.direction) and (
-            (self.direction == 1 and passenger.call_floor >= self.current_floor) or
-            (self.direction == -1 and passenger.call_floor <= self.current_floor)
+        is_on_route = (car_direction == direction) and (
+            (car_direction == 1 and call_floor >= current_floor) or
+            (car_direction == -1 and call_floor <= current_floor)
         )
         
         # Bonus za grupowanie: redukcja kosztu jeśli można połączyć kursy
@@ -236,14 +470,12 @@ class Elevator:
         
         # 4. Kara za przeciwny kierunek: winda jedzie w przeciwnym kierunku
         direction_penalty = 0
-        if self.direction != 0 and self.direction != passenger.direction and not is_on_route:
+        if car_direction != 0 and car_direction != direction and not is_on_route:
             direction_penalty = 100
         
-        # 5. Kara za brak miejsca: bardzo wysoka kara jeśli winda jest pełna
-        if current_load + passenger.num_people > MAX_CAPACITY:
-            capacity_cost += 5000
-        
+        # 5. Kara za brak miejsca: bardzo wysoka kara, jeśli grupa się nie zmieści
+        # (zależy od liczby osób, więc liczone są oba warianty)
         # Całkowity koszt (im niższy, tym lepszy)
-        total_cost = travel_cost + capacity_cost + direction_penalty - grouping_bonus
-        return total_cost
+        return (travel_cost + current_load + direction_penalty - grouping_bonus,
+                travel_cost + (current_load + 5000) + direction_penalty - grouping_bonus)
 
@@ -0,0 +1,161 @@
+"""
+Samodzielny silnik zdarzeń na kopcu (heapq) - alternatywa dla simpy.
+
+Zamiast generatorów i obiektów zdarzeń simpy każde zdarzenie to krotka
+(czas, numer kolejny, funkcja, argumenty) w kopcu binarnym, a windy są
+automatami stanów, których kolejne etapy (przyjazd, koniec wysiadania,
+koniec wsiadania) planowane są jako wywołania zwrotne.
+"""
+
+import heapq
+
+import simpy
+
+from .elevator import Elevator
+
+
+class HeapEnvironment:
+    """
+    Kalendarz zdarzeń symulacji oparty na heapq.
+
+    Udostępnia atrybut now (jak simpy.Environment) oraz schedule i run.
+    Zdarzenia o tym samym czasie wykonywane są w kolejności zaplanowania.
+    """
+
+    def __init__(self, initial_time=0.0):
+        """
+        Args:
+            initial_time: Czas początkowy symulacji
+        """
+        self.now = initial_time
+        self.events_processed = 0
+        self._queue = []
+        self._seq = 0  # licznik zaplanowanych zdarzeń (kolejność przy równych czasach)
+
+    def schedule(self, delay, callback, *args):
+        """
+        Planuje wywołanie callback(*args) po upływie delay.
+
+        Args:
+            delay: Opóźnienie względem bieżącego czasu (nieujemne)
+            callback: Funkcja do wywołania
+            args: Argumenty funkcji
+        """
+        self._seq += 1
+        heapq.heappush(self._queue, (self.now + delay, self._seq, callback, args))
+
+    def run(self, until):
+        """
+        Wykonuje zdarzenia o czasie mniejszym niż until, po czym ustawia now = until.
+
+        Args:
+            until: Czas zakończenia symulacji
+        """
+        queue = self._queue
+        pop = heapq.heappop
+        processed = 0
+        while queue and queue[0][0] < until:
+            self.now, _, callback, args = pop(queue)
+            callback(*args)
+            processed += 1
+        self.events_processed += processed
+        self.now = until
+
+
+class CountingEnvironment(simpy.Environment):
+    """
+    Środowisko simpy zliczające wykonane zdarzenia (events_processed, jak
+    HeapEnvironment), bez sięgania do wewnętrznych liczników simpy.
+    """
+
+    def __init__(self, initial_time=0):
+        super().__init__(initial_time)
+        self.events_processed = 0
+
+    def step(self):
+        """Wykonuje najbliższe zdarzenie i zwiększa licznik."""
+        super().step()
+        self.events_processed += 1
+
+
+class HeapElevator(Elevator):
+    """
+    Winda jako automat stanów sterowany wywołaniami zwrotnymi HeapEnvironment.
+
+    Decyzje (wybór celu, wysiadanie, wsiadanie, porządkowanie żądań) podejmują
+    te same metody co w Elevator, więc oba silniki realizują identyczny model.
+    Jak w trybie fast_path, przejazd przez piętro, na którym nikt nie wysiada
+    ani nie czeka, nie powoduje postoju.
+    """
+
+    def _start(self):
+        """Planuje pierwszy krok windy (odpowiednik startu procesu simpy)."""
+        self._idle = False
+        self._stationary = False  # czy bieżący postój nastąpił bez ruchu
+        self.env.schedule(0, self._advance)
+
+    def _wake(self):
+        """Budzi bezczynną windę po dodaniu żądania."""
+        if self._idle:
+            self._idle = False
+            self.env.schedule(0, self._advance)
+
+    def _advance(self):
+        """Jedna iteracja pętli Elevator.run: wybór celu i zaplanowanie następnego etapu."""
+        if not self.requests:
+            self.direction = 0
+            self._idle = True
+            return
+        target_floor, new_dir = self._get_next_destination()
+        if target_floor == self.current_floor:
+            self._stationary = True
+            self._begin_stop()
+        else:
+            if new_dir != 0:
+                self.direction = new_dir
+            self.env.schedule(self._depart(target_floor), self._arrive, target_floor)
+
+    def _arrive(self, target_floor):
+        """Przyjazd na piętro docelowe: postój albo (gdy nie ma po co) dalsza jazda."""
+        self.current_floor = target_floor
+        if self._has_work_here():
+            self._stationary = False
+            self._begin_stop()
+        else:
+            self.requests.pop(target_floor, None)
+            self._advance()
+
+    def _begin_stop(self):
+        """Początek postoju: wysiadanie (jeśli ktoś wysiada) albo od razu wsiadanie."""
+        passengers_out = self.passengers.get(self.current_floor)
+        if passengers_out:
+            self.env.schedule(self.stop_time, self._after_alighting, passengers_out)
+        else:
+            self._boarding_phase()
+
+    def _after_alighting(self, passengers_out):
+        self._alight(passengers_out)
+        self._boarding_phase()
+
+    def _boarding_phase(self):
+        """Wybór wsiadających; czas postoju płynie tylko, gdy ktoś wsiada."""
+        queues, passengers_to_board = self._begin_boarding()
+        if queues is None:
+            self._end_stop()
+        elif passengers_to_board:
+            self.env.schedule(self.stop_time, self._after_boarding, queues, passengers_to_board)
+        else:
+            self._end_boarding(queues)
+            self._end_stop()
+
+    def _after_boarding(self, queues, passengers_to_board):
+        self._board(passengers_to_board)
+        self._end_boarding(queues)
+        self._end_stop()
+
+    def _end_stop(self):
+        """Koniec postoju (jak w Elevator.run) i przejście do kolejnego celu."""
+        if self._stationary:
+            self.requests.pop(self.current_floor, None)
+            self.simulation.redispatch(self.current_floor, self.zone)
+        self._advance()
@@ -2,51 +2,160 @@
 Klasa reprezentująca pasażera w systemie wind.
 """
 
+import numpy as np
+
 
 class Passenger:
     """Reprezentuje pasażera oczekującego na windę lub jadącego windą."""
-    
-    def __init__(self, env, call_floor, target_floor, num_people):
+
+    __slots__ = ('call_floor', 'target_floor', 'direction', 'num_people',
+                 'arrival_time', 'trip_start_time', 'index', 'destination', 'bank',
+                 'journey_start')
+
+    def __init__(self, env, call_floor, target_floor, num_people, index=None,
+                 destination=None, bank=0):
         """
         Inicjalizuje pasażera.
-        
+
         Args:
-            env: Środowisko simpy
+            env: Środowisko simpy (odczytywany jest tylko bieżący czas, referencja
+                 nie jest przechowywana)
             call_floor: Piętro, z którego pasażer wzywa windę
-            target_floor: Piętro docelowe
+            target_floor: Piętro docelowe (w budynku strefowym - koniec bieżącego
+                          odcinka podróży, np. piętro przesiadki)
             num_people: Liczba osób w grupie
+            index: Numer wiersza w PassengerTable (jeśli używana)
+            destination: Cel całej podróży (domyślnie target_floor)
+            bank: Numer banku wind obsługującego bieżący odcinek
         """
-        self.env = env
         self.call_floor = call_floor
         self.target_floor = target_floor
         self.direction = 1 if target_floor > call_floor else -1
         self.num_people = num_people
         self.arrival_time = env.now
         self.trip_start_time = None
+        self.index = index
+        self.destination = target_floor if destination is None else destination
+        self.bank = bank
+        self.journey_start = None  # wejście do pierwszej windy (kolejne odcinki podróży)
 
-    def record_pickup(self, elevator_id, wait_times):
+    def record_pickup(self, elevator_id, wait_times, now):
         """
         Zapisuje moment wsiadania pasażera do windy.
-        
+
         Args:
             elevator_id: ID windy, która zabrała pasażera
             wait_times: Lista czasów oczekiwania (do aktualizacji)
+            now: Bieżący czas symulacji
         """
-        pickup_time = self.env.now
-        wait_time = pickup_time - self.arrival_time
+        wait_time = now - self.arrival_time
         wait_times.append(wait_time)
-        self.trip_start_time = pickup_time
+        self.trip_start_time = now
 
-    def record_dropoff(self, trip_times, total_passengers_served):
+    def record_dropoff(self, trip_times, total_passengers_served, now):
         """
         Zapisuje moment wysiadania pasażera z windy.
-        
+
         Args:
             trip_times: Lista czasów przejazdu (do aktualizacji)
             total_passengers_served: Licznik obsłużonych pasażerów (do aktualizacji)
+            now: Bieżący czas symulacji
         """
-        dropoff_time = self.env.now
-        trip_time = dropoff_time - self.trip_start_time
+        trip_time = now - self.trip_start_time
         trip_times.append(trip_time)
         total_passengers_served[0] += self.num_people
 
+
+class PassengerTable:
+    """
+    Tabela pasażerów w układzie kolumnowym (struct-of-arrays).
+
+    Każdy pasażer zajmuje jeden wiersz w prealokowanych kolumnach numpy,
+    które podwajają rozmiar po zapełnieniu. Czasy wsiadania i wysiadania
+    niezapisanych jeszcze zdarzeń mają wartość NaN.
+    """
+
+    COLUMNS = {
+        'arrival_time': np.float64,
+        'pickup_time': np.float64,
+        'dropoff_time': np.float64,
+        'call_floor': np.int32,
+        'target_floor': np.int32,
+        'num_people': np.int16,
+        'elevator_id': np.int16,
+    }
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity: Początkowa liczba wierszy
+        """
+        self.size = 0
+        self._columns = {}
+        for name, dtype in self.COLUMNS.items():
+            self._columns[name] = self._empty(name, dtype, capacity)
+
+    @staticmethod
+    def _empty(name, dtype, n):
+        """Tworzy pustą kolumnę (NaN dla czasów, -1 dla numeru windy)."""
+        if np.issubdtype(dtype, np.floating):
+            return np.full(n, np.nan, dtype=dtype)
+        return np.full(n, -1 if name == 'elevator_id' else 0, dtype=dtype)
+
+    def _grow(self):
+        """Podwaja pojemność wszystkich kolumn."""
+        for name, column in self._columns.items():
+            extra = self._empty(name, column.dtype, len(column))
+            self._columns[name] = np.concatenate([column, extra])
+
+    def add(self, arrival_time, call_floor, target_floor, num_people):
+        """
+        Dodaje pasażera.
+
+        Returns:
+            int: Numer wiersza pasażera
+        """
+        if self.size == len(self._columns['arrival_time']):
+            self._grow()
+        i = self.size
+        columns = self._columns
+        columns['arrival_time'][i] = arrival_time
+        columns['call_floor'][i] = call_floor
+        columns['target_floor'][i] = target_floor
+        columns['num_people'][i] = num_people
+        self.size += 1
+        return i
+
+    def record_pickup(self, index, time, elevator_id):
+        """Zapisuje moment wsiadania pasażera o numerze index."""
+        self._columns['pickup_time'][index] = time
+        self._columns['elevator_id'][index] = elevator_id
+
+    def record_dropoff(self, index, time):
+        """Zapisuje moment wysiadania pasażera o numerze index."""
+        self._columns['dropoff_time'][index] = time
+
+    def column(self, name):
+        """Zwraca widok zapełnionej części kolumny."""
+        return self._columns[name][:self.size]
+
+    def wait_times(self, since=None):
+        """Czasy oczekiwania pasażerów, którzy już wsiedli (opcjonalnie od chwili since)."""
+        pickup = self.column('pickup_time')
+        picked = ~np.isnan(pickup) if since is None else pickup >= since
+        return pickup[picked] - self.column('arrival_time')[picked]
+
+    def trip_times(self, since=None):
+        """Czasy przejazdu pasażerów, którzy już wysiedli (opcjonalnie od chwili since)."""
+        dropoff = self.column('dropoff_time')
+        done = ~np.isnan(dropoff) if since is None else dropoff >= since
+        return dropoff[done] - self.column('pickup_time')[done]
+
+    def total_served(self):
+        """Liczba osób dowiezionych do celu."""
+        done = ~np.isnan(self.column('dropoff_time'))
+        return int(self.column('num_people')[done].sum())
+
+    def nbytes(self):
+        """Łączny rozmiar zaalokowanych kolumn w bajtach."""
+        return sum(column.nbytes for column in self._columns.values())
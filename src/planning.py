@@ -0,0 +1,252 @@
+"""
+Planowanie pojemności: najtańsza konfiguracja (liczba wind, pojemność kabiny,
+algorytm), dla której 95. percentyl czasu oczekiwania mieści się w SLA
+przy zadanej intensywności zgłoszeń.
+
+Zamiast przeglądać całą siatkę wyszukiwanie korzysta z monotoniczności:
+więcej wind albo większa pojemność nie wydłuża oczekiwania, więc
+- dla każdej pojemności minimalna liczba wind szukana jest bisekcją,
+- minimum znalezione dla mniejszej pojemności ogranicza z góry zakres dla
+  większej, a wyniki już zbadanych punktów rozstrzygają punkty przez nie
+  zdominowane (bez symulacji),
+- punkty nie tańsze od najlepszego dotąd rozwiązania są pomijane.
+
+Każdy punkt oceniany jest replikacjami ze wspólnymi liczbami losowymi
+(ten sam strumień zgłoszeń dla wszystkich konfiguracji). Kolejne replikacje
+dokładane są tylko, dopóki przedział ufności p95 obejmuje próg SLA, a
+replikacja, której p95 już w trakcie wyraźnie przekracza SLA (abort_factor),
+jest przerywana - przeciążone konfiguracje odpadają po krótkim odcinku.
+
+Uruchomienie:
+    python -m src.planning --sla 60 --rate 0.6
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from .arrivals import ArrivalStream
+from .batch import confidence_interval, replication_seeds
+from .config import SimulationConfig
+from .engine import HeapEnvironment
+from .simulation import BuildingSimulation
+
+
+def default_cost(num_elevators, capacity, algorithm):
+    """Koszt domyślny: najpierw liczba wind, potem pojemność kabiny."""
+    return (num_elevators, capacity)
+
+
+def _replication(algorithm, config, seed, sla, warmup, sim_time, check_interval,
+                 abort_factor, min_abort_waits, max_group, traffic, options):
+    """
+    Jedna replikacja z przerwaniem po wyraźnym przekroczeniu SLA.
+
+    Przerwanie możliwe jest dopiero od drugiego sprawdzenia (po co najmniej
+    2 * check_interval pomiaru) i przy co najmniej min_abort_waits czasach
+    oczekiwania, aby krótki początkowy odcinek nie przesądzał o wyniku.
+
+    Returns:
+        tuple: (p95 czasu oczekiwania, czy przerwano, czas symulacji)
+    """
+    env = HeapEnvironment()
+    arrivals = ArrivalStream(seed, rate=config.call_arrival_rate, num_floors=config.num_floors,
+                             max_group=max_group, profile=traffic)
+    simulation = BuildingSimulation(env, config.num_elevators, algorithm, arrivals=arrivals,
+                                    config=config, **options)
+    env.run(until=warmup)
+    simulation.reset_statistics()
+    end = warmup + sim_time
+    earliest_abort = warmup + 2 * check_interval
+    t = warmup
+    p95 = 0.0
+    while t < end:
+        t = min(t + check_interval, end)
+        env.run(until=t)
+        waits = simulation.wait_time_array()
+        p95 = float(np.quantile(waits, 0.95)) if len(waits) else 0.0
+        if (earliest_abort <= t < end and len(waits) >= min_abort_waits
+                and p95 > abort_factor * sla):
+            return p95, True, t
+    return p95, False, end
+
+
+def plan_capacity(sla_p95, arrival_rate, elevators=(1, 16), capacities=None,
+                  algorithms=('A', 'B'), cost=default_cost, sim_time=3000, warmup=500,
+                  n_replications=5, min_replications=2, confidence=0.95, abort_factor=2.0,
+                  check_interval=250, min_abort_waits=30, max_group=None, base_seed=0,
+                  config=None, traffic=None, verbose=True, **options):
+    """
+    Szuka najtańszej konfiguracji spełniającej SLA dla 95. percentyla oczekiwania.
+
+    Args:
+        sla_p95: Dopuszczalny 95. percentyl czasu oczekiwania
+        arrival_rate: Intensywność zgłoszeń
+        elevators: Zakres liczby wind (min, max) włącznie
+        capacities: Rozważane pojemności kabiny (domyślnie max_group, max_group + 2,
+                    ..., max_group + 10)
+        algorithms: Rozważane algorytmy
+        cost: Funkcja cost(liczba wind, pojemność, algorytm) zwracająca wartość
+              porównywalną (liczbę lub krotkę), niemalejącą względem liczby wind
+              i pojemności; domyślnie najmniej wind, potem najmniejsza pojemność
+        sim_time: Czas pomiaru jednej replikacji (po rozbiegu)
+        warmup: Czas rozbiegu pomijany w statystykach
+        n_replications: Maksymalna liczba replikacji punktu
+        min_replications: Liczba replikacji przed pierwszą oceną przedziału
+        confidence: Poziom ufności przedziału p95 (średniej z replikacji); gdy po
+                    n_replications przedział nadal obejmuje próg, decyduje średnia
+        abort_factor: Replikacja jest przerywana, gdy p95 w trakcie przekroczy
+                      abort_factor * sla_p95 (punkt uznawany za niespełniający SLA)
+        check_interval: Co ile jednostek czasu sprawdzać warunek przerwania;
+                        przerwanie możliwe od drugiego sprawdzenia
+        min_abort_waits: Minimalna liczba czasów oczekiwania przed przerwaniem
+        max_group: Maksymalna liczba osób w grupie (domyślnie config.max_capacity);
+                   strumień zgłoszeń nie zależy od badanej pojemności
+        base_seed: Ziarno główne strumienia ziaren replikacji
+        config: Parametry bazowe budynku (SimulationConfig)
+        traffic: Profil ruchu (TrafficProfile) zamiast stałej intensywności
+        verbose: Czy wypisywać przebieg wyszukiwania
+        options: Dodatkowe argumenty BuildingSimulation (np. dispatch_window)
+
+    Returns:
+        dict: 'best' (najtańszy punkt spełniający SLA albo None; gdy najtańsze
+              minimum rozstrzygnięto z monotoniczności - zbadany punkt, który je
+              rozstrzygnął, nie droższy od niego), 'evaluations'
+              (punkty zbadane symulacją, w kolejności), 'inferred' (liczba punktów
+              rozstrzygniętych z monotoniczności), 'grid_size' (liczba punktów
+              pełnej siatki), 'sim_time' (łączny czas symulacji). Punkt to słownik
+              z kluczami 'algorithm', 'num_elevators', 'capacity', 'cost', 'meets',
+              'p95_wait' (wynik confidence_interval), 'replications', 'aborted'
+    """
+    config = config if config is not None else SimulationConfig()
+    max_group = config.max_capacity if max_group is None else max_group
+    if capacities is None:
+        capacities = range(max_group, max_group + 11, 2)
+    capacities = sorted(capacities)
+    if capacities[0] < max_group:
+        raise ValueError(f"Pojemność kabiny ({capacities[0]}) mniejsza niż największa grupa "
+                         f"({max_group}) - grupa nie wsiadłaby do windy")
+    low, high = elevators
+    if not 1 <= low <= high:
+        raise ValueError("Zakres liczby wind musi spełniać 1 <= min <= max")
+    if sim_time <= 0 or check_interval <= 0 or warmup < 0:
+        raise ValueError("Czas pomiaru i odstęp sprawdzeń muszą być dodatnie, "
+                         "a czas rozbiegu nieujemny")
+    seeds = replication_seeds(base_seed, n_replications)
+    search = {'evaluations': [], 'inferred': 0, 'sim_time': 0.0}
+    known = {}  # algorytm -> [(liczba wind, pojemność, czy spełnia SLA)]
+    points = {}  # (algorytm, liczba wind, pojemność) -> punkt zbadany symulacją
+
+    def meets(algorithm, n, capacity):
+        """Czy punkt spełnia SLA - z monotoniczności albo z symulacji."""
+        for kn, kc, ok in known[algorithm]:
+            if (ok and kn <= n and kc <= capacity) or (not ok and kn >= n and kc >= capacity):
+                search['inferred'] += 1
+                return ok
+        point = _evaluate(algorithm, n, capacity)
+        known[algorithm].append((n, capacity, point['meets']))
+        return point['meets']
+
+    def _evaluate(algorithm, n, capacity):
+        point_config = config.replace(num_elevators=n, max_capacity=capacity,
+                                      call_arrival_rate=arrival_rate)
+        values, aborted = [], False
+        for seed in seeds:
+            p95, aborted, simulated = _replication(algorithm, point_config, seed, sla_p95, warmup,
+                                                   sim_time, check_interval, abort_factor,
+                                                   min_abort_waits, max_group, traffic, options)
+            search['sim_time'] += simulated
+            values.append(p95)
+            if aborted:
+                break
+            if len(values) >= min_replications:
+                lower, upper = confidence_interval(values, confidence)['ci']
+                if upper <= sla_p95 or lower > sla_p95:
+                    break
+        ci = confidence_interval(values, confidence)
+        point = {
+            'algorithm': algorithm,
+            'num_elevators': n,
+            'capacity': capacity,
+            'cost': cost(n, capacity, algorithm),
+            'meets': not aborted and ci['mean'] <= sla_p95,
+            'p95_wait': ci,
+            'replications': len(values),
+            'aborted': aborted,
+        }
+        search['evaluations'].append(point)
+        points[(algorithm, n, capacity)] = point
+        if verbose:
+            status = 'OK ' if point['meets'] else 'przerwano' if aborted else 'nie'
+            print(f"  {algorithm} wind={n:>3} pojemność={capacity:>3}: p95 {ci['mean']:8.2f} "
+                  f"({len(values)} repl.) {status}")
+        return point
+
+    best = None
+    for algorithm in algorithms:
+        known[algorithm] = []
+        upper = high  # minimum dla mniejszej pojemności ogranicza zakres większych
+        for capacity in capacities:
+            lo, hi = low, upper
+            # punkty nie tańsze od najlepszego rozwiązania nic nie poprawią
+            if best is not None:
+                while hi >= lo and not cost(hi, capacity, algorithm) < best['cost']:
+                    hi -= 1
+            found = None
+            while lo <= hi:
+                mid = (lo + hi) // 2
+                if meets(algorithm, mid, capacity):
+                    found, hi = mid, mid - 1
+                else:
+                    lo = mid + 1
+            if found is None:
+                continue
+            upper = found
+            point = points.get((algorithm, found, capacity))
+            if point is None:
+                # minimum rozstrzygnięte z monotoniczności: zamiast niego najtańszy
+                # zbadany punkt spełniający SLA, który je zdominował (nie jest droższy)
+                point = min((p for p in search['evaluations']
+                             if p['algorithm'] == algorithm and p['meets']
+                             and p['num_elevators'] <= found and p['capacity'] <= capacity),
+                            key=lambda p: p['cost'])
+            if best is None or point['cost'] < best['cost']:
+                best = point
+
+    search['best'] = best
+    search['grid_size'] = len(algorithms) * len(capacities) * (high - low + 1)
+    if verbose:
+        print(f"Zbadano {len(search['evaluations'])} z {search['grid_size']} punktów siatki "
+              f"(rozstrzygniętych z monotoniczności: {search['inferred']})")
+        if best is None:
+            print(f"Żadna konfiguracja nie spełnia SLA p95 <= {sla_p95}")
+        else:
+            print(f"Najtańsza konfiguracja: algorytm {best['algorithm']}, "
+                  f"wind {best['num_elevators']}, pojemność {best['capacity']}")
+    return search
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Najtańsza konfiguracja wind spełniająca SLA")
+    parser.add_argument('--sla', type=float, required=True, help="dopuszczalny p95 oczekiwania")
+    parser.add_argument('--rate', type=float, required=True, help="intensywność zgłoszeń")
+    parser.add_argument('--elevators', type=int, nargs=2, default=(1, 16), metavar=('MIN', 'MAX'))
+    parser.add_argument('--capacities', type=int, nargs='+', help="pojemności kabiny")
+    parser.add_argument('--algorithms', nargs='+', choices=('A', 'B'), default=('A', 'B'))
+    parser.add_argument('--max-group', type=int, help="największa grupa pasażerów")
+    parser.add_argument('--sim-time', type=float, default=3000)
+    parser.add_argument('--replications', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = plan_capacity(args.sla, args.rate, tuple(args.elevators), args.capacities,
+                           tuple(args.algorithms), sim_time=args.sim_time,
+                           n_replications=args.replications, max_group=args.max_group,
+                           base_seed=args.seed)
+    return 0 if result['best'] is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
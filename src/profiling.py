@@ -0,0 +1,217 @@
+"""
+Opcjonalna instrumentacja symulacji: czasy i liczniki faz, liczba zdarzeń
+według procesu, zrzut cProfile/pstats i stosów w formacie "collapsed".
+
+Profiler podmienia metody faz na poziomie konkretnych obiektów symulacji
+(atrybuty instancji przesłaniają metody klasy), więc symulacja bez
+profilera wykonuje dokładnie ten sam kod co wcześniej - bez żadnych
+sprawdzeń w gorących ścieżkach.
+"""
+
+import cProfile
+import functools
+import time
+import weakref
+
+from .engine import HeapEnvironment
+
+# faza -> metody BuildingSimulation
+SIMULATION_PHASES = {
+    'call_generation': ('_handle_arrival',),
+    'dispatch': ('_assign_call', '_dispatch_batch'),
+}
+
+# faza -> metody Elevator
+ELEVATOR_PHASES = {
+    'destination': ('_get_next_destination',),
+    'movement': ('_depart',),
+    'alighting': ('_alight',),
+    'boarding': ('_begin_boarding', '_board', '_end_boarding'),
+}
+
+# czas poza fazami: pętla zdarzeń, wznawianie generatorów, wywołania zwrotne
+SCHEDULING = 'scheduling'
+
+
+class Profiler:
+    """
+    Zbiera czasy własne (bez faz zagnieżdżonych) i liczby wywołań faz
+    oraz liczbę zdarzeń według procesu, który je zaplanował.
+
+    Użycie:
+        profiler = Profiler()
+        profiler.attach_environment(env)
+        simulation = BuildingSimulation(env, ...)
+        profiler.attach(simulation)
+        profiler.run(env, until=sim_time)
+        profiler.report()
+    """
+
+    def __init__(self, cprofile=False):
+        """
+        Args:
+            cprofile: Czy dodatkowo uruchomić cProfile na czas profiler.run
+                      (wyniki do zapisu przez dump_pstats)
+        """
+        self.calls = {}    # faza -> liczba wywołań
+        self.times = {}    # faza -> czas własny [s]
+        self.stacks = {}   # 'faza;podfaza' -> czas własny [s] (do dump_collapsed)
+        self.events = {}   # proces/wywołanie zwrotne -> liczba zaplanowanych zdarzeń
+        self.total_time = 0.0
+        self._stack = []   # aktywne fazy: [nazwa, czas faz zagnieżdżonych]
+        self._envs = set()
+        self._cprofile = cProfile.Profile() if cprofile else None
+
+    def timed(self, phase, func):
+        """
+        Opakowuje funkcję pomiarem czasu przypisanym do fazy.
+
+        Args:
+            phase: Nazwa fazy
+            func: Funkcja (zwykle metoda związana z obiektem)
+
+        Returns:
+            callable: Funkcja mierząca czas własny wywołań
+        """
+        stack = self._stack
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frame = [phase, 0.0]
+            stack.append(frame)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                path = ';'.join(f[0] for f in stack)
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                own = elapsed - frame[1]
+                self.calls[phase] = self.calls.get(phase, 0) + 1
+                self.times[phase] = self.times.get(phase, 0.0) + own
+                self.stacks[path] = self.stacks.get(path, 0.0) + own
+        return wrapper
+
+    def attach_environment(self, env):
+        """
+        Zlicza zdarzenia planowane w środowisku według procesu (simpy)
+        lub wywołania zwrotnego (HeapEnvironment), który je zaplanował.
+
+        Aby policzyć także zdarzenia startowe procesów (i nazwać procesy simpy
+        nazwami ich generatorów, np. 'Elevator.run'), należy wywołać przed
+        utworzeniem BuildingSimulation.
+        """
+        if id(env) in self._envs:
+            return
+        self._envs.add(id(env))
+        events = self.events
+        schedule = env.schedule
+
+        if isinstance(env, HeapEnvironment):
+            def counting_schedule(delay, callback, *args):
+                name = getattr(callback, '__qualname__', type(callback).__name__)
+                events[name] = events.get(name, 0) + 1
+                schedule(delay, callback, *args)
+        else:
+            # nazwy procesów zapamiętywane przy ich tworzeniu (process.name nie
+            # zawiera klasy, np. 'run' zamiast 'Elevator.run')
+            names = weakref.WeakKeyDictionary()
+            create_process = env.process
+
+            def named_process(generator):
+                process = create_process(generator)
+                names[process] = getattr(generator, '__qualname__', process.name)
+                return process
+
+            def counting_schedule(event, *args, **kwargs):
+                process = env.active_process
+                if process is None:
+                    name = 'callback'
+                else:
+                    name = names.get(process) or process.name
+                events[name] = events.get(name, 0) + 1
+                schedule(event, *args, **kwargs)
+            env.process = named_process
+        env.schedule = counting_schedule
+
+    def attach(self, simulation):
+        """
+        Włącza pomiar faz dla symulacji i wszystkich jej wind.
+
+        Args:
+            simulation: Obiekt BuildingSimulation
+        """
+        self.attach_environment(simulation.env)
+        targets = [(simulation, SIMULATION_PHASES)]
+        targets += [(elevator, ELEVATOR_PHASES) for elevator in simulation.elevators]
+        for obj, phases in targets:
+            for phase, methods in phases.items():
+                for name in methods:
+                    setattr(obj, name, self.timed(phase, getattr(obj, name)))
+
+    def run(self, env, until):
+        """Wykonuje env.run(until) mierząc łączny czas (i ewentualnie cProfile)."""
+        start = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        try:
+            env.run(until=until)
+        finally:
+            if self._cprofile is not None:
+                self._cprofile.disable()
+            self.total_time += time.perf_counter() - start
+
+    @property
+    def scheduling_time(self):
+        """Czas poza mierzonymi fazami (planowanie i obsługa zdarzeń)."""
+        return max(0.0, self.total_time - sum(self.times.values()))
+
+    def report(self):
+        """
+        Zwraca podsumowanie pomiarów.
+
+        Returns:
+            dict: 'total_time', 'phases' (faza -> {'calls', 'time', 'share'};
+                  faza 'scheduling' to czas poza fazami) i 'events'
+                  (proces -> liczba zdarzeń)
+        """
+        total = self.total_time
+        phases = {phase: {'calls': self.calls[phase], 'time': t,
+                          'share': t / total if total else 0.0}
+                  for phase, t in self.times.items()}
+        phases[SCHEDULING] = {'calls': sum(self.events.values()), 'time': self.scheduling_time,
+                              'share': self.scheduling_time / total if total else 0.0}
+        return {
+            'total_time': total,
+            'phases': dict(sorted(phases.items(), key=lambda kv: -kv[1]['time'])),
+            'events': dict(sorted(self.events.items(), key=lambda kv: -kv[1])),
+        }
+
+    def print_report(self):
+        """Wypisuje podsumowanie w formie tabeli."""
+        report = self.report()
+        print(f"Profil ({report['total_time']:.3f} s):")
+        for phase, p in report['phases'].items():
+            print(f"  {phase:<16} {p['time']:8.3f} s {p['share']:6.1%} {p['calls']:>10} wywołań")
+        print("Zdarzenia według procesu:")
+        for name, count in report['events'].items():
+            print(f"  {name:<40} {count:>10}")
+
+    def dump_pstats(self, path):
+        """Zapisuje wyniki cProfile (do odczytu przez pstats lub snakeviz)."""
+        if self._cprofile is None:
+            raise ValueError("Profiler utworzono bez cprofile=True")
+        self._cprofile.dump_stats(path)
+
+    def dump_collapsed(self, path, root='simulation'):
+        """
+        Zapisuje stosy faz w formacie "collapsed" (flamegraph.pl, speedscope):
+        jedna linia 'root;faza;podfaza mikrosekundy' na ścieżkę.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{root};{SCHEDULING} {round(self.scheduling_time * 1e6)}\n")
+            for stack, t in sorted(self.stacks.items()):
+                f.write(f"{root};{stack} {round(t * 1e6)}\n")
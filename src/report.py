@@ -0,0 +1,176 @@
+"""
+Wykresy wyników zapisywane do plików (bez okien i bez pyplot).
+
+matplotlib importowany jest dopiero przy rysowaniu, więc `import src`
+i run_simulation nie płacą za jego wczytanie - ma to znaczenie dla krótko
+żyjących procesów replikacji. Rysunki budowane są na obiekcie Figure
+z płótnem Agg, co działa także bez wyświetlacza (serwery, CI, procesy potomne).
+
+Funkcje przyjmują dowolną liczbę wyników:
+- słowniki z run_simulation (pojedyncze wartości),
+- komórki z run_batch / run_sweep (średnie z przedziałami ufności z replikacji).
+"""
+
+import math
+from pathlib import Path
+
+from .config import SimulationConfig
+
+METRIC_TITLES = {
+    'avg_wait': 'Średni czas oczekiwania',
+    'p50_wait': 'Mediana czasu oczekiwania',
+    'p95_wait': '95. percentyl czasu oczekiwania',
+    'p99_wait': '99. percentyl czasu oczekiwania',
+    'avg_trip': 'Średni czas przejazdu',
+    'total_served': 'Łącznie obsłużonych pasażerów',
+    'total_movement': 'Łączny czas ruchu wind',
+}
+
+DEFAULT_METRICS = ('avg_wait', 'p95_wait', 'avg_trip', 'total_served')
+
+
+def _figure(n_panels, panel_size=(6, 4)):
+    """Nowy rysunek Agg z siatką n_panels osi (najwyżej dwie kolumny)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    ncols = min(2, n_panels)
+    nrows = -(-n_panels // ncols)
+    fig = Figure(figsize=(panel_size[0] * ncols, panel_size[1] * nrows))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, squeeze=False).flatten()
+    for ax in axes[n_panels:]:
+        ax.set_visible(False)
+    return fig, axes[:n_panels]
+
+
+def _save(fig, path, dpi):
+    """Zapisuje rysunek (format z rozszerzenia pliku) i zwraca ścieżkę."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def _config_dict(config):
+    return config.to_dict() if isinstance(config, SimulationConfig) else dict(config or {})
+
+
+def label(result):
+    """
+    Etykieta wyniku: algorytm oraz parametry punktu (run_batch) albo pola
+    konfiguracji różniące się od domyślnych (run_sweep).
+    """
+    text = f"Alg {result.get('algorithm', '?')}"
+    params = dict(result.get('params') or {})
+    defaults = SimulationConfig().to_dict()
+    params.update({k: v for k, v in _config_dict(result.get('config')).items() if defaults.get(k) != v})
+    if params:
+        text += ' (' + ', '.join(f'{k}={v}' for k, v in params.items()) + ')'
+    return text
+
+
+def metric_value(result, metric):
+    """
+    Wartość metryki i połowa szerokości przedziału ufności.
+
+    Returns:
+        tuple: (wartość, połowa szerokości albo None dla pojedynczej symulacji)
+    """
+    if 'metrics' in result:
+        ci = result['metrics'][metric]
+        # jedna replikacja nie daje przedziału (nieskończona szerokość)
+        return ci['mean'], ci['half_width'] if math.isfinite(ci['half_width']) else None
+    return result[metric], None
+
+
+def plot_comparison(results, path='results.png', metrics=DEFAULT_METRICS, labels=None,
+                    title=None, dpi=100):
+    """
+    Wykres słupkowy porównujący dowolną liczbę wyników (panel na metrykę).
+
+    Dla komórek z replikacjami słupki mają wąsy przedziału ufności.
+
+    Args:
+        results: Lista wyników run_simulation albo komórek run_batch / run_sweep
+        path: Plik wynikowy (.png, .svg, .pdf, ...)
+        metrics: Metryki do narysowania
+        labels: Etykiety słupków (domyślnie z label())
+        title: Tytuł rysunku
+        dpi: Rozdzielczość
+
+    Returns:
+        pathlib.Path: Ścieżka zapisanego pliku
+    """
+    labels = [label(r) for r in results] if labels is None else list(labels)
+    fig, axes = _figure(len(metrics))
+    if title:
+        fig.suptitle(title)
+    positions = range(len(results))
+    for ax, metric in zip(axes, metrics):
+        values, errors = zip(*(metric_value(r, metric) for r in results))
+        yerr = None if all(e is None for e in errors) else [e or 0.0 for e in errors]
+        bars = ax.bar(positions, values, yerr=yerr, capsize=4 if yerr else 0,
+                      color=[f'C{i}' for i in positions])
+        ax.set_xticks(list(positions))
+        ax.set_xticklabels(labels, rotation=20 if len(results) > 3 else 0, ha='right'
+                           if len(results) > 3 else 'center')
+        ax.set_title(METRIC_TITLES.get(metric, metric))
+        for bar, value in zip(bars, values):
+            ax.annotate(f'{value:.2f}', (bar.get_x() + bar.get_width() / 2, bar.get_height()),
+                        ha='center', va='bottom', fontsize=8)
+    fig.tight_layout()
+    return _save(fig, path, dpi)
+
+
+def plot_sweep(cells, parameter, path='sweep.png', metrics=('avg_wait', 'p95_wait'),
+               title=None, dpi=100):
+    """
+    Metryki w funkcji parametru przeglądu z pasmami przedziałów ufności.
+
+    Każdy algorytm (i każda kombinacja pozostałych zmiennych parametrów) to
+    osobna linia; pasmo to średnia ± połowa szerokości przedziału z replikacji.
+
+    Args:
+        cells: Komórki z run_sweep (parametr z 'config') lub run_batch (z 'params')
+        parameter: Nazwa parametru na osi X (np. 'call_arrival_rate')
+        path: Plik wynikowy
+        metrics: Metryki do narysowania (panel na metrykę)
+        title: Tytuł rysunku
+        dpi: Rozdzielczość
+
+    Returns:
+        pathlib.Path: Ścieżka zapisanego pliku
+    """
+    points = [{**_config_dict(cell.get('config')), **(cell.get('params') or {})} for cell in cells]
+    if any(parameter not in point for point in points):
+        raise ValueError(f"Nie wszystkie komórki zawierają parametr {parameter!r}")
+    # pozostałe parametry, które zmieniają się między komórkami, rozróżniają linie
+    varying = [k for k in points[0]
+               if k != parameter and len({repr(point.get(k)) for point in points}) > 1]
+    series = {}  # etykieta linii -> [(x, komórka)]
+    for cell, point in zip(cells, points):
+        name = f"Alg {cell.get('algorithm', '?')}"
+        if varying:
+            name += ' (' + ', '.join(f'{k}={point.get(k)}' for k in varying) + ')'
+        series.setdefault(name, []).append((point[parameter], cell))
+
+    fig, axes = _figure(len(metrics))
+    if title:
+        fig.suptitle(title)
+    for ax, metric in zip(axes, metrics):
+        for i, (name, line) in enumerate(series.items()):
+            line.sort(key=lambda p: p[0])
+            xs = [x for x, _ in line]
+            values, errors = zip(*(metric_value(cell, metric) for _, cell in line))
+            ax.plot(xs, values, marker='o', color=f'C{i}', label=name)
+            if any(e is not None for e in errors):
+                low = [v - (e or 0.0) for v, e in zip(values, errors)]
+                high = [v + (e or 0.0) for v, e in zip(values, errors)]
+                ax.fill_between(xs, low, high, color=f'C{i}', alpha=0.2, linewidth=0)
+        ax.set_xlabel(parameter)
+        ax.set_title(METRIC_TITLES.get(metric, metric))
+        ax.grid(alpha=0.3)
+        ax.legend(fontsize=8)
+    fig.tight_layout()
+    return _save(fig, path, dpi)
@@ -0,0 +1,185 @@
+"""
+Sekwencyjne zatrzymywanie: symulacja trwa, aż przedział ufności średniego
+czasu oczekiwania (i opcjonalnie 95. percentyla) będzie dostatecznie wąski.
+
+Dostępne są dwie metody:
+- 'replications' - kolejne niezależne replikacje (rundami w puli procesów),
+  przedział t-Studenta z wyników replikacji
+- 'batch_means' - jedna długa symulacja przedłużana odcinkami; okres rozbiegu
+  obcinany jest metodą MSER-5 (dopóki punkt obcięcia wypada w drugiej połowie
+  serii, symulacja trwa dalej), a przedział liczony ze średnich z partii
+
+Łatwe konfiguracje kończą się po kilku replikacjach lub krótkim przebiegu,
+zatłoczone symulowane są dłużej, a przeciążone (bez stanu ustalonego)
+zatrzymuje dopiero limit - wynik ma wtedy converged=False.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch import _run_replication, confidence_interval, replication_seeds
+from .checkpoint import mser5
+from .engine import CountingEnvironment, HeapEnvironment
+from .simulation import BuildingSimulation
+from .stats import event_count
+
+METHODS = ('replications', 'batch_means')
+
+
+def _precise(metrics, targets, relative):
+    """Czy połowa szerokości przedziału każdej metryki mieści się w jej tolerancji."""
+    for name, tolerance in targets.items():
+        ci = metrics[name]
+        width = ci['half_width']
+        if relative:
+            width = width / abs(ci['mean']) if ci['mean'] else math.inf
+        if not width <= tolerance:
+            return False
+    return True
+
+
+def _batch_metrics(waits, n_batches, confidence):
+    """Przedziały ufności ze średnich i 95. percentyli kolejnych partii obserwacji."""
+    size = len(waits) // n_batches
+    batches = waits[:size * n_batches].reshape(n_batches, size)
+    return {
+        'avg_wait': confidence_interval(batches.mean(axis=1), confidence),
+        'p95_wait': confidence_interval(np.quantile(batches, 0.95, axis=1), confidence),
+    }
+
+
+def run_until_precision(alg_type, tolerance, p95_tolerance=None, relative=False,
+                        method='replications', confidence=0.95, base_seed=0,
+                        sim_time=500, min_replications=5, max_replications=200, max_workers=None,
+                        check_interval=1000.0, max_time=200000.0, n_batches=20,
+                        min_batch_size=5, engine='heap', verbose=True, **options):
+    """
+    Symuluje, aż połowa szerokości przedziału ufności spadnie poniżej tolerancji.
+
+    Args:
+        alg_type: Typ algorytmu ('A' lub 'B')
+        tolerance: Dopuszczalna połowa szerokości przedziału średniego czasu oczekiwania
+        p95_tolerance: Dopuszczalna połowa szerokości przedziału 95. percentyla
+                       (None - bez warunku na percentyl)
+        relative: Czy tolerancje są względne (połowa szerokości / średnia)
+        method: 'replications' lub 'batch_means'
+        confidence: Poziom ufności
+        base_seed: Ziarno główne (replikacje) lub ziarno symulacji (batch_means)
+        sim_time: Czas trwania jednej replikacji (replications)
+        min_replications: Liczba replikacji przed pierwszą oceną (replications)
+        max_replications: Limit replikacji (replications)
+        max_workers: Liczba procesów (1 = replikacje po jednej w bieżącym procesie)
+        check_interval: Co ile jednostek czasu oceniać przedział (batch_means)
+        max_time: Limit czasu symulacji (batch_means)
+        n_batches: Liczba partii (batch_means)
+        min_batch_size: Minimalna liczba obserwacji w partii (batch_means)
+        engine: Silnik zdarzeń ('heap' lub 'simpy')
+        verbose: Czy wypisać podsumowanie
+        options: Dodatkowe argumenty run_simulation / BuildingSimulation
+                 (np. config, num_elevators, dispatch_window, fast_path)
+
+    Returns:
+        dict: 'algorithm', 'method', 'converged', 'n' (replikacje lub partie),
+              'sim_time' (łączny czas symulacji), 'events' (łączna liczba
+              zdarzeń), 'metrics' (metryka -> wynik confidence_interval); dla
+              replikacji dodatkowo 'replications', dla partii 'warmup' (liczba
+              obciętych obserwacji) i 'observations'
+    """
+    if method not in METHODS:
+        raise ValueError(f"Nieznana metoda: {method!r} (dostępne: {', '.join(METHODS)})")
+    targets = {'avg_wait': tolerance}
+    if p95_tolerance is not None:
+        targets['p95_wait'] = p95_tolerance
+    if method == 'replications':
+        result = _replications(alg_type, targets, relative, confidence, base_seed, sim_time,
+                               min_replications, max_replications, max_workers,
+                               dict(options, engine=engine))
+    else:
+        result = _batch_means(alg_type, targets, relative, confidence, base_seed,
+                              check_interval, max_time, n_batches, min_batch_size,
+                              engine, options)
+    result['algorithm'] = alg_type
+    result['method'] = method
+    if verbose:
+        status = "osiągnięto precyzję" if result['converged'] else "limit bez osiągnięcia precyzji"
+        unit = 'replikacji' if method == 'replications' else 'partii'
+        print(f"Algorytm {alg_type}: {status} - {result['n']} {unit}, "
+              f"czas symulacji {result['sim_time']:.0f}, zdarzeń {result['events']}")
+        for name in targets:
+            ci = result['metrics'][name]
+            print(f"  {name}: {ci['mean']:.2f} ± {ci['half_width']:.2f}")
+    return result
+
+
+def _replications(alg_type, targets, relative, confidence, base_seed, sim_time,
+                  min_replications, max_replications, max_workers, options):
+    """Dokłada rundy replikacji do spełnienia warunku precyzji lub limitu."""
+    seeds = replication_seeds(base_seed, max_replications)
+    workers = 1 if max_workers == 1 else max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    results, metrics, converged = [], None, False
+    try:
+        while len(results) < max_replications:
+            size = min_replications if not results else workers
+            size = min(max(size, 1), max_replications - len(results))
+            tasks = [(alg_type, sim_time, seed, options)
+                     for seed in seeds[len(results):len(results) + size]]
+            results.extend(pool.map(_run_replication, tasks) if pool is not None
+                           else map(_run_replication, tasks))
+            metrics = {name: confidence_interval([r[name] for r in results], confidence)
+                       for name in targets}
+            if len(results) >= min_replications and _precise(metrics, targets, relative):
+                converged = True
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return {
+        'converged': converged,
+        'n': len(results),
+        'sim_time': len(results) * sim_time,
+        'events': sum(r['events'] for r in results),
+        'metrics': metrics,
+        'replications': results,
+    }
+
+
+def _batch_means(alg_type, targets, relative, confidence, seed, check_interval, max_time,
+                 n_batches, min_batch_size, engine, options):
+    """Przedłuża jedną symulację do spełnienia warunku precyzji metodą średnich z partii."""
+    if options.get('streaming'):
+        raise ValueError("Metoda batch_means wymaga pełnej serii czasów oczekiwania "
+                         "(bez trybu strumieniowego)")
+    options = dict(options)
+    num_elevators = options.pop('num_elevators', None)
+    env = HeapEnvironment() if engine == 'heap' else CountingEnvironment()
+    simulation = BuildingSimulation(env, num_elevators, alg_type, rng=seed, **options)
+    t, metrics, converged = 0.0, None, False
+    warmup = observations = 0  # obcięcie i długość serii ostatniej oceny przedziału
+    while t < max_time:
+        t = min(t + check_interval, max_time)
+        env.run(until=t)
+        waits = simulation.wait_time_array()
+        truncation = mser5(waits)
+        # punkt obcięcia w drugiej połowie serii - rozbieg jeszcze trwa
+        if truncation > len(waits) / 2 or len(waits) - truncation < n_batches * min_batch_size:
+            continue
+        metrics = _batch_metrics(waits[truncation:], n_batches, confidence)
+        warmup, observations = truncation, len(waits) - truncation
+        if _precise(metrics, targets, relative):
+            converged = True
+            break
+    if metrics is None:
+        metrics = {name: confidence_interval([], confidence) for name in ('avg_wait', 'p95_wait')}
+    return {
+        'converged': converged,
+        'n': n_batches,
+        'sim_time': t,
+        'events': event_count(env),
+        'metrics': metrics,
+        'warmup': warmup,
+        'observations': observations,
+    }
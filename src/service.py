@@ -0,0 +1,351 @@
+"""
+Symulacja jako długo działająca usługa asyncio (czas rzeczywisty lub przyspieszony).
+
+Czas symulacji podąża za zegarem pętli zdarzeń: t_sym = speed * t_rzeczywisty.
+Silnik HeapEnvironment przesuwany jest do bieżącego t_sym co `tick` sekund
+oraz przy każdym wstrzykniętym wezwaniu, więc wezwanie trafia do symulacji
+dokładnie w chwili odpowiadającej momentowi jego odebrania. Zamiast
+simpy.RealtimeEnvironment (który usypia wątek i blokowałby pętlę asyncio)
+usługa sama dopasowuje postęp symulacji do zegara.
+
+Wezwania przyjmowane są przez lokalne gniazdo (TCP albo gniazdo uniksowe)
+w prostym protokole tekstowym, po jednym poleceniu w wierszu:
+
+    <piętro wezwania> <piętro docelowe> [liczba osób]   - wstrzyknięcie wezwania
+    metrics                                             - bieżące metryki (wiersz JSON)
+    subscribe [odstęp w sekundach]                      - metryki co odstęp, do rozłączenia
+
+Wezwania nie są potwierdzane (odpowiedź przychodzi tylko w razie błędu:
+wiersz zaczynający się od "error"), a dane czytane są blokami, więc jedno
+połączenie przenosi tysiące wezwań na sekundę.
+
+Uruchomienie:
+    python -m src.service --port 8765 --speed 10 --algorithm B
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from .arrivals import ArrivalStream
+from .config import SimulationConfig
+from .engine import HeapEnvironment
+from .simulation import BuildingSimulation
+from .streaming import RollingMetrics
+
+
+class SimulationService:
+    """
+    BuildingSimulation sterowana zegarem pętli asyncio, z wstrzykiwaniem wezwań
+    i bieżącymi metrykami z okna przesuwnego.
+    """
+
+    def __init__(self, algorithm_type='B', speed=1.0, tick=0.01, window=60.0,
+                 num_elevators=None, config=None, seed=None, background_traffic=False,
+                 **options):
+        """
+        Args:
+            algorithm_type: Typ algorytmu ('A' lub 'B')
+            speed: Przyspieszenie - jednostki czasu symulacji na sekundę zegara
+            tick: Co ile sekund zegara przesuwać symulację bez nowych wezwań
+            window: Długość okna metryk w jednostkach czasu symulacji
+            num_elevators: Liczba wind (None - config.num_elevators)
+            config: Parametry budynku (SimulationConfig)
+            seed: Ziarno losowego ruchu tła
+            background_traffic: Czy oprócz wstrzykiwanych wezwań generować losowe
+                                zgłoszenia z intensywnością config.call_arrival_rate
+            options: Dodatkowe argumenty BuildingSimulation (np. dispatch_window,
+                     zoning, traffic)
+        """
+        if speed <= 0 or tick <= 0 or window <= 0:
+            raise ValueError("Przyspieszenie, krok zegara i okno metryk muszą być dodatnie")
+        config = config if config is not None else SimulationConfig()
+        self.speed = speed
+        self.tick = tick
+        self.env = HeapEnvironment()
+        self.rolling = RollingMetrics(self.env, window)
+        if not background_traffic:
+            options.setdefault('arrivals', ArrivalStream.from_trace(np.empty((0, 4)),
+                                                                    config.num_floors,
+                                                                    config.max_capacity))
+        self.simulation = BuildingSimulation(self.env, num_elevators, algorithm_type, rng=seed,
+                                             config=config, streaming=self.rolling,
+                                             **options)
+        self.injected = 0
+        self.rejected = 0
+        self.server = None
+        self._clients = set()  # strumienie zapisu otwartych połączeń
+        self._clock_task = None
+        self._path = None
+        self._t0 = None
+        # licznik przepustowości zegara: wezwania i czas pracy od ostatniego pomiaru
+        self._mark = (0.0, 0, 0.0)
+        self._busy = 0.0
+        self._call_rate = 0.0
+        self._load = 0.0
+
+    def _require_started(self):
+        """Zgłasza błąd, gdy zegar usługi nie został jeszcze uruchomiony."""
+        if self._t0 is None:
+            raise RuntimeError("Usługa nie została uruchomiona (najpierw start())")
+
+    def sim_clock(self):
+        """Czas symulacji odpowiadający bieżącej chwili zegara pętli."""
+        self._require_started()
+        return (asyncio.get_running_loop().time() - self._t0) * self.speed
+
+    def _advance(self):
+        """Wykonuje zdarzenia symulacji do bieżącej chwili zegara."""
+        start = time.perf_counter()
+        self.env.run(until=max(self.env.now, self.sim_clock()))
+        self._busy += time.perf_counter() - start
+
+    def inject(self, call_floor, target_floor, num_people=1):
+        """
+        Wstrzykuje wezwanie w bieżącej chwili symulacji.
+
+        Raises:
+            ValueError: Niepoprawne piętra lub liczba osób
+            RuntimeError: Usługa nie została uruchomiona
+        """
+        self._advance()
+        start = time.perf_counter()
+        try:
+            self.simulation.inject_call(call_floor, target_floor, num_people)
+        except ValueError:
+            self.rejected += 1
+            raise
+        finally:
+            self._busy += time.perf_counter() - start
+        self.injected += 1
+
+    def metrics(self):
+        """
+        Bieżące metryki usługi.
+
+        Returns:
+            dict: 'sim_time', 'wall_time', 'speed', 'injected', 'rejected',
+                  'calls_per_s' (wezwania na sekundę zegara w ostatnim pomiarze),
+                  'load' (udział czasu zegara zajęty symulacją; powyżej 1 usługa
+                  nie nadąża), 'waiting' (czekające grupy), 'total_served'
+                  oraz statystyki okna (RollingMetrics.window_summary)
+
+        Raises:
+            RuntimeError: Usługa nie została uruchomiona
+        """
+        self._require_started()
+        loop = asyncio.get_running_loop()
+        result = {
+            'sim_time': self.env.now,
+            'wall_time': loop.time() - self._t0,
+            'speed': self.speed,
+            'injected': self.injected,
+            'rejected': self.rejected,
+            'calls_per_s': self._call_rate,
+            'load': self._load,
+            'waiting': self.simulation.waiting_count(),
+            'total_served': self.simulation.total_passengers_served[0],
+        }
+        result.update(self.rolling.window_summary())
+        return result
+
+    async def _clock(self):
+        """Przesuwa symulację za zegarem i co sekundę mierzy przepustowość."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._advance()
+            now = loop.time()
+            mark_time, mark_calls, mark_busy = self._mark
+            if now - mark_time >= 1.0:
+                self._call_rate = (self.injected - mark_calls) / (now - mark_time)
+                self._load = (self._busy - mark_busy) / (now - mark_time)
+                self._mark = (now, self.injected, self._busy)
+            await asyncio.sleep(self.tick)
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """
+        Uruchamia zegar symulacji i serwer wezwań.
+
+        Args:
+            host: Adres nasłuchu TCP
+            port: Port TCP (0 - wybrany przez system)
+            path: Ścieżka gniazda uniksowego (zamiast TCP)
+
+        Returns:
+            asyncio.Server
+        """
+        loop = asyncio.get_running_loop()
+        self._t0 = loop.time()
+        self._mark = (self._t0, 0, 0.0)
+        self._clock_task = asyncio.create_task(self._clock())
+        self._path = path
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_client, path)
+        else:
+            self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server
+
+    async def stop(self):
+        """Zatrzymuje serwer i zegar (stan symulacji pozostaje dostępny)."""
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self.server.wait_closed()
+            if self._path is not None and os.path.exists(self._path):
+                os.unlink(self._path)
+        if self._clock_task is not None:
+            self._clock_task.cancel()
+            try:
+                await self._clock_task
+            except asyncio.CancelledError:
+                pass
+        self._advance()
+
+    async def serve(self, host='127.0.0.1', port=8765, path=None, duration=None,
+                    report_interval=None):
+        """
+        Uruchamia usługę na czas duration sekund (None - do przerwania).
+
+        Args:
+            report_interval: Co ile sekund wypisywać metryki (None - bez wypisywania)
+
+        Returns:
+            dict: Metryki w chwili zakończenia
+        """
+        server = await self.start(host, port, path)
+        address = path if path is not None else '%s:%d' % server.sockets[0].getsockname()[:2]
+        print(f"Usługa symulacji nasłuchuje na {address} (przyspieszenie {self.speed}x)")
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        try:
+            while deadline is None or loop.time() < deadline:
+                step = report_interval or 1.0
+                if deadline is not None:
+                    step = min(step, deadline - loop.time())
+                await asyncio.sleep(max(step, 0.0))
+                if report_interval:
+                    print(_format_metrics(self.metrics()))
+        finally:
+            await self.stop()
+        return self.metrics()
+
+    async def _handle_client(self, reader, writer):
+        """Obsługa połączenia: polecenia wierszami, czytane blokami."""
+        subscription = None
+        buffer = b''
+        self._clients.add(writer)
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                lines = (buffer + data).split(b'\n')
+                buffer = lines.pop()
+                for line in lines:
+                    reply = self._command(line)
+                    if isinstance(reply, float):
+                        if subscription is not None:
+                            subscription.cancel()
+                        subscription = asyncio.create_task(self._subscribe(writer, reply))
+                    elif reply is not None:
+                        writer.write(reply)
+                await writer.drain()
+            if buffer.strip():
+                reply = self._command(buffer)
+                if isinstance(reply, bytes):
+                    writer.write(reply)
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if subscription is not None:
+                subscription.cancel()
+            self._clients.discard(writer)
+            writer.close()
+
+    def _command(self, line):
+        """
+        Wykonuje jedno polecenie.
+
+        Returns:
+            bytes (odpowiedź), float (odstęp subskrypcji) albo None
+        """
+        fields = line.split()
+        if not fields:
+            return None
+        try:
+            # wezwanie to liczby całkowite (także ujemne - wtedy błąd zakresu pięter)
+            if fields[0].lstrip(b'+-').isdigit():
+                self.inject(*(int(field) for field in fields[:3]))
+                return None
+            command = fields[0].decode().lower()
+            if command == 'metrics':
+                return _encode(self.metrics())
+            if command == 'subscribe':
+                interval = float(fields[1]) if len(fields) > 1 else 1.0
+                if not interval > 0:
+                    raise ValueError("Odstęp subskrypcji musi być dodatni")
+                return interval
+            raise ValueError(f"Nieznane polecenie: {command!r}")
+        except (ValueError, TypeError, UnicodeDecodeError) as e:
+            return f"error {e}\n".encode()
+
+    async def _subscribe(self, writer, interval):
+        """Wysyła metryki co interval sekund."""
+        while True:
+            await asyncio.sleep(interval)
+            writer.write(_encode(self.metrics()))
+            await writer.drain()
+
+
+def _encode(metrics):
+    """Metryki jako wiersz JSON (NaN zamieniane na null)."""
+    clean = {k: None if isinstance(v, float) and math.isnan(v) else v for k, v in metrics.items()}
+    return (json.dumps(clean) + '\n').encode()
+
+
+def _format_metrics(m):
+    return (f"t={m['sim_time']:.1f} wezwania={m['injected']} ({m['calls_per_s']:.0f}/s) "
+            f"obciążenie={m['load']:.2f} czeka={m['waiting']} "
+            f"oczekiwanie={m['avg_wait']:.2f} p95={m['p95_wait']:.2f} "
+            f"przepustowość={m['throughput']:.3f}")
+
+
+def main(argv=None):
+    """Punkt wejścia wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Symulacja wind jako usługa czasu rzeczywistego")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help="gniazdo uniksowe zamiast TCP")
+    parser.add_argument('--algorithm', choices=('A', 'B'), default='B')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="jednostki czasu symulacji na sekundę")
+    parser.add_argument('--elevators', type=int, help="liczba wind")
+    parser.add_argument('--window', type=float, default=60.0, help="okno metryk (czas symulacji)")
+    parser.add_argument('--background', action='store_true', help="losowy ruch tła")
+    parser.add_argument('--seed', type=int, help="ziarno ruchu tła")
+    parser.add_argument('--duration', type=float, help="czas działania w sekundach")
+    parser.add_argument('--report', type=float, default=5.0,
+                        help="co ile sekund wypisywać metryki (0 - wcale)")
+    args = parser.parse_args(argv)
+
+    service = SimulationService(args.algorithm, speed=args.speed, window=args.window,
+                                num_elevators=args.elevators, seed=args.seed,
+                                background_traffic=args.background)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix, args.duration,
+                                  args.report or None))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
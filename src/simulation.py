@@ -2,10 +2,16 @@
 Klasa reprezentująca symulację budynku z windami.
 """
 
-import random
-from .config import NUM_ELEVATORS, NUM_FLOORS, MAX_CAPACITY, CALL_ARRIVAL_RATE
-from .passenger import Passenger
+from collections import deque
+
+import numpy as np
+from .arrivals import ArrivalStream
+from .config import SimulationConfig
+from .passenger import Passenger, PassengerTable
+from .streaming import StreamingMetrics
 from .elevator import Elevator
+from .engine import HeapEnvironment, HeapElevator
+from .dispatch import BankState, VECTORIZE_MIN_ELEVATORS, assign_batch_b
 
 
 class BuildingSimulation:
@@ -26,56 +32,312 @@ class BuildingSimulation:
     - Zaawansowany algorytm z optymalizacją kosztu (odległość, obciążenie, grupowanie)
     """
     
-    def __init__(self, env, num_elevators, algorithm_type):
+    def __init__(self, env, num_elevators, algorithm_type, rng=None, arrivals=None,
+                 passenger_table=False, streaming=False, dispatch_window=None,
+                 fast_path=False, config=None, trace=None, traffic=None, zoning=None):
         """
         Inicjalizuje symulację budynku.
         
         Args:
-            env: Środowisko simpy
-            num_elevators: Liczba wind w budynku
+            env: Środowisko simpy albo HeapEnvironment (silnik na kopcu zdarzeń;
+                 windy działają wtedy jako automaty stanów HeapElevator)
+            num_elevators: Liczba wind w budynku (None - config.num_elevators)
             algorithm_type: Typ algorytmu przypisania ('A' lub 'B')
+            rng: Generator liczb losowych (numpy.random.Generator) lub ziarno.
+                 Każda symulacja ma własny generator, więc wiele symulacji może
+                 działać równolegle w jednym procesie i pozostać powtarzalnymi.
+                 Losowane są wyłącznie zgłoszenia, więc to samo ziarno daje
+                 algorytmom A i B identyczny strumień pasażerów (wspólne liczby losowe).
+            arrivals: Źródło zgłoszeń (ArrivalStream, np. odtwarzające ślad);
+                      domyślnie strumień losowany blokami z generatora rng
+            passenger_table: Czy zapisywać pasażerów w kolumnowej PassengerTable
+                             zamiast list wait_times/trip_times (obiekty Passenger
+                             są wtedy zwalniane po wysiadaniu)
+            streaming: Czy liczyć statystyki czasów strumieniowo (StreamingMetrics:
+                       średnia/wariancja Welforda i szkic kwantyli) w stałej pamięci;
+                       można też przekazać gotowy obiekt (np. RollingMetrics)
+            dispatch_window: Długość okna zbierania wezwań (tylko algorytm B). Wezwania
+                             z okna są grupowane po (piętro, kierunek) i przypisywane
+                             razem przez rozwiązanie problemu przydziału; None - każde
+                             wezwanie przypisywane od razu
+            fast_path: Tryb szybki - ruch i postoje wind wykonywane bez tworzenia
+                       osobnych procesów simpy, puste postoje pomijane
+            config: Parametry budynku (SimulationConfig); domyślnie stałe z config.py.
+                    Określa pojemność i prędkość wind, czas postoju oraz (dla
+                    domyślnego strumienia zgłoszeń) liczbę pięter i intensywność
+            trace: TraceRecorder zapisujący zdarzenia pasażerów i odcinki ruchu wind
+            traffic: Profil ruchu (TrafficProfile) dla domyślnego strumienia zgłoszeń
+                     zamiast stałej intensywności config.call_arrival_rate
+            zoning: Podział na banki wind (Zoning) z własnymi piętrami, pojemnością
+                    i prędkością; wezwanie przypisywane jest tylko windom banku
+                    obsługującego odcinek podróży, a podróże między strefami
+                    odbywają się z przesiadkami. Liczba wind wynika wtedy z banków.
         """
+        if dispatch_window is not None and algorithm_type != 'B':
+            raise ValueError("Okno zbierania wezwań (dispatch_window) dotyczy tylko algorytmu B")
         self.env = env
         self.algorithm_type = algorithm_type
-        self.pending_calls = {}  # floor -> list[Passenger]
+        self.config = config = config if config is not None else SimulationConfig()
+        if zoning is not None:
+            if num_elevators is not None and num_elevators != zoning.num_elevators:
+                raise ValueError(f"Liczba wind ({num_elevators}) różni się od sumy wind "
+                                 f"w bankach ({zoning.num_elevators})")
+            if zoning.num_floors != config.num_floors:
+                raise ValueError(f"Strefowanie obejmuje {zoning.num_floors} pięter, "
+                                 f"a budynek {config.num_floors}")
+            num_elevators = zoning.num_elevators
+        elif num_elevators is None:
+            num_elevators = config.num_elevators
+        self.rng = np.random.default_rng(rng)
+        if arrivals is None:
+            arrivals = ArrivalStream(self.rng, rate=config.call_arrival_rate,
+                                     num_floors=config.num_floors, max_group=config.max_capacity,
+                                     profile=traffic)
+        self.arrivals = arrivals
+        self.zoning = zoning
+        banks = [(num_elevators, None, None)] if zoning is None else [
+            (b.num_elevators, b.capacity, b.time_per_floor) for b in zoning.banks]
+        # osobne kolejki każdego banku: floor -> {1: deque[Passenger], -1: deque[Passenger]} (FIFO)
+        self.pending_calls = [{} for _ in banks]
         
         # Statystyki symulacji
         self.wait_times = []
         self.trip_times = []
         self.total_passengers_served = [0]  # lista z jednym elementem dla mutowalności
+        self.passenger_table = PassengerTable() if passenger_table else None
+        if isinstance(streaming, StreamingMetrics):
+            self.streaming = streaming
+        else:
+            self.streaming = StreamingMetrics() if streaming else None
+        self.trace = trace
+        self.stats_start = None  # początek pomiaru po reset_statistics (None - od zera)
         self.elevator_stats = []
         
-        # Utwórz windy
-        self.elevators = [Elevator(env, i, self) for i in range(num_elevators)]
+        # Utwórz windy (wraz z macierzą stanu każdego banku do wektorowego przypisania)
+        self.banks = [BankState(n, config.max_capacity if capacity is None else capacity,
+                                config.time_per_floor if time_per_floor is None else time_per_floor)
+                      for n, capacity, time_per_floor in banks]
+        sizes = [n for n, _, _ in banks]
+        self.zone_offsets = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+        self.car_zone = np.repeat(np.arange(len(banks)), sizes).tolist()
+        self.home_floors = [0] * len(banks) if zoning is None else [
+            zoning.home_floor(z) for z in range(len(banks))]
+        self.fast_path = fast_path
+        self.dispatch_window = dispatch_window
+        self._call_batch = []  # wezwania czekające na przypisanie partią
+        self._redispatch_floors = set()  # (bank, piętro) z zaplanowanym ponownym przypisaniem
+        self.heap_engine = isinstance(env, HeapEnvironment)
+        elevator_class = HeapElevator if self.heap_engine else Elevator
+        self.elevators = [elevator_class(env, i, self) for i in range(num_elevators)]
+        self.zone_elevators = [self.elevators[start:stop] for start, stop in
+                               zip(self.zone_offsets, self.zone_offsets[1:])]
         
         # Uruchom generator wezwań
-        self.env.process(self.call_generator())
+        if self.heap_engine:
+            # bieżący blok zgłoszeń i pozycja w nim (zamiast iteratora - stan daje się serializować)
+            self._arrival_chunk = ([], [], [], [])
+            self._arrival_pos = 0
+            self._schedule_next_arrival()
+        else:
+            self.env.process(self.call_generator())
 
     def call_generator(self):
-        """Generator wezwań pasażerów zgodnie z rozkładem wykładniczym."""
-        while True:
-            inter = random.expovariate(CALL_ARRIVAL_RATE)
-            yield self.env.timeout(inter)
-
-            call_floor = random.randint(0, NUM_FLOORS - 1)
-            target_floor = call_floor
-            while target_floor == call_floor:
-                target_floor = random.randint(0, NUM_FLOORS - 1)
-            num_people = random.randint(1, MAX_CAPACITY)
-
-            p = Passenger(self.env, call_floor, target_floor, num_people)
-
-            # najpierw dodajemy do pending_calls (żeby winda znalazła pasażera jak przyjedzie natychmiast)
-            if call_floor not in self.pending_calls:
-                self.pending_calls[call_floor] = []
-            self.pending_calls[call_floor].append(p)
-
-            # Przypisz windę według wybranego algorytmu:
-            # - Algorytm A: najbliższa winda (prosty wybór)
-            # - Algorytm B: optymalna winda (uwzględnia grupowanie kursów)
-            assigned = self._assign_call(p)
-            assigned.add_call(p)
-            # dalej p zostanie zabrany przez windę w jej run -> _stop_at_floor
+        """Generator wezwań pasażerów pobieranych ze strumienia zgłoszeń."""
+        for arrival_time, call_floor, target_floor, num_people in self.arrivals:
+            yield self.env.timeout(max(0.0, arrival_time - self.env.now))
+            self._handle_arrival(call_floor, target_floor, num_people)
+
+    def _schedule_next_arrival(self):
+        """Planuje kolejne zgłoszenie ze strumienia (silnik HeapEnvironment)."""
+        while self._arrival_pos == len(self._arrival_chunk[0]):
+            chunk = self.arrivals.next_chunk()
+            if chunk is None:
+                return
+            self._arrival_chunk, self._arrival_pos = chunk, 0
+        i = self._arrival_pos
+        self._arrival_pos = i + 1
+        times, calls, targets, people = self._arrival_chunk
+        self.env.schedule(max(0.0, times[i] - self.env.now), self._on_arrival,
+                          calls[i], targets[i], people[i])
+
+    def _on_arrival(self, call_floor, target_floor, num_people):
+        self._handle_arrival(call_floor, target_floor, num_people)
+        self._schedule_next_arrival()
+
+    def _handle_arrival(self, call_floor, target_floor, num_people):
+        """Tworzy pasażera, ustawia go w kolejce piętra i przekazuje wezwanie do przypisania."""
+        index = None
+        if self.passenger_table is not None:
+            index = self.passenger_table.add(self.env.now, call_floor, target_floor, num_people)
+        if self.zoning is None:
+            p = Passenger(self.env, call_floor, target_floor, num_people, index)
+        else:
+            zone, leg_target = self.zoning.route(call_floor, target_floor)
+            p = Passenger(self.env, call_floor, leg_target, num_people, index,
+                          destination=target_floor, bank=zone)
+        if self.trace is not None:
+            p.index = self.trace.arrival(self.env.now, p)
+        self._enqueue(p)
+        # dalej p zostanie zabrany przez windę w jej run -> _stop_at_floor
+
+    def inject_call(self, call_floor, target_floor, num_people=1):
+        """
+        Zgłoszenie spoza strumienia zgłoszeń (np. z zewnętrznego systemu)
+        w bieżącej chwili symulacji.
+
+        Args:
+            call_floor: Piętro wezwania
+            target_floor: Piętro docelowe
+            num_people: Liczba osób w grupie (od 1 do config.max_capacity)
+        """
+        num_floors = self.config.num_floors
+        if not (0 <= call_floor < num_floors and 0 <= target_floor < num_floors):
+            raise ValueError(f"Piętra muszą należeć do zakresu 0..{num_floors - 1}")
+        if call_floor == target_floor:
+            raise ValueError("Piętro docelowe musi różnić się od piętra wezwania")
+        if not 1 <= num_people <= self.config.max_capacity:
+            raise ValueError(f"Liczba osób w grupie musi należeć do zakresu "
+                             f"1..{self.config.max_capacity}")
+        self._handle_arrival(call_floor, target_floor, num_people)
+
+    def waiting_count(self):
+        """Liczba grup pasażerów czekających na piętrach (we wszystkich bankach)."""
+        return sum(len(queue) for calls in self.pending_calls
+                   for queues in calls.values() for queue in queues.values())
+
+    def _enqueue(self, passenger):
+        """Ustawia pasażera w kolejce piętra w jego banku i przekazuje wezwanie do przypisania."""
+        # najpierw dodajemy do pending_calls (żeby winda znalazła pasażera jak przyjedzie natychmiast)
+        calls = self.pending_calls[passenger.bank]
+        queues = calls.get(passenger.call_floor)
+        if queues is None:
+            queues = calls[passenger.call_floor] = {1: deque(), -1: deque()}
+        queues[passenger.direction].append(passenger)
+        self._dispatch(passenger)
+
+    def _transfer(self, passenger):
+        """
+        Przesiadka: pasażer, który dojechał do końca odcinka, czeka na piętrze na
+        windę banku obsługującego kolejny odcinek. Czas oczekiwania pasażera to
+        czas do pierwszego wejścia do windy; przesiadki wliczają się do czasu przejazdu.
+        """
+        floor = passenger.target_floor
+        zone, leg_target = self.zoning.route(floor, passenger.destination)
+        leg = Passenger(self.env, floor, leg_target, passenger.num_people, passenger.index,
+                        destination=passenger.destination, bank=zone)
+        leg.journey_start = (passenger.trip_start_time if passenger.journey_start is None
+                             else passenger.journey_start)
+        self._enqueue(leg)
+
+    def _call_later(self, delay, callback, *args):
+        """
+        Wywołuje callback(*args) po upływie delay w bieżącym silniku zdarzeń
+        (w simpy pojedynczy timeout z wywołaniem zwrotnym zamiast osobnego procesu).
+        """
+        if self.heap_engine:
+            self.env.schedule(delay, callback, *args)
+        else:
+            self.env.timeout(delay).callbacks.append(lambda _: callback(*args))
+
+    def _dispatch(self, passenger):
+        """
+        Przekazuje wezwanie do przypisania: od razu albo (w trybie partii)
+        na koniec bieżącego okna zbierania wezwań.
+        """
+        # W trybie partii wezwanie czeka na koniec okna (pierwsze wezwanie okna je otwiera)
+        if self.dispatch_window is not None:
+            if not self._call_batch:
+                self._call_later(self.dispatch_window, self._dispatch_batch)
+            # ponowne przypisanie może zgłosić pasażera, który już czeka w tej partii
+            if passenger not in self._call_batch:
+                self._call_batch.append(passenger)
+            return
+
+        # Przypisz windę według wybranego algorytmu:
+        # - Algorytm A: najbliższa winda (prosty wybór)
+        # - Algorytm B: optymalna winda (uwzględnia grupowanie kursów)
+        assigned = self._assign_call(passenger)
+        if self.trace is not None:
+            self.trace.assignment(self.env.now, passenger, assigned.id)
+        assigned.add_call(passenger)
+
+    def redispatch(self, floor, zone=0, car=None):
+        """
+        Planuje ponowne przypisanie wezwań z piętra, z którego winda zrezygnowała
+        (pasażerowie jadą w przeciwnym kierunku albo brak miejsca).
+
+        Jeśli winda, która zrezygnowała, zostałaby wybrana ponownie, zatrzymuje
+        wezwanie i obsłuży piętro w dalszej części trasy - bez planowania kolejnej
+        próby (inaczej ta sama winda wracałaby, rezygnowała i była wybierana
+        w kółko). Pozostałe wezwania przypisywane są po czasie postoju
+        (config.stop_time), więc czas symulacji upływa między kolejnymi próbami.
+
+        Args:
+            floor: Piętro z oczekującymi pasażerami
+            zone: Numer banku wind, którego kolejki sprawdzić
+            car: Winda, która zrezygnowała z piętra po przyjeździe na nie; None po
+                 postoju bez ruchu - wezwanie bieżącego piętra nie może wtedy
+                 zostać przy tej windzie (ponowny postój w tej samej chwili)
+        """
+        queues = self.pending_calls[zone].get(floor)
+        key = (zone, floor)
+        if queues is None or key in self._redispatch_floors:
+            return
+        heads = [queues[direction][0] for direction in (1, -1) if queues[direction]]
+        if car is not None:
+            remaining = []
+            for p in heads:
+                if self._assign_call(p) is car:
+                    if self.trace is not None:
+                        self.trace.assignment(self.env.now, p, car.id)
+                    car.add_call(p)
+                else:
+                    remaining.append(p)
+            heads = remaining
+        if heads:
+            self._redispatch_floors.add(key)
+            self._call_later(self.config.stop_time, self._redispatch, floor, zone)
+
+    def _redispatch(self, floor, zone):
+        """Przypisuje ponownie czoło każdej niepustej kolejki na piętrze."""
+        self._redispatch_floors.discard((zone, floor))
+        queues = self.pending_calls[zone][floor]
+        for direction in (1, -1):
+            if queues[direction]:
+                self._dispatch(queues[direction][0])
+
+    def _dispatch_batch(self):
+        """
+        Na koniec okna przypisuje zebrane wezwania jednocześnie.
+
+        Wezwania z tego samego piętra w tym samym kierunku tworzą jedną grupę
+        (jedna winda, jeden postój); grupy rozdzielane są między windy metodą
+        węgierską na kosztach algorytmu B (dispatch.assign_batch_b), osobno
+        w każdym banku wind.
+        """
+        batch, self._call_batch = self._call_batch, []
+
+        zones = {}  # bank -> {(piętro, kierunek) -> list[Passenger]}
+        for p in batch:
+            # pomiń pasażerów, których w międzyczasie zabrała przejeżdżająca winda
+            if p.trip_start_time is None:
+                zones.setdefault(p.bank, {}).setdefault((p.call_floor, p.direction), []).append(p)
+
+        # każda kolejna grupa tej samej windy to dodatkowy postój (wsiadanie i wysiadanie)
+        slot_penalty = 2 * self.config.stop_time
+        for zone, groups in zones.items():
+            keys = list(groups)
+            cars = assign_batch_b(self.banks[zone], [
+                (floor, direction, sum(p.num_people for p in groups[(floor, direction)]))
+                for floor, direction in keys
+            ], slot_penalty)
+            elevators = self.zone_elevators[zone]
+            for key, car in zip(keys, cars):
+                elevator = elevators[car]
+                if self.trace is not None:
+                    for p in groups[key]:
+                        self.trace.assignment(self.env.now, p, elevator.id)
+                elevator.add_call(groups[key][0])
 
     def _assign_call(self, passenger):
         """
@@ -109,8 +371,14 @@ class BuildingSimulation:
         # Algorytm A: po prostu najbliższa winda
         # Pasażer już wybrał kierunek (passenger.direction), więc przypisujemy
         # najbliższą windę niezależnie od jej aktualnego stanu
+        # Dla dużych grup wind argmin na macierzy stanu (przy remisie, jak min(),
+        # wygrywa winda o niższym ID)
+        elevators = self.zone_elevators[passenger.bank]
+        if len(elevators) >= VECTORIZE_MIN_ELEVATORS:
+            distances = self.banks[passenger.bank].distances(passenger.call_floor)
+            return elevators[int(distances.argmin())]
         nearest_elevator = min(
-            self.elevators, 
+            elevators, 
             key=lambda e: abs(e.current_floor - passenger.call_floor)
         )
         return nearest_elevator
@@ -134,10 +402,100 @@ class BuildingSimulation:
             Elevator: Winda z najmniejszym kosztem przypisania
         """
         # Algorytm B: optymalizacja kosztu z uwzględnieniem grupowania
-        costs = [(e.calculate_cost_b(passenger), e) for e in self.elevators]
+        # (dla dużych grup wind koszty wszystkich wind jednym wyrażeniem numpy)
+        elevators = self.zone_elevators[passenger.bank]
+        if len(elevators) >= VECTORIZE_MIN_ELEVATORS:
+            costs = self.banks[passenger.bank].costs_b(passenger.call_floor, passenger.direction,
+                                                       passenger.num_people)
+            return elevators[int(costs.argmin())]
+        costs = [(e.calculate_cost_b(passenger), e) for e in elevators]
         best_elevator = min(costs, key=lambda x: x[0])[1]
         return best_elevator
     
+    def record_pickup(self, passenger, elevator_id):
+        """
+        Zapisuje wejście pasażera do windy.
+
+        Args:
+            passenger: Obiekt Passenger
+            elevator_id: ID windy, która zabrała pasażera
+        """
+        now = self.env.now
+        if self.trace is not None:
+            self.trace.pickup(now, passenger, elevator_id)
+        if passenger.journey_start is not None:
+            # kolejny odcinek po przesiadce - czas oczekiwania zapisano przy pierwszym wejściu
+            passenger.trip_start_time = now
+            return
+        if self.streaming is None and self.passenger_table is None:
+            passenger.record_pickup(elevator_id, self.wait_times, now)
+            return
+        if self.streaming is not None:
+            self.streaming.add_wait(now - passenger.arrival_time)
+        if self.passenger_table is not None:
+            self.passenger_table.record_pickup(passenger.index, now, elevator_id)
+        passenger.trip_start_time = now
+
+    def record_dropoff(self, passenger, elevator_id=-1):
+        """
+        Zapisuje wyjście pasażera z windy.
+
+        Args:
+            passenger: Obiekt Passenger
+            elevator_id: ID windy, z której wysiadł pasażer
+        """
+        now = self.env.now
+        if self.trace is not None:
+            self.trace.dropoff(now, passenger, elevator_id)
+        if passenger.target_floor != passenger.destination:
+            self._transfer(passenger)
+            return
+        if passenger.journey_start is not None:
+            # czas przejazdu liczony od wejścia do pierwszej windy
+            passenger.trip_start_time = passenger.journey_start
+        if self.streaming is None and self.passenger_table is None:
+            passenger.record_dropoff(self.trip_times, self.total_passengers_served, now)
+            return
+        if self.streaming is not None:
+            self.streaming.add_trip(now - passenger.trip_start_time)
+        if self.passenger_table is not None:
+            self.passenger_table.record_dropoff(passenger.index, now)
+        self.total_passengers_served[0] += passenger.num_people
+
+    def wait_time_array(self):
+        """Zwraca czasy oczekiwania jako tablicę numpy (z listy lub z PassengerTable)."""
+        if self.passenger_table is not None:
+            return self.passenger_table.wait_times(self.stats_start)
+        return np.asarray(self.wait_times, dtype=float)
+
+    def trip_time_array(self):
+        """Zwraca czasy przejazdu jako tablicę numpy (z listy lub z PassengerTable)."""
+        if self.passenger_table is not None:
+            return self.passenger_table.trip_times(self.stats_start)
+        return np.asarray(self.trip_times, dtype=float)
+
+    def reset_statistics(self):
+        """
+        Zeruje statystyki (np. po okresie rozbiegu); stan budynku - windy,
+        żądania, pasażerowie w windach i oczekujący - pozostaje bez zmian.
+
+        Od tej chwili liczone są tylko wsiadania i wysiadania, które nastąpią
+        później (czasy oczekiwania pasażerów czekających już teraz obejmują
+        także czas sprzed resetu).
+        """
+        self.stats_start = self.env.now
+        self.wait_times = []
+        self.trip_times = []
+        self.total_passengers_served[0] = 0
+        if self.streaming is not None:
+            self.streaming.reset()
+        for e in self.elevators:
+            e.total_movement_time = 0.0
+            e.floors_traveled = 0
+            e.cost_cache_hits = e.cost_cache_misses = 0
+        for bank in self.banks:
+            bank.cache_hits = bank.cache_misses = 0
+
     def collect_statistics(self):
         """
         Zbiera statystyki z wszystkich wind.
@@ -150,7 +508,29 @@ class BuildingSimulation:
             stats.append({
                 'id': e.id,
                 'total_movement_time': e.total_movement_time,
-                'floors_traveled': e.floors_traveled
+                'floors_traveled': e.floors_traveled,
+                'cost_cache_hits': e.cost_cache_hits,
+                'cost_cache_misses': e.cost_cache_misses
             })
         return stats
 
+    def cost_cache_stats(self):
+        """
+        Skuteczność zapamiętywania kosztów algorytmu B.
+
+        Trafienie to koszt jednej windy (pętla po windach) albo wektor kosztów
+        całego banku (wariant wektorowy) wzięty z pamięci zamiast liczony od
+        nowa, bo od poprzedniego wezwania o tych samych parametrach stan wind
+        się nie zmienił.
+
+        Returns:
+            dict: 'hits', 'misses' i 'hit_rate' (udział trafień, NaN bez wyszukań)
+        """
+        hits = (sum(e.cost_cache_hits for e in self.elevators)
+                + sum(bank.cache_hits for bank in self.banks))
+        misses = (sum(e.cost_cache_misses for e in self.elevators)
+                  + sum(bank.cache_misses for bank in self.banks))
+        lookups = hits + misses
+        return {'hits': hits, 'misses': misses,
+                'hit_rate': hits / lookups if lookups else float('nan')}
+
@@ -1,84 +1,219 @@
 import numpy as np
-import random
-import matplotlib.pyplot as plt
-import simpy
-from .config import NUM_ELEVATORS
+from .engine import CountingEnvironment, HeapEnvironment
+from .profiling import Profiler
+from .trace import TraceRecorder
 from .simulation import BuildingSimulation
+from .streaming import QUANTILES
 
 
-def run_simulation(alg_type, sim_time, seed=None):
+def event_count(env):
+    """Liczba zdarzeń wykonanych w środowisku (HeapEnvironment lub CountingEnvironment)."""
+    return env.events_processed
+
+
+def _time_metrics(simulation):
+    """
+    Średnie i kwantyle czasów oczekiwania i przejazdu.
+
+    W trybie strumieniowym korzysta z StreamingMetrics, w przeciwnym razie
+    z pełnych tablic czasów (listy lub PassengerTable).
+    """
+    metrics = {}
+    if simulation.streaming is not None:
+        m = simulation.streaming
+        for name, running, sketch in (('wait', m.wait, m.wait_sketch),
+                                      ('trip', m.trip, m.trip_sketch)):
+            metrics[f'avg_{name}'] = running.mean
+            for q in QUANTILES:
+                metrics[f'p{round(q * 100)}_{name}'] = sketch.quantile(q) if sketch.count else 0.0
+        return metrics
+
+    for name, values in (('wait', simulation.wait_time_array()),
+                         ('trip', simulation.trip_time_array())):
+        metrics[f'avg_{name}'] = float(values.mean()) if len(values) else 0.0
+        for q in QUANTILES:
+            metrics[f'p{round(q * 100)}_{name}'] = float(np.quantile(values, q)) if len(values) else 0.0
+    return metrics
+
+
+def _phase_metrics(simulation, traffic, sim_time):
+    """
+    Metryki w podziale na fazy profilu ruchu (z PassengerTable).
+
+    Czas oczekiwania przypisywany jest fazie, w której pasażer przybył,
+    a obsłużeni pasażerowie - fazie, w której wysiedli.
+    """
+    table = simulation.passenger_table
+    arrival = table.column('arrival_time')
+    pickup = table.column('pickup_time')
+    dropoff = table.column('dropoff_time')
+    people = table.column('num_people')
+    arrival_phase = traffic.phase_index(arrival)
+    dropoff_phase = traffic.phase_index(dropoff)
+    picked = ~np.isnan(pickup)
+    done = ~np.isnan(dropoff)
+    durations = traffic.phase_durations(sim_time)
+
+    metrics = {}
+    for i, phase in enumerate(traffic.phases):
+        if durations[i] == 0:
+            continue
+        arrived = arrival_phase == i
+        waits = pickup[arrived & picked] - arrival[arrived & picked]
+        served = int(people[done & (dropoff_phase == i)].sum())
+        metrics[phase.name] = {
+            'duration': float(durations[i]),
+            'arrivals': int(people[arrived].sum()),
+            'total_served': served,
+            'throughput': float(served / durations[i]),
+            'avg_wait': float(waits.mean()) if len(waits) else 0.0,
+            'p95_wait': float(np.quantile(waits, 0.95)) if len(waits) else 0.0,
+            'still_waiting': int(people[arrived & ~picked].sum()),
+        }
+    return metrics
+
+
+def simulation_results(simulation):
+    """
+    Zbiera wyniki zakończonej (lub wstrzymanej) symulacji.
+
+    Args:
+        simulation: Obiekt BuildingSimulation
+
+    Returns:
+        dict: Algorytm, średnie i kwantyle czasów, liczba obsłużonych pasażerów,
+              łączny czas ruchu wind (oraz 'cost_cache' - statystyki pamięci
+              kosztów dla algorytmu B i 'streaming_metrics' w trybie strumieniowym)
+    """
+    elevator_stats = simulation.collect_statistics()
+    time_metrics = _time_metrics(simulation)
+    results = {
+        'algorithm': simulation.algorithm_type,
+        'avg_wait': time_metrics['avg_wait'],
+        'avg_trip': time_metrics['avg_trip'],
+        'total_served': simulation.total_passengers_served[0],
+        'total_movement': sum(s['total_movement_time'] for s in elevator_stats)
+    }
+    results.update(time_metrics)
+    if simulation.algorithm_type == 'B':
+        results['cost_cache'] = simulation.cost_cache_stats()
+    if simulation.streaming is not None:
+        results['streaming_metrics'] = simulation.streaming
+    return results
+
+
+def print_results(results):
+    """Wypisuje podstawowe wyniki symulacji."""
+    print("WYNIKI:")
+    print(f"Średni czas oczekiwania: {results['avg_wait']:.2f}")
+    print(f"95. percentyl czasu oczekiwania: {results['p95_wait']:.2f}")
+    print(f"Średni czas przejazdu: {results['avg_trip']:.2f}")
+    print(f"Łącznie obsłużonych pasażerów: {results['total_served']}")
+    print(f"Łączny czas ruchu wind: {results['total_movement']:.2f}")
+
+
+def run_simulation(alg_type, sim_time, seed=None, num_elevators=None, verbose=True,
+                   passenger_table=False, streaming=False, dispatch_window=None,
+                   fast_path=False, engine='simpy', profile=None, config=None, trace=None,
+                   traffic=None, zoning=None):
     """
     Uruchamia symulację systemu wind.
     
     Args:
         alg_type: Typ algorytmu ('A' lub 'B')
         sim_time: Czas trwania symulacji
-        seed: Ziarno losowości (opcjonalne)
+        seed: Ziarno losowości lub numpy.random.Generator (opcjonalne);
+              nie zmienia globalnego stanu modułów random/numpy
+        num_elevators: Liczba wind (domyślnie config.num_elevators)
+        verbose: Czy wypisywać wyniki na standardowe wyjście
+        passenger_table: Czy przechowywać pasażerów w kolumnowej PassengerTable
+        streaming: Czy liczyć statystyki strumieniowo w stałej pamięci; wynik
+                   zawiera wtedy obiekt 'streaming_metrics' do łączenia replikacji
+        dispatch_window: Okno zbierania wezwań dla partiowego przypisania (algorytm B)
+        fast_path: Tryb szybki wind (bez podprocesów simpy, bez pustych postojów)
+        engine: Silnik zdarzeń: 'simpy' albo 'heap' (HeapEnvironment - kalendarz
+                na heapq i windy jako automaty stanów, model jak w trybie fast_path)
+        profile: True lub obiekt Profiler - mierzy czasy faz (generowanie wezwań,
+                 przypisanie, wybór celu, wsiadanie/wysiadanie, obsługa zdarzeń)
+                 i liczbę zdarzeń według procesu; wynik zawiera wtedy 'profile'
+        config: Parametry budynku (SimulationConfig); domyślnie stałe z config.py
+        trace: Katalog lub obiekt TraceRecorder - zapis śladu zdarzeń pasażerów
+               i ruchu wind (zamykany po symulacji; wynik zawiera wtedy 'trace'
+               ze ścieżką katalogu, do odczytu przez load_trace)
+        traffic: Profil ruchu (TrafficProfile) - zmienna w czasie intensywność
+                 i macierz źródło-cel; wynik zawiera wtedy 'phases' (faza ->
+                 przepustowość i czasy oczekiwania), a pasażerowie zapisywani
+                 są w PassengerTable
+        zoning: Podział na banki wind (Zoning); liczba wind wynika wtedy z banków
         
     Returns:
-        dict: Słownik z wynikami symulacji
+        dict: Słownik z wynikami symulacji (w tym 'events' - liczba wykonanych zdarzeń)
     """
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-
-    print(f"\n=== Start symulacji: {alg_type}, czas: {sim_time} ===")
-    env = simpy.Environment()
-    simulation = BuildingSimulation(env, NUM_ELEVATORS, alg_type)
-    env.run(until=sim_time)
+    if engine not in ('simpy', 'heap'):
+        raise ValueError(f"Nieznany silnik zdarzeń: {engine!r} (dostępne: 'simpy', 'heap')")
 
-    # Zbierz statystyki
-    elevator_stats = simulation.collect_statistics()
+    if verbose:
+        print(f"\n=== Start symulacji: {alg_type}, czas: {sim_time} ===")
+    env = HeapEnvironment() if engine == 'heap' else CountingEnvironment()
+    if traffic is not None:
+        passenger_table = True
+    profiler = Profiler() if profile is True else profile or None
+    recorder = trace if trace is None or isinstance(trace, TraceRecorder) else TraceRecorder(trace)
+    if profiler is not None:
+        profiler.attach_environment(env)
+    simulation = BuildingSimulation(env, num_elevators, alg_type, rng=seed,
+                                    passenger_table=passenger_table, streaming=streaming,
+                                    dispatch_window=dispatch_window, fast_path=fast_path,
+                                    config=config, trace=recorder, traffic=traffic,
+                                    zoning=zoning)
+    if profiler is not None:
+        profiler.attach(simulation)
+        profiler.run(env, until=sim_time)
+    else:
+        env.run(until=sim_time)
+    if recorder is not None:
+        recorder.metadata.update(algorithm=alg_type, sim_time=sim_time,
+                                 config=simulation.config.to_dict())
+        recorder.close()
 
-    avg_wait = np.mean(simulation.wait_times) if simulation.wait_times else 0.0
-    avg_trip = np.mean(simulation.trip_times) if simulation.trip_times else 0.0
-    total_movement = sum(s['total_movement_time'] for s in elevator_stats)
-    total_served = simulation.total_passengers_served[0]
+    results = simulation_results(simulation)
+    results['events'] = event_count(env)
+    if verbose:
+        print_results(results)
+        if profiler is not None:
+            profiler.print_report()
 
-    print("WYNIKI:")
-    print(f"Średni czas oczekiwania: {avg_wait:.2f}")
-    print(f"Średni czas przejazdu: {avg_trip:.2f}")
-    print(f"Łącznie obsłużonych pasażerów: {total_served}")
-    print(f"Łączny czas ruchu wind: {total_movement:.2f}")
-
-    return {
-        'algorithm': alg_type,
-        'avg_wait': avg_wait,
-        'avg_trip': avg_trip,
-        'total_served': total_served,
-        'total_movement': total_movement
-    }
+    if profiler is not None:
+        results['profile'] = profiler.report()
+    if recorder is not None:
+        results['trace'] = str(recorder.path)
+    if traffic is not None:
+        results['phases'] = _phase_metrics(simulation, traffic, sim_time)
+        if verbose:
+            for name, phase in results['phases'].items():
+                print(f"  {name}: przepustowość {phase['throughput']:.3f} os./s, "
+                      f"średnie oczekiwanie {phase['avg_wait']:.2f}, p95 {phase['p95_wait']:.2f}")
+    return results
 
 
-def plot_results(results_A, results_B, sim_time):
+def plot_results(results_A, results_B, sim_time, path='results.png'):
     """
-    Tworzy wykresy porównawcze wyników dwóch algorytmów.
-    
+    Zapisuje do pliku wykres porównawczy wyników dwóch algorytmów.
+
+    Zachowana dla zgodności; dowolną liczbę wyników (także z przedziałami
+    ufności z replikacji) rysuje report.plot_comparison.
+
     Args:
         results_A: Wyniki algorytmu A
         results_B: Wyniki algorytmu B
         sim_time: Czas symulacji (do tytułu)
+        path: Plik wynikowy
+
+    Returns:
+        pathlib.Path: Ścieżka zapisanego pliku
     """
-    metrics = {
-        'Średni czas oczekiwania': (results_A['avg_wait'], results_B['avg_wait']),
-        'Średni czas przejazdu': (results_A['avg_trip'], results_B['avg_trip']),
-        'Łączny czas ruchu wind': (results_A['total_movement'], results_B['total_movement']),
-        'Łącznie obsłużonych pasażerów': (results_A['total_served'], results_B['total_served'])
-    }
-    labels = ['Alg A', 'Alg B']
-    fig, axes = plt.subplots(2, 2, figsize=(12, 8))
-    fig.suptitle(f'Porównanie (T={sim_time})')
-
-    axes = axes.flatten()
-    for i, (title, (a, b)) in enumerate(metrics.items()):
-        ax = axes[i]
-        values = [a, b]
-        bars = ax.bar(labels, values)
-        ax.set_title(title)
-        for bar in bars:
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height()*1.01, 
-                   f'{bar.get_height():.2f}', ha='center')
-
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.show()
+    from .report import plot_comparison
 
+    return plot_comparison([results_A, results_B], path,
+                           metrics=('avg_wait', 'avg_trip', 'total_movement', 'total_served'),
+                           title=f'Porównanie (T={sim_time})')
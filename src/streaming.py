@@ -0,0 +1,254 @@
+"""
+Statystyki strumieniowe o stałym zużyciu pamięci.
+
+- RunningStats: średnia i wariancja metodą Welforda
+- DDSketch: szkic kwantyli ze stałym błędem względnym
+- StreamingMetrics: komplet statystyk czasów oczekiwania i przejazdu
+- RollingMetrics: StreamingMetrics z oknem przesuwnym ostatnich obserwacji
+
+Wszystkie obiekty można łączyć metodą merge (np. wyniki równoległych replikacji).
+"""
+
+import math
+from collections import deque
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RunningStats:
+    """Średnia, wariancja, minimum i maksimum liczone online (algorytm Welforda)."""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """Dodaje pojedynczą obserwację."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Dołącza statystyki z innego obiektu (wzór Chana i in.).
+
+        Args:
+            other: Obiekt RunningStats
+
+        Returns:
+            RunningStats: self
+        """
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Wariancja z próby (nieobciążona)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Odchylenie standardowe z próby."""
+        return math.sqrt(self.variance)
+
+
+class DDSketch:
+    """
+    Szkic kwantyli DDSketch (Masson i in., 2019).
+
+    Wartości dodatnie trafiają do koszyków o granicach gamma^k, więc każdy
+    zwracany kwantyl ma błąd względny co najwyżej relative_accuracy. Liczba
+    koszyków zależy tylko od rozpiętości wartości, a nie od liczby obserwacji.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        """
+        Args:
+            relative_accuracy: Dopuszczalny błąd względny kwantyli
+            min_value: Wartości nie większe od tej liczone są jako zero
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.bins = {}  # indeks koszyka -> liczność
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """Dodaje pojedynczą obserwację (wartości ujemne traktowane są jak zero)."""
+        self.count += 1
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Dołącza inny szkic o tej samej dokładności.
+
+        Args:
+            other: Obiekt DDSketch
+
+        Returns:
+            DDSketch: self
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Można łączyć tylko szkice o tej samej dokładności względnej")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """
+        Zwraca przybliżony kwantyl rzędu q (0 <= q <= 1).
+
+        Returns:
+            float: Kwantyl lub NaN dla pustego szkicu
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = self.zero_count
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class StreamingMetrics:
+    """Strumieniowe statystyki czasów oczekiwania i przejazdu jednej symulacji."""
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Args:
+            relative_accuracy: Dokładność względna szkiców kwantyli
+        """
+        self.wait = RunningStats()
+        self.trip = RunningStats()
+        self.wait_sketch = DDSketch(relative_accuracy)
+        self.trip_sketch = DDSketch(relative_accuracy)
+
+    def add_wait(self, value):
+        """Rejestruje czas oczekiwania."""
+        self.wait.add(value)
+        self.wait_sketch.add(value)
+
+    def add_trip(self, value):
+        """Rejestruje czas przejazdu."""
+        self.trip.add(value)
+        self.trip_sketch.add(value)
+
+    def merge(self, other):
+        """Dołącza statystyki innej symulacji (np. równoległej replikacji)."""
+        self.wait.merge(other.wait)
+        self.trip.merge(other.trip)
+        self.wait_sketch.merge(other.wait_sketch)
+        self.trip_sketch.merge(other.trip_sketch)
+        return self
+
+    def reset(self):
+        """Zeruje statystyki (z zachowaniem dokładności szkiców)."""
+        self.__init__(self.wait_sketch.relative_accuracy)
+
+
+def _quantile(ordered, q):
+    """Kwantyl posortowanej listy z interpolacją liniową (jak numpy.quantile)."""
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    if low + 1 == len(ordered):
+        return float(ordered[low])
+    return ordered[low] + (ordered[low + 1] - ordered[low]) * (rank - low)
+
+
+class RollingMetrics(StreamingMetrics):
+    """
+    StreamingMetrics z dodatkowym oknem przesuwnym: czasy zarejestrowane
+    w ostatnich `window` jednostkach czasu symulacji.
+
+    Statystyki całej symulacji pozostają w stałej pamięci, a okno (kolejka
+    par (chwila, wartość)) zawiera tylko bieżące obserwacje - pamięć zależy
+    od intensywności ruchu, a nie od długości przebiegu. Służy do bieżących
+    metryk długo działającej symulacji (np. usługi czasu rzeczywistego).
+    """
+
+    def __init__(self, env, window=60.0, relative_accuracy=0.01):
+        """
+        Args:
+            env: Środowisko symulacji (odczytywany jest bieżący czas env.now)
+            window: Długość okna w jednostkach czasu symulacji
+            relative_accuracy: Dokładność względna szkiców kwantyli
+        """
+        super().__init__(relative_accuracy)
+        self.env = env
+        self.window = window
+        self._waits = deque()
+        self._trips = deque()
+
+    def add_wait(self, value):
+        """Rejestruje czas oczekiwania (także w oknie)."""
+        super().add_wait(value)
+        self._waits.append((self.env.now, value))
+
+    def add_trip(self, value):
+        """Rejestruje czas przejazdu (także w oknie)."""
+        super().add_trip(value)
+        self._trips.append((self.env.now, value))
+
+    def reset(self):
+        """Zeruje statystyki i okno."""
+        self.__init__(self.env, self.window, self.wait_sketch.relative_accuracy)
+
+    def _current(self, values):
+        """Usuwa z kolejki obserwacje starsze niż okno i zwraca pozostałe wartości."""
+        cutoff = self.env.now - self.window
+        while values and values[0][0] < cutoff:
+            values.popleft()
+        return [value for _, value in values]
+
+    def window_summary(self):
+        """
+        Statystyki okna.
+
+        Returns:
+            dict: 'window' (faktyczna długość okna - krótsza na początku symulacji),
+                  'pickups' i 'dropoffs' (liczby obserwacji), 'avg_wait',
+                  'p95_wait', 'avg_trip' (NaN bez obserwacji) oraz 'throughput'
+                  (zakończone przejazdy na jednostkę czasu)
+        """
+        waits = sorted(self._current(self._waits))
+        trips = self._current(self._trips)
+        span = min(self.window, self.env.now)
+        return {
+            'window': span,
+            'pickups': len(waits),
+            'dropoffs': len(trips),
+            'avg_wait': sum(waits) / len(waits) if waits else math.nan,
+            'p95_wait': _quantile(waits, 0.95) if waits else math.nan,
+            'avg_trip': sum(trips) / len(trips) if trips else math.nan,
+            'throughput': len(trips) / span if span > 0 else 0.0,
+        }
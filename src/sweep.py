@@ -0,0 +1,210 @@
+"""
+Przeglądy parametrów z pamięcią podręczną wyników na dysku.
+
+Każda komórka przeglądu (konfiguracja, algorytm, ziarno, czas symulacji,
+dodatkowe opcje) identyfikowana jest skrótem SHA-256 swojej kanonicznej
+postaci JSON oraz wersji kodu modelu. Wynik zapisywany jest w pliku
+nazwanym tym skrótem, więc ponowne uruchomienie przeglądu po dodaniu
+punktów siatki liczy tylko nowe komórki, a zmiana kodu modelu
+automatycznie unieważnia stare wyniki.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .batch import METRICS, confidence_interval, replication_seeds
+from .config import SimulationConfig
+from .stats import run_simulation
+
+DEFAULT_CACHE_DIR = '.sweep_cache'
+
+# moduły, których kod wpływa na wyniki symulacji (także zapisywane wyniki komórek)
+MODEL_MODULES = ('arrivals.py', 'config.py', 'dispatch.py', 'elevator.py', 'engine.py',
+                 'passenger.py', 'simulation.py', 'stats.py', 'streaming.py', 'sweep.py',
+                 'trace.py', 'traffic.py', 'zoning.py')
+
+
+def config_grid(base=None, **axes):
+    """
+    Buduje listę konfiguracji z iloczynu kartezjańskiego wartości parametrów.
+
+    Args:
+        base: Konfiguracja bazowa (domyślnie SimulationConfig())
+        axes: Parametr SimulationConfig -> lista wartości,
+              np. num_elevators=[4, 6, 8], call_arrival_rate=[0.1, 0.2]
+
+    Returns:
+        list: Obiekty SimulationConfig
+    """
+    base = SimulationConfig() if base is None else base
+    names = list(axes)
+    return [base.replace(**dict(zip(names, values)))
+            for values in itertools.product(*(axes[name] for name in names))]
+
+
+def _encode(value):
+    """
+    Postać JSON obiektów w opcjach komórki (json.dumps(default=...)).
+
+    Obiekty z metodą to_dict (np. Zoning, TrafficProfile) zapisywane są jako
+    słownik parametrów z nazwą klasy, tablice i skalary numpy jako listy i liczby.
+    """
+    if hasattr(value, 'to_dict'):
+        return {'__type__': type(value).__name__, **value.to_dict()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Opcji typu {type(value).__name__} nie można zapisać w kluczu komórki")
+
+
+def model_version():
+    """Skrót kodu modułów modelu (zmienia się przy każdej zmianie logiki symulacji)."""
+    digest = hashlib.sha256()
+    package = Path(__file__).parent
+    for name in MODEL_MODULES:
+        digest.update(name.encode())
+        digest.update((package / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Magazyn wyników adresowany treścią: klucz to SHA-256 opisu komórki,
+    wynik to plik JSON <katalog>/<2 znaki klucza>/<klucz>.json.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, version=None):
+        """
+        Args:
+            directory: Katalog magazynu
+            version: Wersja kodu modelu włączana do kluczy (domyślnie model_version())
+        """
+        self.directory = Path(directory)
+        self.version = model_version() if version is None else version
+
+    def key(self, cell):
+        """Klucz komórki: skrót kanonicznego JSON (posortowane klucze) z wersją modelu."""
+        payload = json.dumps({'version': self.version, **cell}, sort_keys=True,
+                             separators=(',', ':'), default=_encode)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Zwraca zapisany wynik albo None."""
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)['result']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, cell, result):
+        """Zapisuje wynik atomowo (plik tymczasowy + os.replace)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'cell': cell, 'result': result}, f, default=_encode)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _scalar_results(results):
+    """Zostawia tylko wartości zapisywalne w JSON (bez obiektów statystyk i profilu)."""
+    return {k: v for k, v in results.items() if isinstance(v, (int, float, str, bool))}
+
+
+def _run_cell(cell):
+    """Wykonuje jedną komórkę przeglądu (funkcja modułu, aby dało się ją zserializować)."""
+    options = dict(cell['options'])
+    results = run_simulation(cell['algorithm'], cell['sim_time'], seed=cell['seed'],
+                             config=SimulationConfig(**cell['config']), verbose=False,
+                             **options)
+    return _scalar_results(results)
+
+
+def run_sweep(configs, algorithms=('A', 'B'), sim_time=500, n_replications=10, base_seed=0,
+              cache_dir=DEFAULT_CACHE_DIR, max_workers=None, confidence=0.95, verbose=True,
+              **options):
+    """
+    Uruchamia przegląd konfiguracji, licząc tylko komórki nieobecne w magazynie.
+
+    Args:
+        configs: Lista obiektów SimulationConfig (np. z config_grid)
+        algorithms: Algorytmy do porównania
+        sim_time: Czas trwania pojedynczej symulacji
+        n_replications: Liczba replikacji (ziaren) na konfigurację i algorytm;
+                        replikacja r ma to samo ziarno we wszystkich komórkach
+        base_seed: Ziarno główne strumienia ziaren replikacji
+        cache_dir: Katalog magazynu wyników (None - bez zapisu na dysk)
+        max_workers: Liczba procesów (1 = wykonanie szeregowe w bieżącym procesie)
+        confidence: Poziom ufności przedziałów w podsumowaniu
+        verbose: Czy wypisywać liczbę komórek policzonych i pobranych z magazynu
+        options: Dodatkowe argumenty run_simulation (np. fast_path=True, engine='heap')
+
+    Returns:
+        list: Dla każdej pary (konfiguracja, algorytm) słownik z kluczami 'config',
+              'algorithm', 'n', 'metrics' (metryka -> wynik confidence_interval),
+              'replications' (wyniki kolejnych ziaren) i 'cached' (ile wyników
+              pochodziło z magazynu)
+    """
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    seeds = replication_seeds(base_seed, n_replications)
+    groups = [(config, alg) for config in configs for alg in algorithms]
+    cells = [{'config': config.to_dict(), 'algorithm': alg, 'seed': seed,
+              'sim_time': sim_time, 'options': options}
+             for config, alg in groups for seed in seeds]
+
+    results = [None] * len(cells)
+    keys = [cache.key(cell) if cache is not None else None for cell in cells]
+    if cache is not None:
+        results = [cache.get(key) for key in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    cached = [r is not None for r in results]
+    if verbose:
+        print(f"Przegląd: {len(cells)} komórek, z magazynu {len(cells) - len(missing)}, "
+              f"do policzenia {len(missing)}")
+
+    todo = [cells[i] for i in missing]
+    if max_workers == 1 or len(todo) <= 1:
+        computed = map(_run_cell, todo)
+        pool = None
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers)
+        computed = pool.map(_run_cell, todo, chunksize=max(1, len(todo) // (4 * workers)))
+    try:
+        # wyniki zapisywane od razu, więc przerwany przegląd nie traci policzonych komórek
+        for i, result in zip(missing, computed):
+            results[i] = result
+            if cache is not None:
+                cache.put(keys[i], cells[i], result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    summary = []
+    for g, (config, alg) in enumerate(groups):
+        span = slice(g * n_replications, (g + 1) * n_replications)
+        reps = results[span]
+        summary.append({
+            'config': config,
+            'algorithm': alg,
+            'n': len(reps),
+            'metrics': {m: confidence_interval([r[m] for r in reps], confidence) for m in METRICS},
+            'replications': reps,
+            'cached': sum(cached[span]),
+        })
+    return summary
@@ -0,0 +1,263 @@
+"""
+Zapis śladu symulacji w układzie kolumnowym.
+
+TraceRecorder zbiera dwie tabele:
+- 'passengers' - zdarzenia cyklu życia pasażerów (przybycie, przypisanie windy,
+  wsiadanie, wysiadanie) z czasem, piętrem, numerem windy i liczbą osób
+- 'segments' - odcinki ruchu wind (start, koniec, piętro początkowe i końcowe,
+  obciążenie)
+
+Wiersze trafiają do buforów kolumnowych o stałym rozmiarze (chunk_size), które
+po zapełnieniu są dopisywane do plików, więc zużycie pamięci nie zależy od
+długości symulacji. Format 'npy' zapisuje każdą kolumnę jako plik .npy
+(odczyt przez np.load(mmap_mode='r') bez wczytywania całości), a format
+'parquet' - tabele Parquet z grupą wierszy na bufor (wymaga pyarrow).
+"""
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+# typy zdarzeń pasażera (kolumna 'event')
+ARRIVAL, ASSIGNMENT, PICKUP, DROPOFF = range(4)
+EVENT_NAMES = ('arrival', 'assignment', 'pickup', 'dropoff')
+
+SCHEMAS = {
+    'passengers': {
+        'time': np.float64,
+        'passenger': np.int64,
+        'event': np.int8,
+        'floor': np.int32,
+        'elevator_id': np.int16,
+        'num_people': np.int16,
+    },
+    'segments': {
+        'elevator_id': np.int16,
+        'start_time': np.float64,
+        'end_time': np.float64,
+        'from_floor': np.int32,
+        'to_floor': np.int32,
+        'load': np.int16,
+    },
+}
+
+_NPY_HEADER_SIZE = 128  # stała długość nagłówka, aby móc go nadpisać po zapisie danych
+
+
+def _npy_header(dtype, length):
+    """Nagłówek pliku .npy (wersja 1.0) dla tablicy 1D, dopełniony do stałej długości."""
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(np.dtype(dtype)), length)
+    header = header.ljust(_NPY_HEADER_SIZE - 10 - 1) + '\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+class _NpySink:
+    """Dopisuje bufory kolumn do plików <katalog>/<tabela>/<kolumna>.npy."""
+
+    def __init__(self, directory, table, schema):
+        self.directory = Path(directory) / table
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self.files = {}
+        for name, dtype in schema.items():
+            f = open(self.directory / f"{name}.npy", 'wb')
+            f.write(_npy_header(dtype, 0))
+            self.files[name] = (f, dtype)
+
+    def write(self, columns, n):
+        for name, (f, _) in self.files.items():
+            columns[name][:n].tofile(f)
+        self.rows += n
+
+    def close(self):
+        # nagłówek z ostateczną liczbą wierszy
+        for f, dtype in self.files.values():
+            f.seek(0)
+            f.write(_npy_header(dtype, self.rows))
+            f.close()
+
+
+class _ParquetSink:
+    """Dopisuje bufory jako kolejne grupy wierszy pliku <katalog>/<tabela>.parquet."""
+
+    def __init__(self, directory, table, schema):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Format 'parquet' wymaga pakietu pyarrow "
+                              "(pip install pyarrow) - można też użyć formatu 'npy'") from e
+        self._pa = pa
+        self.schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name, dtype in schema.items()])
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self.writer = pq.ParquetWriter(str(Path(directory) / f"{table}.parquet"), self.schema)
+        self.rows = 0
+
+    def write(self, columns, n):
+        arrays = [self._pa.array(columns[name][:n]) for name in self.schema.names]
+        self.writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows += n
+
+    def close(self):
+        self.writer.close()
+
+
+SINKS = {'npy': _NpySink, 'parquet': _ParquetSink}
+
+
+class ChunkedTable:
+    """Bufor kolumnowy o stałej pojemności, opróżniany do ujścia po zapełnieniu."""
+
+    def __init__(self, schema, sink, chunk_size):
+        """
+        Args:
+            schema: Słownik kolumna -> typ numpy
+            sink: Obiekt z metodami write(columns, n) i close()
+            chunk_size: Liczba wierszy bufora
+        """
+        self.columns = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in schema.items()}
+        self._arrays = list(self.columns.values())
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.size = 0
+
+    def append(self, *values):
+        """Dodaje wiersz (wartości w kolejności kolumn schematu)."""
+        i = self.size
+        for column, value in zip(self._arrays, values):
+            column[i] = value
+        self.size = i + 1
+        if self.size == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Zapisuje zawartość bufora do ujścia."""
+        if self.size:
+            self.sink.write(self.columns, self.size)
+            self.size = 0
+
+    @property
+    def rows(self):
+        """Łączna liczba wierszy (zapisanych i w buforze)."""
+        return self.sink.rows + self.size
+
+
+class TraceRecorder:
+    """
+    Rejestrator śladu symulacji (przekazywany do BuildingSimulation lub run_simulation).
+
+    Przykład:
+        run_simulation('B', 10000, seed=1, trace='runs/b1')
+        trace = load_trace('runs/b1')
+        pickups = trace['passengers']['event'] == PICKUP
+    """
+
+    def __init__(self, path, format='npy', chunk_size=65536):
+        """
+        Args:
+            path: Katalog śladu (tworzony, jeśli nie istnieje)
+            format: 'npy' (pliki .npy do odczytu przez memmap) lub 'parquet'
+            chunk_size: Liczba wierszy bufora każdej tabeli
+        """
+        if format not in SINKS:
+            raise ValueError(f"Nieznany format śladu: {format!r} (dostępne: {', '.join(SINKS)})")
+        self.path = Path(path)
+        self.format = format
+        self.metadata = {}
+        self.closed = False
+        self._next_id = 0
+        self.tables = {name: ChunkedTable(schema, SINKS[format](self.path, name, schema), chunk_size)
+                       for name, schema in SCHEMAS.items()}
+        self._passengers = self.tables['passengers']
+        self._segments = self.tables['segments']
+
+    def arrival(self, time, passenger):
+        """
+        Rejestruje przybycie pasażera.
+
+        Returns:
+            int: Numer pasażera w śladzie (passenger.index, jeśli już nadany)
+        """
+        pid = passenger.index
+        if pid is None:
+            pid = self._next_id
+        self._next_id = pid + 1
+        self._passengers.append(time, pid, ARRIVAL, passenger.call_floor, -1, passenger.num_people)
+        return pid
+
+    def assignment(self, time, passenger, elevator_id):
+        """Rejestruje przypisanie wezwania pasażera do windy."""
+        self._passengers.append(time, passenger.index, ASSIGNMENT, passenger.call_floor, elevator_id,
+                                passenger.num_people)
+
+    def pickup(self, time, passenger, elevator_id):
+        """Rejestruje wejście pasażera do windy."""
+        self._passengers.append(time, passenger.index, PICKUP, passenger.call_floor, elevator_id,
+                                passenger.num_people)
+
+    def dropoff(self, time, passenger, elevator_id):
+        """Rejestruje wyjście pasażera z windy."""
+        self._passengers.append(time, passenger.index, DROPOFF, passenger.target_floor, elevator_id,
+                                passenger.num_people)
+
+    def segment(self, elevator_id, start_time, end_time, from_floor, to_floor, load):
+        """Rejestruje odcinek ruchu windy."""
+        self._segments.append(elevator_id, start_time, end_time, from_floor, to_floor, load)
+
+    def close(self):
+        """Opróżnia bufory, zamyka pliki i zapisuje metadane (trace.json)."""
+        if self.closed:
+            return
+        for table in self.tables.values():
+            table.flush()
+            table.sink.close()
+        meta = {
+            'format': self.format,
+            'tables': {name: {'rows': table.rows,
+                              'columns': {c: np.dtype(t).str for c, t in SCHEMAS[name].items()}}
+                       for name, table in self.tables.items()},
+            'events': list(EVENT_NAMES),
+            **self.metadata,
+        }
+        with open(self.path / 'trace.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_trace(path, mmap=True):
+    """
+    Wczytuje ślad zapisany przez TraceRecorder.
+
+    Args:
+        path: Katalog śladu
+        mmap: Dla formatu 'npy' - czy mapować pliki w pamięci zamiast je wczytywać
+
+    Returns:
+        dict: Tabela ('passengers', 'segments') -> słownik kolumna -> tablica numpy
+              (format 'npy') albo pyarrow.Table (format 'parquet'); pod kluczem
+              'meta' metadane śladu
+    """
+    path = Path(path)
+    with open(path / 'trace.json', encoding='utf-8') as f:
+        meta = json.load(f)
+    trace = {'meta': meta}
+    if meta['format'] == 'parquet':
+        import pyarrow.parquet as pq
+        for name in meta['tables']:
+            trace[name] = pq.read_table(str(path / f"{name}.parquet"))
+        return trace
+    for name, table in meta['tables'].items():
+        # pustego pliku nie da się zmapować w pamięci
+        mode = 'r' if mmap and table['rows'] else None
+        trace[name] = {column: np.load(path / name / f"{column}.npy", mmap_mode=mode)
+                       for column in table['columns']}
+    return trace
@@ -0,0 +1,208 @@
+"""
+Zmienne w czasie profile ruchu (szczyt poranny, lunch, szczyt popołudniowy).
+
+Profil to ciąg faz o stałej intensywności zgłoszeń i własnej macierzy
+źródło-cel (origin-destination). Zgłoszenia losowane są metodą
+odcinkami wykładniczą: w obrębie fazy liczba zgłoszeń w przedziale ma
+rozkład Poissona, a ich czasy są posortowanymi punktami jednostajnymi,
+co daje dokładnie niejednorodny proces Poissona bez odrzucania próbek.
+"""
+
+import math
+
+import numpy as np
+
+
+def od_matrix(num_floors, lobby=0, incoming=0.0, outgoing=0.0, interfloor=1.0):
+    """
+    Buduje macierz źródło-cel jako mieszaninę trzech typów ruchu.
+
+    Args:
+        num_floors: Liczba pięter
+        lobby: Piętro holu
+        incoming: Udział podróży z holu na pozostałe piętra (przyjścia)
+        outgoing: Udział podróży z pięter do holu (wyjścia)
+        interfloor: Udział podróży między piętrami (bez holu, a przy braku
+                    innych pięter - jednorodnie między wszystkimi)
+
+    Returns:
+        numpy.ndarray: Macierz (num_floors, num_floors) wag podróży z zerową
+                       przekątną, sumująca się do 1
+    """
+    if max(incoming, outgoing, interfloor) <= 0:
+        raise ValueError("Co najmniej jeden udział ruchu musi być dodatni")
+    others = np.arange(num_floors) != lobby
+
+    up = np.zeros((num_floors, num_floors))
+    up[lobby, others] = 1.0
+    down = np.zeros((num_floors, num_floors))
+    down[others, lobby] = 1.0
+    inter = np.ones((num_floors, num_floors))
+    np.fill_diagonal(inter, 0.0)
+    if num_floors > 2:
+        inter[lobby, :] = 0.0
+        inter[:, lobby] = 0.0
+
+    matrix = np.zeros((num_floors, num_floors))
+    for weight, component in ((incoming, up), (outgoing, down), (interfloor, inter)):
+        if weight > 0:
+            matrix += weight * component / component.sum()
+    return matrix / matrix.sum()
+
+
+class TrafficPhase:
+    """Faza ruchu: czas trwania, intensywność zgłoszeń i macierz źródło-cel."""
+
+    def __init__(self, name, duration, rate, od=None, num_floors=None):
+        """
+        Args:
+            name: Nazwa fazy (klucz metryk w wynikach)
+            duration: Czas trwania fazy
+            rate: Intensywność zgłoszeń (liczba grup na jednostkę czasu)
+            od: Macierz wag podróży (źródło, cel) z zerową przekątną;
+                domyślnie ruch jednorodny między wszystkimi piętrami
+            num_floors: Liczba pięter (wymagana, gdy od nie jest podane)
+        """
+        if duration <= 0 or rate < 0:
+            raise ValueError("Faza musi mieć dodatni czas trwania i nieujemną intensywność")
+        if od is None:
+            if num_floors is None:
+                raise ValueError("Podaj macierz od albo liczbę pięter")
+            od = np.ones((num_floors, num_floors))
+            np.fill_diagonal(od, 0.0)
+        od = np.asarray(od, dtype=float)
+        if od.ndim != 2 or od.shape[0] != od.shape[1]:
+            raise ValueError("Macierz źródło-cel musi być kwadratowa")
+        if np.any(od < 0) or np.any(np.diag(od) != 0) or od.sum() <= 0:
+            raise ValueError("Macierz źródło-cel musi mieć nieujemne wagi, zerową przekątną "
+                             "i dodatnią sumę")
+        self.name = name
+        self.duration = float(duration)
+        self.rate = float(rate)
+        self.od = od
+        row_totals = od.sum(axis=1)
+        self._origin_cumulative = np.cumsum(row_totals)  # skumulowane wagi pięter wezwań
+        self._cumulative = np.cumsum(od, axis=1)  # skumulowane wagi celów w wierszu
+        self._row_totals = row_totals
+
+    @property
+    def num_floors(self):
+        return self.od.shape[0]
+
+    def to_dict(self):
+        """Parametry fazy jako słownik (np. do zapisu w JSON)."""
+        return {'name': self.name, 'duration': self.duration, 'rate': self.rate,
+                'od': self.od.tolist()}
+
+    def sample_floors(self, rng, n):
+        """
+        Losuje piętra wezwań i docelowe zgodnie z macierzą źródło-cel.
+
+        Returns:
+            tuple: (piętra wezwań, piętra docelowe) jako tablice int64
+        """
+        # pierwsze piętro, dla którego skumulowana waga osiąga v (v w (0, suma]);
+        # piętra i cele o zerowej wadze (m.in. piętro wezwania) nigdy nie są wybierane
+        u = 1.0 - rng.random((2, n))
+        calls = np.searchsorted(self._origin_cumulative, u[0] * self._origin_cumulative[-1])
+        v = u[1] * self._row_totals[calls]
+        targets = (self._cumulative[calls] < v[:, None]).sum(axis=1)
+        return calls, targets
+
+
+class TrafficProfile:
+    """
+    Ciąg faz ruchu. Po ostatniej fazie profil powtarza się od początku
+    (cycle=True) albo ostatnia faza trwa bez końca.
+    """
+
+    def __init__(self, phases, cycle=False):
+        """
+        Args:
+            phases: Lista obiektów TrafficPhase (o tej samej liczbie pięter)
+            cycle: Czy powtarzać profil okresowo
+        """
+        if not phases:
+            raise ValueError("Profil ruchu musi mieć co najmniej jedną fazę")
+        if len({p.num_floors for p in phases}) != 1:
+            raise ValueError("Wszystkie fazy profilu muszą mieć tę samą liczbę pięter")
+        self.phases = list(phases)
+        self.cycle = cycle
+        self.starts = np.concatenate([[0.0], np.cumsum([p.duration for p in phases])])
+        self.period = float(self.starts[-1])
+
+    @property
+    def num_floors(self):
+        return self.phases[0].num_floors
+
+    def to_dict(self):
+        """Parametry profilu jako słownik (np. do zapisu w JSON)."""
+        return {'phases': [phase.to_dict() for phase in self.phases], 'cycle': self.cycle}
+
+    @classmethod
+    def office_day(cls, num_floors, peak_rate, offpeak_rate, lobby=0,
+                   durations=(1800, 3600, 1800, 3600, 1800), cycle=False):
+        """
+        Typowy dzień biurowy: szczyt poranny (przyjścia z holu), ruch
+        międzypiętrowy, lunch (wyjścia i powroty), ruch międzypiętrowy,
+        szczyt popołudniowy (wyjścia do holu).
+
+        Args:
+            num_floors: Liczba pięter
+            peak_rate: Intensywność zgłoszeń w szczytach
+            offpeak_rate: Intensywność poza szczytami
+            lobby: Piętro holu
+            durations: Czasy trwania pięciu faz
+            cycle: Czy powtarzać dzień
+
+        Returns:
+            TrafficProfile
+        """
+        shapes = (
+            ('up_peak', peak_rate, dict(incoming=0.85, outgoing=0.05, interfloor=0.10)),
+            ('morning', offpeak_rate, dict(incoming=0.10, outgoing=0.10, interfloor=0.80)),
+            ('lunch', 0.5 * (peak_rate + offpeak_rate), dict(incoming=0.45, outgoing=0.45, interfloor=0.10)),
+            ('afternoon', offpeak_rate, dict(incoming=0.10, outgoing=0.10, interfloor=0.80)),
+            ('down_peak', peak_rate, dict(incoming=0.05, outgoing=0.85, interfloor=0.10)),
+        )
+        return cls([TrafficPhase(name, duration, rate, od_matrix(num_floors, lobby, **mix))
+                    for (name, rate, mix), duration in zip(shapes, durations)], cycle=cycle)
+
+    def segment_at(self, t):
+        """
+        Zwraca fazę aktywną w chwili t oraz bezwzględne granice jej bieżącego wystąpienia.
+
+        Returns:
+            tuple: (TrafficPhase, początek, koniec); koniec = inf dla ostatniej fazy
+                   profilu bez powtarzania
+        """
+        if self.cycle:
+            offset = math.floor(t / self.period) * self.period
+        else:
+            offset = 0.0
+            if t >= self.period:
+                return self.phases[-1], self.starts[-2], math.inf
+        i = int(np.searchsorted(self.starts, t - offset, side='right')) - 1
+        i = min(i, len(self.phases) - 1)
+        end = offset + self.starts[i + 1]
+        if not self.cycle and i == len(self.phases) - 1:
+            end = math.inf
+        return self.phases[i], offset + self.starts[i], end
+
+    def phase_index(self, times):
+        """Numer fazy dla każdej chwili z tablicy times."""
+        times = np.asarray(times, dtype=float)
+        if self.cycle:
+            times = np.mod(times, self.period)
+        index = np.searchsorted(self.starts, times, side='right') - 1
+        return np.clip(index, 0, len(self.phases) - 1)
+
+    def phase_durations(self, until):
+        """Łączny czas każdej fazy w przedziale [0, until)."""
+        bounds = self.starts.copy()
+        if not self.cycle:
+            bounds[-1] = math.inf
+        cycles, rest = (divmod(until, self.period) if self.cycle else (0, until))
+        durations = np.diff(self.starts) * cycles
+        durations += np.clip(rest - bounds[:-1], 0, np.diff(bounds))
+        return durations
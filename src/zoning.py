@@ -0,0 +1,185 @@
+"""
+Strefowanie wind: budynek obsługiwany przez kilka grup (banków) wind.
+
+Każdy bank obsługuje własny podzbiór pięter (np. strefa niska, średnia
+i wysoka z holem albo lokalne windy nad holem przesiadkowym - sky lobby)
+i ma własną pojemność kabin oraz prędkość. Wezwanie przypisywane jest tylko
+windom banku, który obsługuje dany odcinek podróży, więc koszt przypisania
+zależy od wielkości banku, a nie całego budynku. Podróż między strefami,
+których nie łączy żaden bank, odbywa się z przesiadką na piętrze wspólnym
+dla dwóch banków (najmniejsza liczba odcinków).
+"""
+
+import numpy as np
+
+
+class ElevatorBank:
+    """Grupa identycznych wind obsługujących ten sam zbiór pięter."""
+
+    def __init__(self, name, floors, num_elevators, capacity=None, time_per_floor=None):
+        """
+        Args:
+            name: Nazwa banku (np. 'low', 'high', 'shuttle')
+            floors: Obsługiwane piętra (co najmniej dwa); pozostałe windy mijają bez postoju
+            num_elevators: Liczba wind w banku
+            capacity: Pojemność kabiny (None - config.max_capacity)
+            time_per_floor: Czas przejazdu między sąsiednimi piętrami
+                            (None - config.time_per_floor)
+        """
+        floors = sorted({int(f) for f in floors})
+        if len(floors) < 2:
+            raise ValueError(f"Bank {name!r} musi obsługiwać co najmniej dwa piętra")
+        if num_elevators < 1:
+            raise ValueError(f"Bank {name!r} musi mieć co najmniej jedną windę")
+        if (capacity is not None and capacity < 1) or (time_per_floor is not None and time_per_floor <= 0):
+            raise ValueError(f"Bank {name!r}: pojemność i czas przejazdu muszą być dodatnie")
+        self.name = name
+        self.floors = floors
+        self.num_elevators = num_elevators
+        self.capacity = capacity
+        self.time_per_floor = time_per_floor
+
+    def to_dict(self):
+        """Parametry banku jako słownik (np. do zapisu w JSON)."""
+        return {'name': self.name, 'floors': self.floors, 'num_elevators': self.num_elevators,
+                'capacity': self.capacity, 'time_per_floor': self.time_per_floor}
+
+    def __repr__(self):
+        return (f"ElevatorBank({self.name!r}, piętra {self.floors[0]}..{self.floors[-1]} "
+                f"({len(self.floors)}), windy: {self.num_elevators})")
+
+
+class Zoning:
+    """
+    Podział budynku na banki wind wraz z tablicą tras.
+
+    Windy numerowane są kolejno bankami (najpierw wszystkie windy pierwszego
+    banku). Dla każdej pary (piętro wezwania, piętro docelowe) wyznaczany jest
+    z góry pierwszy odcinek podróży: bank i piętro, do którego nim dojechać
+    (cel albo piętro przesiadki).
+    """
+
+    def __init__(self, banks, num_floors):
+        """
+        Args:
+            banks: Lista obiektów ElevatorBank
+            num_floors: Liczba pięter budynku (każde musi być obsługiwane, a każda
+                        para pięter osiągalna, ewentualnie z przesiadkami)
+        """
+        if not banks:
+            raise ValueError("Strefowanie wymaga co najmniej jednego banku wind")
+        for bank in banks:
+            if bank.floors[0] < 0 or bank.floors[-1] >= num_floors:
+                raise ValueError(f"Bank {bank.name!r} obsługuje piętra spoza zakresu 0..{num_floors - 1}")
+        self.banks = list(banks)
+        self.num_floors = num_floors
+        self.serves = np.zeros((len(banks), num_floors), dtype=bool)
+        for b, bank in enumerate(banks):
+            self.serves[b, bank.floors] = True
+        unserved = np.flatnonzero(~self.serves.any(axis=0))
+        if len(unserved):
+            raise ValueError(f"Piętra bez obsługi żadnego banku: {unserved.tolist()}")
+        self._next_zone, self._next_floor = self._routes()
+
+    @property
+    def num_elevators(self):
+        return sum(bank.num_elevators for bank in self.banks)
+
+    def to_dict(self):
+        """Podział budynku jako słownik (np. do zapisu w JSON)."""
+        return {'banks': [bank.to_dict() for bank in self.banks], 'num_floors': self.num_floors}
+
+    @classmethod
+    def express(cls, num_floors, cars_per_zone, lobby=0, capacity=None, time_per_floor=None):
+        """
+        Strefy ekspresowe: piętra poza holem dzielone są na kolejne równe
+        strefy, a bank każdej strefy obsługuje hol i swoją strefę (przejazd
+        przez niższe strefy bez postojów).
+
+        Args:
+            num_floors: Liczba pięter
+            cars_per_zone: Liczba wind w kolejnych strefach (od najniższej)
+            lobby: Piętro holu
+            capacity: Pojemność kabin - jedna wartość albo lista na strefę
+            time_per_floor: Czas przejazdu między piętrami - jedna wartość
+                            albo lista na strefę (np. szybsze windy wysokich stref)
+
+        Returns:
+            Zoning
+        """
+        n = len(cars_per_zone)
+        capacity = capacity if isinstance(capacity, (list, tuple)) else [capacity] * n
+        time_per_floor = (time_per_floor if isinstance(time_per_floor, (list, tuple))
+                          else [time_per_floor] * n)
+        upper = [f for f in range(num_floors) if f != lobby]
+        banks = [ElevatorBank(f"zone{i}", [lobby, *zone.tolist()], cars, capacity[i], time_per_floor[i])
+                 for i, (zone, cars) in enumerate(zip(np.array_split(upper, n), cars_per_zone))]
+        return cls(banks, num_floors)
+
+    def _routes(self):
+        """
+        Tablice pierwszego odcinka dla każdej pary pięter: bank i piętro końca odcinka.
+
+        Liczba odcinków do celu t liczona jest przeszukiwaniem wszerz po bankach;
+        spośród pięter o liczbie odcinków o jeden mniejszej wybierane jest
+        najbliższe celu (przy remisie - bank o niższym numerze).
+        """
+        serves = self.serves
+        n = self.num_floors
+        legs = np.full((n, n), np.inf)  # legs[t, f] - liczba odcinków z f do t
+        for t in range(n):
+            reached = np.zeros(n, dtype=bool)
+            reached[t] = True
+            legs[t, t] = 0
+            k = 0
+            while not reached.all():
+                k += 1
+                banks = serves[:, reached].any(axis=1)
+                new = serves[banks].any(axis=0) & ~reached
+                if not new.any():
+                    break
+                legs[t, new] = k
+                reached |= new
+        if np.isinf(legs).any():
+            t, f = np.argwhere(np.isinf(legs))[0]
+            raise ValueError(f"Brak połączenia (nawet z przesiadkami) z piętra {f} na piętro {t}")
+
+        next_zone = np.full((n, n), -1, dtype=np.int64)
+        next_floor = np.full((n, n), -1, dtype=np.int64)
+        floors = np.arange(n)
+        for t in range(n):
+            for a in range(n):
+                if a == t:
+                    continue
+                closer = legs[t] == legs[t, a] - 1
+                best = None
+                for b in np.flatnonzero(serves[:, a]):
+                    candidates = floors[serves[b] & closer]
+                    if len(candidates):
+                        x = int(candidates[np.abs(candidates - t).argmin()])
+                        if best is None or abs(x - t) < abs(best[1] - t):
+                            best = (int(b), x)
+                next_zone[a, t], next_floor[a, t] = best
+        return next_zone, next_floor
+
+    def route(self, call_floor, target_floor):
+        """
+        Pierwszy odcinek podróży.
+
+        Returns:
+            tuple: (numer banku, piętro końca odcinka - cel albo piętro przesiadki)
+        """
+        return int(self._next_zone[call_floor, target_floor]), int(self._next_floor[call_floor, target_floor])
+
+    def legs(self, call_floor, target_floor):
+        """Wszystkie odcinki podróży jako lista (nazwa banku, skąd, dokąd)."""
+        legs = []
+        while call_floor != target_floor:
+            zone, floor = self.route(call_floor, target_floor)
+            legs.append((self.banks[zone].name, call_floor, floor))
+            call_floor = floor
+        return legs
+
+    def home_floor(self, zone):
+        """Piętro startowe wind banku (najniższe obsługiwane)."""
+        return self.banks[zone].floors[0]
@@ -0,0 +1,36 @@
+"""Wspólne fixtures testów."""
+
+import numpy as np
+import pytest
+import simpy
+
+from src.arrivals import ArrivalStream
+from src.config import SimulationConfig
+from src.simulation import BuildingSimulation
+
+
+def _idle_building(num_elevators, algorithm='A', config=None, **options):
+    """
+    Budynek bez losowych zgłoszeń - wezwania tylko przez inject_call.
+
+    Args:
+        num_elevators: Liczba wind
+        algorithm: Typ algorytmu ('A' lub 'B')
+        config: Parametry bazowe budynku (SimulationConfig)
+        options: Dodatkowe argumenty BuildingSimulation (np. dispatch_window)
+
+    Returns:
+        tuple: (środowisko simpy, BuildingSimulation)
+    """
+    config = (config or SimulationConfig()).replace(num_elevators=num_elevators)
+    env = simpy.Environment()
+    arrivals = ArrivalStream.from_trace(np.empty((0, 4)), config.num_floors, config.max_capacity)
+    simulation = BuildingSimulation(env, None, algorithm, arrivals=arrivals, config=config,
+                                    **options)
+    return env, simulation
+
+
+@pytest.fixture
+def idle_building():
+    """Fabryka budynków bez losowych zgłoszeń (zob. _idle_building)."""
+    return _idle_building
@@ -0,0 +1,21 @@
+"""Testy strumienia zgłoszeń."""
+
+import numpy as np
+import pytest
+
+from src.arrivals import ArrivalStream
+
+
+def test_from_trace_replays_calls():
+    trace = np.array([[0.5, 0, 3, 2], [1.5, 4, 1, 1]])
+    stream = ArrivalStream.from_trace(trace, num_floors=5, max_group=4)
+    times, calls, targets, people = stream.next_chunk()
+    assert times == [0.5, 1.5]
+    assert (calls, targets, people) == ([0, 4], [3, 1], [2, 1])
+
+
+@pytest.mark.parametrize('people', [0, -1, 5])
+def test_from_trace_rejects_group_size_outside_capacity(people):
+    trace = np.array([[0.0, 0, 3, people]])
+    with pytest.raises(ValueError, match='1..4'):
+        ArrivalStream.from_trace(trace, num_floors=5, max_group=4)
@@ -0,0 +1,29 @@
+"""Testy przypadków benchmarku."""
+
+from src import benchmark
+from src.zoning import Zoning
+
+CASE = {'algorithm': 'B', 'num_floors': 60, 'num_elevators': 6, 'arrival_rate': 0.3,
+        'sim_time': 300}
+
+
+def test_case_builds_simulation_for_its_building(monkeypatch):
+    created = []
+    simulation_class = benchmark.BuildingSimulation
+
+    def recording(*args, **kwargs):
+        created.append(simulation_class(*args, **kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(benchmark, 'BuildingSimulation', recording)
+    result = benchmark.run_case(CASE, seed=1)
+    config = created[0].config
+    assert (config.num_floors, config.num_elevators, config.call_arrival_rate) == (60, 6, 0.3)
+    assert created[0].arrivals.num_floors == 60
+    assert result['passengers_served'] > 0
+
+
+def test_zoned_case_for_non_default_building():
+    zoning = Zoning.express(60, [3, 3])
+    result = benchmark.run_case(dict(CASE, zoning=zoning), seed=1)
+    assert result['events'] > 0
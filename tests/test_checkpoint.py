@@ -0,0 +1,61 @@
+"""Testy punktów kontrolnych i kopii (fork) symulacji."""
+
+import numpy as np
+import pytest
+
+from src.checkpoint import Checkpoint, has_trend
+from src.engine import HeapEnvironment
+from src.simulation import BuildingSimulation
+
+
+def scalars(results):
+    return {k: v for k, v in results.items() if isinstance(v, (int, float, str))}
+
+
+def warm_simulation(algorithm='B', until=300):
+    env = HeapEnvironment()
+    simulation = BuildingSimulation(env, 4, algorithm, rng=7)
+    env.run(until=until)
+    return simulation
+
+
+def test_forks_from_one_checkpoint_are_identical():
+    checkpoint = Checkpoint(warm_simulation())
+    first = checkpoint.run(sim_time=400)
+    second = checkpoint.run(sim_time=400)
+    assert scalars(first) == scalars(second)
+    # kopie ze wspólnym nowym ziarnem też są identyczne, a różnią się od kopii bez niego
+    reseeded = [checkpoint.run(sim_time=400, seed=11) for _ in range(2)]
+    assert scalars(reseeded[0]) == scalars(reseeded[1])
+    assert scalars(reseeded[0]) != scalars(first)
+
+
+def test_fork_continues_like_the_original():
+    simulation = warm_simulation()
+    checkpoint = Checkpoint(simulation)
+    fork = checkpoint.fork(reset_statistics=False)
+    simulation.env.run(until=700)
+    fork.env.run(until=700)
+    assert np.array_equal(simulation.wait_time_array(), fork.wait_time_array())
+    assert simulation.env.events_processed == fork.env.events_processed
+
+
+def test_saved_checkpoint_forks_like_the_original(tmp_path):
+    checkpoint = Checkpoint(warm_simulation('A'))
+    path = tmp_path / 'warm.pkl'
+    checkpoint.save(path)
+    assert scalars(Checkpoint.load(path).run('B', sim_time=400)) == \
+        scalars(checkpoint.run('B', sim_time=400))
+
+
+def test_has_trend_detects_growing_series():
+    rng = np.random.default_rng(0)
+    noise = rng.normal(0, 1, 1000)
+    assert has_trend(noise + np.linspace(0, 5, 1000))
+    assert not has_trend(noise)
+
+
+@pytest.mark.parametrize('n_batches', [2, 7, 11])
+def test_has_trend_rejects_odd_or_too_few_batches(n_batches):
+    with pytest.raises(ValueError):
+        has_trend(np.arange(100.0), n_batches=n_batches)
@@ -0,0 +1,66 @@
+"""Testy pamięci kosztów algorytmu B (windy i banku)."""
+
+import numpy as np
+import pytest
+
+from src.config import SimulationConfig
+from src.engine import HeapEnvironment
+from src.simulation import BuildingSimulation
+
+
+class NoCache(dict):
+    """Słownik, w którym zapamiętane koszty nigdy nie są znajdowane."""
+
+    def get(self, key, default=None):
+        return default
+
+
+def run_b(num_elevators, cached, until=1500, **options):
+    config = SimulationConfig(num_elevators=num_elevators, call_arrival_rate=0.6)
+    env = HeapEnvironment()
+    simulation = BuildingSimulation(env, None, 'B', rng=5, config=config, **options)
+    if not cached:
+        for elevator in simulation.elevators:
+            elevator._cost_cache = NoCache()
+        for bank in simulation.banks:
+            bank._costs = NoCache()
+    env.run(until=until)
+    return simulation
+
+
+@pytest.mark.parametrize('num_elevators, options', [
+    (4, {}),                          # koszty liczone przez Elevator.calculate_cost_b
+    (12, {}),                         # koszty wektorowe BankState.costs_b
+    (12, {'dispatch_window': 2.0}),   # przypisanie partiami
+])
+def test_cached_costs_give_the_same_run(num_elevators, options):
+    cached = run_b(num_elevators, True, **options)
+    uncached = run_b(num_elevators, False, **options)
+    assert cached.cost_cache_stats()['hits'] > 0
+    assert np.array_equal(cached.wait_time_array(), uncached.wait_time_array())
+    assert cached.total_passengers_served == uncached.total_passengers_served
+
+
+def test_cached_costs_are_bit_identical_to_fresh_ones():
+    simulation = run_b(4, True, until=0)
+    checked = []
+    for elevator in simulation.elevators:
+        def checked_cost(passenger, elevator=elevator, cached=elevator.calculate_cost_b):
+            cost = cached(passenger)
+            fresh = elevator._costs_b(passenger.call_floor, passenger.direction)
+            assert cost == fresh[elevator.load + passenger.num_people > elevator.capacity]
+            checked.append(cost)
+            return cost
+        elevator.calculate_cost_b = checked_cost
+    bank = simulation.banks[0]
+    simulation.env.run(until=1500)
+    assert checked and sum(e.cost_cache_hits for e in simulation.elevators) > 0
+
+    for floor in range(simulation.config.num_floors):
+        for direction in (1, -1):
+            for people in (1, 4):
+                cached = bank.costs_b(floor, direction, people)
+                fits, full = bank._compute_costs_b(floor, direction)
+                fresh = np.where(bank.load + people > bank.capacity, full, fits)
+                assert cached.tobytes() == fresh.tobytes()
+    assert bank.cache_hits > 0
@@ -0,0 +1,40 @@
+"""Testy przypisania wezwań (metoda węgierska, partie wezwań)."""
+
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from src.dispatch import BankState, assign_batch_b, assign_min_cost
+
+
+def brute_force_cost(cost):
+    """Najmniejsza suma kosztów po wszystkich różnowartościowych przypisaniach."""
+    n, m = cost.shape
+    return min(cost[np.arange(n), list(columns)].sum() for columns in permutations(range(m), n))
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (3, 3), (4, 6), (5, 5), (2, 7)])
+def test_assign_min_cost_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(20):
+        cost = rng.integers(0, 50, size=shape).astype(float)
+        assignment = assign_min_cost(cost)
+        assert len(set(assignment)) == shape[0]
+        assert assignment.min() >= 0 and assignment.max() < shape[1]
+        assert cost[np.arange(shape[0]), assignment].sum() == brute_force_cost(cost)
+
+
+def test_assign_min_cost_rejects_more_rows_than_columns():
+    with pytest.raises(ValueError):
+        assign_min_cost(np.zeros((3, 2)))
+
+
+def test_assign_batch_b_slot_penalty_spreads_groups():
+    bank = BankState(3)
+    bank.floor[:] = [0, 1, 9]
+    groups = [(1, 1, 1), (2, 1, 1), (3, 1, 1), (4, 1, 1)]
+    # bez kary wszystkie grupy biorą dwie bliskie windy, przy dużej karze
+    # za drugi postój jedna z grup trafia do dalekiej windy
+    assert 2 not in assign_batch_b(bank, groups, slot_penalty=0)
+    assert 2 in assign_batch_b(bank, groups, slot_penalty=100)
@@ -0,0 +1,73 @@
+"""Testy zachowania wind (regresje poprawek modelu)."""
+
+import simpy
+
+from src.config import SimulationConfig
+from src.simulation import BuildingSimulation
+
+
+def run_bounded(env, until, max_events=200_000):
+    """Wykonuje zdarzenia do chwili until, ale nie więcej niż max_events."""
+    for _ in range(max_events):
+        if env.peek() >= until:
+            break
+        env.step()
+    return env.peek()
+
+
+def test_car_that_cannot_board_does_not_livelock():
+    # zewnętrzne wezwanie w górę (1) było brane za wewnętrzne (True), więc winda
+    # bez możliwości zabrania kogokolwiek zatrzymywała się w kółko bez upływu czasu;
+    # przy tym ziarnie dochodziło do tego około t=59
+    env = simpy.Environment()
+    BuildingSimulation(env, 2, 'A', rng=3, config=SimulationConfig(num_elevators=2))
+    assert run_bounded(env, 500) >= 500
+
+
+def test_passenger_called_to_two_cars_boards_once(idle_building):
+    # dwie windy stoją na tym samym piętrze i obie mają wezwanie tego samego
+    # pasażera; ta, która zacznie wsiadanie później, nie może go zabrać drugi raz
+    env, simulation = idle_building(2)
+    simulation.inject_call(0, 5, 2)
+    passenger = simulation.pending_calls[0][0][1][0]
+    for car in simulation.elevators:
+        car.add_call(passenger)
+    env.run(until=100)
+    assert len(simulation.wait_times) == 1
+    assert simulation.total_passengers_served[0] == 2
+
+
+def test_groups_boarding_in_one_stop_do_not_overfill_car(idle_building):
+    # obie grupy mieszczą się osobno, ale nie razem - druga musi poczekać na kolejny kurs
+    env, simulation = idle_building(1, config=SimulationConfig(max_capacity=4))
+    car = simulation.elevators[0]
+    on_board = []
+    record_pickup = simulation.record_pickup
+
+    def checked_pickup(passenger, elevator_id):
+        record_pickup(passenger, elevator_id)
+        on_board.append(sum(p.num_people for group in car.passengers.values() for p in group)
+                        + passenger.num_people)
+
+    simulation.record_pickup = checked_pickup
+    simulation.inject_call(0, 5, 3)
+    simulation.inject_call(0, 6, 3)
+    env.run(until=200)
+    assert max(on_board) <= 4
+    assert simulation.total_passengers_served[0] == 6
+    assert simulation.wait_times[1] > simulation.wait_times[0]
+
+
+def test_car_at_end_of_route_boards_either_direction(idle_building):
+    # winda jadąca w górę bez żądań powyżej zabiera też pasażerów jadących w dół
+    # (wcześniej czekali, aż któraś winda stanie); z żądaniem powyżej - tylko swój kierunek
+    env, simulation = idle_building(1)
+    simulation.inject_call(5, 2)
+    queues = simulation.pending_calls[0][5]
+    car = simulation.elevators[0]
+    car.current_floor, car.direction = 5, 1
+    car.requests.pop(5, None)
+    assert car._boarding_queue(queues) is queues[-1]
+
+    car.requests[8] = True
+    assert car._boarding_queue(queues) is None
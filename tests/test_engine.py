@@ -0,0 +1,38 @@
+"""Testy silnika zdarzeń na kopcu."""
+
+from src.engine import CountingEnvironment, HeapEnvironment
+from src.stats import run_simulation
+
+
+def test_heap_environment_runs_events_in_time_order_and_counts_them():
+    env = HeapEnvironment()
+    log = []
+    env.schedule(2.0, log.append, 'b')
+    env.schedule(1.0, log.append, 'a')
+    env.schedule(2.0, log.append, 'c')
+    env.schedule(5.0, log.append, 'd')
+    env.run(until=3.0)
+    assert log == ['a', 'b', 'c']
+    assert env.now == 3.0
+    assert env.events_processed == 3
+    env.run(until=10.0)
+    assert log[-1] == 'd' and env.events_processed == 4
+
+
+def test_counting_environment_counts_processed_simpy_events():
+    env = CountingEnvironment()
+
+    def process():
+        for _ in range(3):
+            yield env.timeout(1)
+
+    env.process(process())
+    env.run(until=10)
+    # zdarzenie startu procesu, trzy timeouty i zakończenie procesu
+    assert env.events_processed == 5
+
+
+def test_run_simulation_reports_processed_events_for_both_engines():
+    for engine in ('simpy', 'heap'):
+        results = run_simulation('A', 200, seed=1, verbose=False, engine=engine)
+        assert results['events'] > 0
@@ -0,0 +1,55 @@
+"""Testy planowania pojemności."""
+
+import itertools
+
+import pytest
+
+from src import planning
+from src.config import SimulationConfig
+from src.planning import plan_capacity
+
+
+@pytest.mark.parametrize('options', [{'sim_time': 0}, {'check_interval': 0}, {'warmup': -1}])
+def test_rejects_empty_measurement(options):
+    with pytest.raises(ValueError):
+        plan_capacity(60, 0.5, verbose=False, **options)
+
+
+def overloaded(min_abort_waits):
+    config = SimulationConfig(num_elevators=1, call_arrival_rate=1.0)
+    return planning._replication('A', config, 1, 1.0, 0, 1000, 100, 2.0, min_abort_waits,
+                                 config.max_capacity, None, {})
+
+
+def test_abort_waits_for_second_check():
+    p95, aborted, t = overloaded(min_abort_waits=1)
+    assert aborted and t == 200
+
+
+def test_abort_waits_for_enough_observations():
+    p95, aborted, t = overloaded(min_abort_waits=10 ** 6)
+    assert not aborted and t == 1000
+
+
+def fake_replication(algorithm, config, *args):
+    """Deterministyczne p95: SLA 10 spełnione, gdy wind * pojemność >= 24 (B: >= 18)."""
+    needed = 24 if algorithm == 'A' else 18
+    p95 = 5.0 if config.num_elevators * config.max_capacity >= needed else 50.0
+    return p95, False, 1.0
+
+
+@pytest.mark.parametrize('cost', [
+    planning.default_cost,
+    lambda n, capacity, alg: n * (100 + 5 * capacity),
+    lambda n, capacity, alg: (capacity, n, alg),
+])
+def test_best_is_the_cheapest_feasible_point(monkeypatch, cost):
+    monkeypatch.setattr(planning, '_replication', fake_replication)
+    capacities = (4, 6, 8, 12)
+    plan = plan_capacity(10, 0.5, elevators=(1, 8), capacities=capacities, cost=cost,
+                         max_group=4, verbose=False)
+    feasible = [cost(n, c, alg) for alg, n, c in itertools.product('AB', range(1, 9), capacities)
+                if n * c >= (24 if alg == 'A' else 18)]
+    best = plan['best']
+    assert best['meets']
+    assert best['cost'] == min(feasible)
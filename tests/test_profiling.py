@@ -0,0 +1,29 @@
+"""Testy instrumentacji symulacji (Profiler)."""
+
+import pytest
+
+from src.profiling import ELEVATOR_PHASES, SCHEDULING, SIMULATION_PHASES
+from src.stats import run_simulation
+
+
+@pytest.mark.parametrize('engine, processes', [
+    ('simpy', ('Elevator.run', 'BuildingSimulation.call_generator')),
+    ('heap', ('HeapElevator._arrive', 'BuildingSimulation._on_arrival')),
+])
+def test_profile_reports_phases_and_events_per_process(engine, processes):
+    results = run_simulation('B', 300, seed=1, engine=engine, profile=True, verbose=False)
+    profile = results['profile']
+    phases = profile['phases']
+    assert set(phases) == {*SIMULATION_PHASES, *ELEVATOR_PHASES, SCHEDULING}
+    assert all(p['calls'] > 0 and p['time'] >= 0 for p in phases.values())
+    assert sum(p['time'] for p in phases.values()) == pytest.approx(profile['total_time'])
+    for name in processes:
+        assert profile['events'][name] > 0
+    assert phases[SCHEDULING]['calls'] == sum(profile['events'].values())
+
+
+def test_profiled_run_gives_the_same_results():
+    plain = run_simulation('A', 300, seed=2, verbose=False)
+    profiled = run_simulation('A', 300, seed=2, profile=True, verbose=False)
+    del profiled['profile']
+    assert profiled == plain
@@ -0,0 +1,62 @@
+"""Testy sekwencyjnego zatrzymywania (run_until_precision)."""
+
+import numpy as np
+import pytest
+
+from src import sequential
+from src.config import SimulationConfig
+from src.sequential import run_until_precision
+
+EASY = SimulationConfig(num_elevators=4, call_arrival_rate=0.1)
+OVERLOADED = SimulationConfig(num_elevators=1, call_arrival_rate=1.0)
+
+
+def test_replications_converge_on_easy_configuration():
+    result = run_until_precision('A', 0.2, relative=True, sim_time=300, max_workers=1,
+                                 config=EASY, verbose=False)
+    assert result['converged']
+    assert 5 <= result['n'] < 200
+    ci = result['metrics']['avg_wait']
+    assert ci['half_width'] <= 0.2 * ci['mean']
+    assert result['sim_time'] == 300 * result['n'] == 300 * len(result['replications'])
+
+
+def test_replications_stop_at_limit_when_overloaded():
+    result = run_until_precision('A', 0.01, relative=True, sim_time=300, min_replications=2,
+                                 max_replications=4, max_workers=1, config=OVERLOADED,
+                                 verbose=False)
+    assert not result['converged']
+    assert result['n'] == 4
+
+
+def test_batch_means_drop_warmup_from_batches(monkeypatch):
+    series = []
+
+    def fixed_truncation(waits):
+        series.append(np.array(waits))
+        return 20
+
+    monkeypatch.setattr(sequential, 'mser5', fixed_truncation)
+    result = run_until_precision('A', 0.2, relative=True, method='batch_means',
+                                 check_interval=500, n_batches=10, config=EASY, verbose=False)
+    waits = series[-1]
+    assert result['converged']
+    assert result['warmup'] == 20
+    assert result['observations'] == len(waits) - 20
+    expected = sequential._batch_metrics(waits[20:], 10, 0.95)
+    assert result['metrics']['avg_wait'] == expected['avg_wait']
+
+
+def test_batch_means_stop_at_max_time_when_overloaded():
+    result = run_until_precision('A', 0.01, relative=True, method='batch_means',
+                                 check_interval=500, max_time=2000, config=OVERLOADED,
+                                 verbose=False)
+    assert not result['converged']
+    assert result['sim_time'] == 2000
+    # rozbieg nie skończył się ani razu (obcięcie w drugiej połowie serii)
+    assert result['observations'] == 0
+
+
+def test_batch_means_reject_streaming():
+    with pytest.raises(ValueError):
+        run_until_precision('A', 0.1, method='batch_means', streaming=True, verbose=False)
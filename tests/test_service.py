@@ -0,0 +1,42 @@
+"""Testy usługi czasu rzeczywistego."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.service import SimulationService
+
+
+def test_metrics_and_inject_require_start():
+    async def scenario():
+        service = SimulationService()
+        with pytest.raises(RuntimeError, match='start'):
+            service.metrics()
+        with pytest.raises(RuntimeError, match='start'):
+            service.inject(0, 5)
+
+    asyncio.run(scenario())
+
+
+def test_commands():
+    async def scenario():
+        service = SimulationService(speed=100)
+        await service.start(port=0)
+        try:
+            replies = [service._command(line) for line in
+                       (b'0 5 2', b'-1 3', b'3 99', b'metrics', b'subscribe 0.5', b'hello')]
+            return replies, service.injected, service.rejected
+        finally:
+            await service.stop()
+
+    replies, injected, rejected = asyncio.run(scenario())
+    call, below, above, metrics, subscribe, unknown = replies
+    assert call is None
+    # ujemne piętro to błędne wezwanie, a nie nieznane polecenie
+    assert below.decode().startswith('error Piętra muszą należeć do zakresu')
+    assert above.decode().startswith('error Piętra muszą należeć do zakresu')
+    assert json.loads(metrics)['injected'] == 1
+    assert subscribe == 0.5
+    assert unknown.decode().startswith('error Nieznane polecenie')
+    assert (injected, rejected) == (1, 2)
@@ -0,0 +1,37 @@
+"""Testy przypisywania wezwań w BuildingSimulation."""
+
+
+def count_redispatches(simulation):
+    """Podmienia _redispatch na wersję zliczającą wywołania."""
+    calls = []
+    redispatch = simulation._redispatch
+
+    def counted(floor, zone):
+        calls.append((zone, floor))
+        redispatch(floor, zone)
+
+    simulation._redispatch = counted
+    return calls
+
+
+def test_car_left_behind_passenger_keeps_call_without_polling(idle_building):
+    # winda jadąca na 9. piętro zabiera na 4. pasażera w górę i rezygnuje z czekającego
+    # w dół; jako jedyna i tak zostałaby wybrana ponownie, więc zatrzymuje wezwanie
+    # i zabiera go w drodze powrotnej
+    env, simulation = idle_building(1)
+    redispatches = count_redispatches(simulation)
+    simulation.inject_call(0, 9)
+    simulation.inject_call(4, 8)
+    simulation.inject_call(4, 1)
+    env.run(until=200)
+    assert redispatches == []
+    assert len(simulation.wait_times) == 3
+    assert simulation.waiting_count() == 0
+
+
+def test_redispatch_does_not_batch_passenger_twice(idle_building):
+    env, simulation = idle_building(2, 'B', dispatch_window=2)
+    simulation.inject_call(4, 8)
+    passenger = simulation.pending_calls[0][4][1][0]
+    simulation._dispatch(passenger)
+    assert simulation._call_batch == [passenger]
@@ -0,0 +1,16 @@
+"""Testy wyników run_simulation."""
+
+import json
+
+from src.config import SimulationConfig
+from src.stats import run_simulation
+from src.traffic import TrafficProfile
+
+
+def test_phase_metrics_are_plain_python_numbers():
+    config = SimulationConfig(num_floors=10)
+    traffic = TrafficProfile.office_day(10, 0.3, 0.1, durations=(50, 50, 50, 50, 50))
+    results = run_simulation('A', 250, seed=1, config=config, traffic=traffic, verbose=False)
+    for phase in results['phases'].values():
+        assert all(type(value) in (int, float) for value in phase.values())
+    json.dumps(results['phases'])
@@ -0,0 +1,58 @@
+"""Testy statystyk strumieniowych."""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.streaming import DDSketch, RunningStats
+
+
+@pytest.mark.parametrize('accuracy', [0.01, 0.05])
+def test_ddsketch_quantiles_within_relative_accuracy(accuracy):
+    values = np.random.default_rng(0).lognormal(3.0, 1.5, 20_000)
+    sketch = DDSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+    for q in (0.0, 0.1, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = np.quantile(values, q, method='lower')
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact
+
+
+def test_ddsketch_merge_matches_single_sketch():
+    values = np.random.default_rng(1).exponential(30.0, 5_000)
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+    assert left.count == whole.count
+    for q in (0.5, 0.95, 0.99):
+        assert left.quantile(q) == whole.quantile(q)
+
+
+def test_ddsketch_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        DDSketch(0.01).merge(DDSketch(0.02))
+
+
+def test_running_stats_merge_matches_numpy():
+    values = np.random.default_rng(2).normal(50.0, 12.0, 1_001)
+    parts = [RunningStats() for _ in range(3)]
+    for part, chunk in zip(parts, np.array_split(values, 3)):
+        for value in chunk:
+            part.add(value)
+    merged = parts[0].merge(parts[1]).merge(parts[2]).merge(RunningStats())
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.variance == pytest.approx(values.var(ddof=1), rel=1e-12)
+    assert (merged.min, merged.max) == (values.min(), values.max())
+
+
+def test_running_stats_merge_into_empty():
+    other = RunningStats()
+    for value in (1.0, 2.0, 4.0):
+        other.add(value)
+    merged = RunningStats().merge(other)
+    assert (merged.count, merged.mean, merged.min, merged.max) == (3, other.mean, 1.0, 4.0)
+    assert math.isclose(merged.variance, other.variance)
@@ -0,0 +1,49 @@
+"""Testy magazynu wyników przeglądów."""
+
+from src.config import SimulationConfig
+from src.sweep import MODEL_MODULES, ResultCache, run_sweep
+from src.traffic import TrafficProfile
+from src.zoning import Zoning
+
+
+def test_second_sweep_reads_every_cell_from_cache(tmp_path):
+    configs = [SimulationConfig(num_elevators=2)]
+    first = run_sweep(configs, algorithms=('A',), sim_time=100, n_replications=2,
+                      cache_dir=tmp_path, max_workers=1, verbose=False)
+    second = run_sweep(configs, algorithms=('A',), sim_time=100, n_replications=2,
+                       cache_dir=tmp_path, max_workers=1, verbose=False)
+    assert first[0]['cached'] == 0
+    assert second[0]['cached'] == 2
+    assert second[0]['replications'] == first[0]['replications']
+
+    # nowy punkt siatki liczony jest od zera, stare komórki dalej pochodzą z magazynu
+    more = run_sweep(configs + [SimulationConfig(num_elevators=3)], algorithms=('A',),
+                     sim_time=100, n_replications=2, cache_dir=tmp_path, max_workers=1,
+                     verbose=False)
+    assert [cell['cached'] for cell in more] == [2, 0]
+
+
+def test_key_depends_on_model_version():
+    cell = {'config': SimulationConfig().to_dict(), 'algorithm': 'A', 'seed': 1,
+            'sim_time': 100, 'options': {}}
+    assert ResultCache(version='a').key(cell) != ResultCache(version='b').key(cell)
+
+
+def test_zoning_and_traffic_options_are_keyed_by_parameters():
+    cache = ResultCache(version='test')
+
+    def key(**options):
+        return cache.key({'config': {}, 'algorithm': 'A', 'seed': 1, 'sim_time': 100,
+                          'options': options})
+
+    assert key(zoning=Zoning.express(20, [2, 2])) == key(zoning=Zoning.express(20, [2, 2]))
+    assert key(zoning=Zoning.express(20, [2, 2])) != key(zoning=Zoning.express(20, [2, 3]))
+    day = TrafficProfile.office_day(10, 0.5, 0.1)
+    assert key(traffic=day) == key(traffic=TrafficProfile.office_day(10, 0.5, 0.1))
+    assert key(traffic=day) != key(traffic=TrafficProfile.office_day(10, 0.6, 0.1))
+
+
+def test_model_modules_cover_simulation_code():
+    for name in ('arrivals.py', 'dispatch.py', 'elevator.py', 'engine.py', 'simulation.py',
+                 'stats.py', 'traffic.py', 'zoning.py'):
+        assert name in MODEL_MODULES
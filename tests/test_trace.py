@@ -0,0 +1,70 @@
+"""Testy zapisu i odczytu śladu symulacji."""
+
+from importlib.util import find_spec
+
+import numpy as np
+import pytest
+import simpy
+
+from src.config import SimulationConfig
+from src.simulation import BuildingSimulation
+from src.stats import run_simulation
+from src.trace import ARRIVAL, DROPOFF, PICKUP, SCHEMAS, TraceRecorder, load_trace
+
+
+def columns(table):
+    """Kolumny tabeli śladu jako tablice numpy (także dla pyarrow.Table)."""
+    if isinstance(table, dict):
+        return table
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+@pytest.mark.parametrize('trace_format', [
+    'npy',
+    pytest.param('parquet', marks=pytest.mark.skipif(find_spec('pyarrow') is None,
+                                                     reason="wymaga pyarrow")),
+])
+def test_trace_round_trip_matches_simulation(tmp_path, trace_format):
+    config = SimulationConfig(num_elevators=3)
+    env = simpy.Environment()
+    # mały bufor, aby ślad składał się z wielu dopisanych bloków
+    recorder = TraceRecorder(tmp_path, format=trace_format, chunk_size=50)
+    simulation = BuildingSimulation(env, None, 'B', rng=4, config=config, trace=recorder)
+    env.run(until=600)
+    recorder.close()
+
+    trace = load_trace(tmp_path)
+    passengers = columns(trace['passengers'])
+    segments = columns(trace['segments'])
+    for name, table in (('passengers', passengers), ('segments', segments)):
+        assert list(table) == list(SCHEMAS[name])
+        assert all(len(column) == trace['meta']['tables'][name]['rows']
+                   for column in table.values())
+    assert trace['meta']['tables']['passengers']['rows'] > 50
+
+    event = passengers['event']
+    arrived = event == ARRIVAL
+    picked = event == PICKUP
+    assert picked.sum() == len(simulation.wait_times)
+    arrival_time = dict(zip(passengers['passenger'][arrived], passengers['time'][arrived]))
+    waits = [t - arrival_time[p] for p, t in zip(passengers['passenger'][picked],
+                                                 passengers['time'][picked])]
+    np.testing.assert_allclose(sorted(waits), sorted(simulation.wait_times))
+    dropped = event == DROPOFF
+    assert passengers['num_people'][dropped].sum() == simulation.total_passengers_served[0]
+
+    moved = np.abs(segments['to_floor'] - segments['from_floor']) * config.time_per_floor
+    np.testing.assert_allclose(segments['end_time'] - segments['start_time'], moved)
+    for car in simulation.elevators:
+        mine = segments['elevator_id'] == car.id
+        assert moved[mine].sum() == pytest.approx(car.total_movement_time)
+
+
+@pytest.mark.parametrize('engine', ['simpy', 'heap'])
+def test_run_simulation_writes_trace_directory(tmp_path, engine):
+    results = run_simulation('A', 400, seed=3, engine=engine, trace=tmp_path, verbose=False)
+    trace = load_trace(results['trace'])
+    passengers = trace['passengers']
+    dropped = passengers['event'] == DROPOFF
+    assert passengers['num_people'][dropped].sum() == results['total_served']
+    assert len(trace['segments']['elevator_id']) == trace['meta']['tables']['segments']['rows'] > 0